@@ -1,12 +1,10 @@
+import os
 import streamlit as st
 import pandas as pd
 
 # --- IMPORTACIÓN DE MÓDULOS ---
-from src.data_manager import DataManager
-from src.nlp_module import NLPRecommender
-from src.clustering_module import CareerClusterer, plot_clusters_3d
-from src.prediction_module import CareerPredictor
-from src.eda_module import EDAModule
+# Solo el orquestador: cada motor (y sklearn/plotly) se importa al abrir su página
+from src.refresh import CoordinadorRefresco
 
 # --- CONFIGURACIÓN DE PÁGINA ---
 st.set_page_config(
@@ -39,39 +37,32 @@ st.markdown("""
 # --- CARGA DE DATOS Y MODELOS ---
 @st.cache_resource
 def load_system():
-    # 1. DataManager
-    dm = DataManager()
-    if not dm.load_data('matricula_senescyt_2015_2023.csv', 'encuentra_empleo_ofertas_2.csv', 'inec_enemdu_salarios.csv'):
-        return None, None, None, None, None, "Error cargando CSVs." # Retornamos un valor extra para EDA
+    # Motores bajo demanda, compartidos entre sesiones. Si cambian los CSV de data/
+    # el coordinador arma un Sistema nuevo en segundo plano y lo intercambia.
+    # CAREERMATCH_VIGILAR: segundos entre revisiones de data/ (0 = solo manual)
+    coordinador = CoordinadorRefresco(intervalo=float(os.environ.get('CAREERMATCH_VIGILAR', '10')))
+    # Opcional: CAREERMATCH_PRECALENTAR="predictor,nlp" los carga en segundo plano
+    etapas = [e.strip() for e in os.environ.get('CAREERMATCH_PRECALENTAR', '').split(',') if e.strip()]
+    if etapas:
+        coordinador.sistema.precalentar(etapas)
+    return coordinador.iniciar()
 
-    df_master = dm.process_and_merge()
-    if df_master is None: return None, None, None, None, None, "Error procesando master."
-
-    # 2. Clustering
-    clusterer = CareerClusterer(df_master)
-    df_labeled = clusterer.ejecutar_clustering()
-
-    # 3. NLP
-    nlp = NLPRecommender(df_labeled)
-
-    # 4. Predictor
-    predictor = CareerPredictor()
-    predictor.entrenar_modelo()
-    
-    # 5. EDA (Inicializamos pasando los DataFrames crudos para gráficos detallados)
-    eda = EDAModule(dm.df_matricula, dm.df_ofertas, dm.df_inec)
-
-    return df_labeled, nlp, predictor, eda, "OK" # Retornamos eda
+def motor(etapa):
+    """Motor de una etapa; se entrena o restaura la primera vez que una página lo pide."""
+    try:
+        if etapa in sistema.cargados():
+            return sistema.obtener(etapa)
+        with st.spinner("Preparando modelos..."):
+            return sistema.obtener(etapa)
+    except Exception as e:
+        st.error(f"Error init: {e}")
+        st.stop()
 
 # --- INICIALIZACIÓN ---
-try:
-    df_final, nlp_engine, predictor_engine, eda_engine, status = load_system()
-    if df_final is None:
-        st.error(f"Error: {status}")
-        st.stop()
-except Exception as e:
-    st.error(f"Error init: {e}")
-    st.stop()
+coordinador = load_system()
+# Una sola referencia por ejecución: un refresco no cambia los motores a mitad de página
+sistema = coordinador.sistema
+_, df_master = motor('datos')
 
 # --- SIDEBAR ---
 st.sidebar.image("https://cdn-icons-png.flaticon.com/512/3135/3135768.png", width=100)
@@ -80,11 +71,20 @@ opcion = st.sidebar.radio("Menú Principal:", [
     "Inicio", 
     "📊 Análisis de Mercado", 
     "🤖 Clustering (Segmentación)", 
+    "🗺️ Mercado por Provincia",
     "🔍 Recomendador Vocacional", 
     "🔮 Simulador Futuro"
 ])
 st.sidebar.markdown("---")
-st.sidebar.info(f"✅ Base de Datos: {len(df_final)} carreras activas.")
+st.sidebar.info(f"✅ Base de Datos: {len(df_master)} carreras activas.")
+version = coordinador.estado()
+st.sidebar.caption(f"Versión de datos {version['version']} · {version['creado'].replace('T', ' ')}"
+                   + (" · 🔄 actualizando..." if version['refrescando'] else ""))
+if version['ultimo_error']:
+    st.sidebar.warning(f"Última actualización fallida: {version['ultimo_error']}")
+if st.sidebar.button("🔄 Recargar datos", disabled=version['refrescando']):
+    coordinador.refrescar_en_segundo_plano(forzar=True)
+    st.sidebar.caption("Actualizando en segundo plano; la versión actual sigue disponible.")
 
 # --- PÁGINA: INICIO ---
 if opcion == "Inicio":
@@ -111,6 +111,7 @@ if opcion == "Inicio":
 # --- SECCIÓN PESTAÑA: ANÁLISIS DE MERCADO (ACTUALIZADA FIEL AL NOTEBOOK) ---
 elif opcion == "📊 Análisis de Mercado":
     st.header("Radiografía del Mercado Laboral (EDA)")
+    eda_engine = motor('eda')
     
     # Creamos pestañas internas para organizar los gráficos del notebook
     tab1, tab2, tab3 = st.tabs(["🎓 Oferta Académica", "💼 Brecha de Talento", "💰 Salarios"])
@@ -139,6 +140,8 @@ elif opcion == "📊 Análisis de Mercado":
 # --- PÁGINA: CLUSTERING ---
 elif opcion == "🤖 Clustering (Segmentación)":
     st.header("Segmentación de Mercado (K-Means)")
+    from src.clustering_module import plot_clusters_3d
+    df_final = motor('clustering')
     st.write("La IA ha agrupado las carreras en 4 categorías según su comportamiento:")
     
     # Métricas
@@ -160,19 +163,49 @@ elif opcion == "🤖 Clustering (Segmentación)":
     with st.expander("Ver tabla de datos"):
         st.dataframe(df_final[['carrera', 'categoria', 'salario_oferta', 'num_ofertas', 'sector_economico']])
 
+# --- PÁGINA: CORTES POR PROVINCIA Y TRIMESTRE ---
+elif opcion == "🗺️ Mercado por Provincia":
+    st.header("Mercado por Provincia y Trimestre")
+    snapshots = motor('snapshots')
+    st.write("Cada corte recalcula el cruce graduados/ofertas/salarios y su propio clustering.")
+
+    c1, c2 = st.columns(2)
+    provincia = c1.selectbox("Provincia:", snapshots.provincias)
+    # Solo los trimestres con ofertas en la provincia: un par sin corte no tiene datos que mostrar
+    trimestre = c2.selectbox("Trimestre:", snapshots.trimestres_de(provincia))
+    df_corte = snapshots.obtener(provincia, trimestre)
+    nacional = snapshots.obtener()
+    if df_corte is None:
+        st.info(f"No hay ofertas publicadas en {provincia} durante {trimestre}.")
+        st.stop()
+
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Ofertas", int(df_corte['num_ofertas'].sum()))
+    m2.metric("Graduados acumulados", f"{int(df_corte['num_estudiantes'].sum()):,}")
+    m3.metric("Salario promedio ($)", f"{df_corte['salario_oferta'].mean():.0f}",
+              delta=f"{df_corte['salario_oferta'].mean() - nacional['salario_oferta'].mean():.0f} vs nacional")
+
+    conteo = df_corte['categoria'].value_counts()
+    st.bar_chart(conteo)
+    st.dataframe(df_corte[['carrera', 'categoria', 'num_ofertas', 'num_estudiantes', 'salario_oferta', 'sector_economico']],
+                 hide_index=True)
+
 # --- PÁGINA: RECOMENDADOR NLP
 elif opcion == "🔍 Recomendador Vocacional":
     st.header("Buscador Semántico Inteligente")
+    nlp_engine = motor('nlp')
     st.markdown("Busca por conceptos (ej: *'construcción de obras'*, *'cuidar pacientes'*, *'empresarial'*).")
     
     col_input, col_check = st.columns([3, 1])
     query = col_input.text_input("Interés:", placeholder="Escribe aquí...")
     rentables = col_check.checkbox("Solo Alta Rentabilidad")
+    en_ofertas = col_check.checkbox("Buscar en ofertas", help="Compara con cada oferta publicada (puesto, empresa, provincia) y no solo con el perfil de la carrera.")
     
     if st.button("Buscar Carrera"):
         if query:
             # Usamos el motor NLP
-            resultados = nlp_engine.recomendar(query, filtrar_alta_demanda=rentables)
+            resultados = nlp_engine.recomendar(query, filtrar_alta_demanda=rentables,
+                                               fuente='ofertas' if en_ofertas else 'carreras')
             
             if resultados is not None and not resultados.empty:
                 st.success(f"Encontramos {len(resultados)} coincidencias:")
@@ -207,6 +240,8 @@ elif opcion == "🔍 Recomendador Vocacional":
 # --- PÁGINA: PREDICTOR ---
 elif opcion == "🔮 Simulador Futuro":
     st.header("Simulador de Viabilidad (Random Forest)")
+    # Superficie de decisión precalculada: cada consulta es una búsqueda en un array
+    simulador = motor('simulador')
     
     c1, c2, c3, c4 = st.columns(4)
     est = c1.number_input("Graduados/Año", 0, 20000, 5000, step=500)
@@ -215,7 +250,7 @@ elif opcion == "🔮 Simulador Futuro":
     tas = c4.slider("Estabilidad (%)", 0, 100, 50)
     
     if st.button("Predecir Categoría"):
-        pred, probs = predictor_engine.predecir(est, ofe, sal, tas)
+        pred, probs = simulador.predecir(est, ofe, sal, tas)
         
         colores = {
             "En Demanda": "#00CC96", "Saturada": "#EF553B", 
@@ -231,4 +266,11 @@ elif opcion == "🔮 Simulador Futuro":
         """, unsafe_allow_html=True)
         
         st.write("##### Probabilidades:")
-        st.bar_chart(pd.DataFrame.from_dict(probs, orient='index', columns=['%']))
\ No newline at end of file
+        st.bar_chart(pd.DataFrame.from_dict(probs, orient='index', columns=['%']))
+
+    # Sensibilidad: un corte de la grilla a lo largo de una variable (se actualiza al mover los controles)
+    st.write("##### ¿Cómo cambia la categoría si se mueve una variable?")
+    variables = {"Salario ($)": 'salario_oferta', "Ofertas/Año": 'num_ofertas',
+                 "Graduados/Año": 'num_estudiantes', "Estabilidad (%)": 'tasa_empleo_formal'}
+    variable = st.selectbox("Variable:", list(variables))
+    st.line_chart(simulador.sensibilidad(est, ofe, sal, tas, variables[variable]))
\ No newline at end of file
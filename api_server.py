@@ -0,0 +1,320 @@
+"""
+Servidor HTTP/JSON asíncrono (solo biblioteca estándar) para usar los motores
+desde otros servicios sin Streamlit.
+
+Endpoints:
+    GET /salud
+    GET /recomendar?q=salud&alta_demanda=1[&fuente=ofertas&pooling=max]
+    GET /predecir?est=5000&ofe=50&sal=800&tasa=50
+    GET /carreras[?categoria=Nicho]
+    GET /cortes                      (provincias y trimestres disponibles)
+    GET /cortes?provincia=Pichincha&trimestre=2025-Q3   (df_master etiquetado del corte)
+    GET /metricas[?formato=json]     (texto Prometheus; requiere --metricas o CAREERMATCH_METRICAS=1)
+    POST /refrescar                  (reconstruye en segundo plano con los CSV actuales)
+
+Los motores se cargan la primera vez que un endpoint los usa; --precalentar
+los carga en segundo plano al iniciar. En modo 'procesos' el proceso principal
+publica los arrays de --compartir una sola vez (src/shared_segments.py) y los
+workers los mapean sin copiarlos, así la memoria no crece con cada worker.
+
+Con --vigilar N se revisan los CSV cada N segundos: si cambian, se arma un
+Sistema nuevo en segundo plano (src/refresh.py) y se intercambia sin cortar
+el servicio; en modo 'procesos' se intercambia el pool de workers completo.
+
+Uso: python api_server.py --puerto 8000 --workers 4 [--modo procesos] [--compartir clustering,nlp,predictor]
+                          [--metricas] [--precalentar nlp,predictor] [--vigilar 30]
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+import numpy as np
+
+from src.instrumentation import METRICAS
+from src.pipeline import Sistema
+from src.refresh import CoordinadorRefresco
+
+# Sistema cargado una sola vez por proceso (en modo 'procesos', una vez por worker)
+_SISTEMA = {}
+
+ESTADOS_HTTP = {200: 'OK', 202: 'Accepted', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+def _a_json(valor):
+    """Convierte escalares/arrays de NumPy para json.dumps."""
+    if isinstance(valor, np.generic):
+        return valor.item()
+    if isinstance(valor, np.ndarray):
+        return valor.tolist()
+    return str(valor)
+
+
+def _cargar_sistema(path='data/', precalentar=()):
+    # Worker sin segmentos compartidos: cada motor se construye al primer uso
+    sistema = Sistema(path)
+    _SISTEMA['sistema'] = sistema
+    if precalentar:
+        sistema.precalentar(precalentar)
+
+
+def _adjuntar_sistema(manifiesto, precalentar=()):
+    # Worker: etapas del manifiesto sobre los segmentos compartidos, el resto bajo demanda
+    sistema = Sistema.desde_segmentos(manifiesto)
+    _SISTEMA.clear()
+    _SISTEMA['sistema'] = sistema
+    if precalentar:
+        sistema.precalentar(precalentar)
+
+
+def _carreras():
+    # Memorizado en el propio Sistema: tras un refresco se recalcula con los datos nuevos
+    sistema = _SISTEMA['sistema']
+    if 'carreras' not in sistema.derivados:
+        cols = ['carrera', 'categoria', 'salario_oferta', 'num_ofertas', 'num_estudiantes',
+                'tasa_empleo_formal', 'sector_economico']
+        sistema.derivados['carreras'] = sistema.df_labeled[cols].to_dict(orient='records')
+    return sistema.derivados['carreras']
+
+
+# --- Tareas CPU (se ejecutan en el pool, nunca en el event loop) ---
+def _tarea_recomendar(consulta, alta_demanda, fuente='carreras', pooling='max'):
+    res = _SISTEMA['sistema'].nlp.recomendar(consulta, filtrar_alta_demanda=alta_demanda, fuente=fuente, pooling=pooling)
+    return res.to_dict(orient='records')
+
+
+def _tarea_predecir(est, ofe, sal, tasa):
+    pred, probs = _SISTEMA['sistema'].predictor.predecir(est, ofe, sal, tasa)
+    return {'categoria': pred, 'probabilidades': probs}
+
+
+def _tarea_corte(provincia, trimestre):
+    # Registros por corte memorizados: tras la primera vez, una búsqueda en dict
+    sistema = _SISTEMA['sistema']
+    snapshots = sistema.snapshots
+    clave = snapshots.clave(provincia, trimestre)
+    if clave is None:
+        return None
+    cortes = sistema.derivados.setdefault('cortes', {})
+    if clave not in cortes:
+        cortes[clave] = {'provincia': clave[0], 'trimestre': clave[1],
+                         'carreras': snapshots.obtener(*clave).to_dict(orient='records')}
+    return cortes[clave]
+
+
+def _tarea_opciones_cortes():
+    snapshots = _SISTEMA['sistema'].snapshots
+    return {'provincias': snapshots.provincias, 'trimestres': snapshots.trimestres}
+
+
+def _tarea_lista():
+    # Fuerza el arranque (y el initializer) de un worker antes de recibir tráfico
+    return os.getpid()
+
+
+def _tarea_carreras(categoria):
+    carreras = _carreras()
+    if categoria:
+        carreras = [c for c in carreras if c['categoria'] == categoria]
+    return carreras
+
+
+class APIServer:
+    def __init__(self, workers=4, modo='hilos', path='data/', precalentar=(), compartir=(), vigilar=0):
+        self.path = path
+        self.precalentar = tuple(precalentar)
+        self.compartir = tuple(compartir)
+        self.workers = workers
+        self.vigilar = vigilar
+        # En modo 'procesos' el pool se crea al instalar cada Sistema (necesita su manifiesto de segmentos)
+        self.pool = ThreadPoolExecutor(max_workers=workers) if modo == 'hilos' else None
+        self._pool_nuevo = None
+        self.modo = modo
+        self.coordinador = None
+        self.listo = False
+
+    def _crear_pool_procesos(self, sistema):
+        """Pool de workers para `sistema`, ya arrancado. Devuelve (pool, sistema del proceso principal)."""
+        if not self.compartir:
+            pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_cargar_sistema,
+                                       initargs=(sistema.path, self.precalentar))
+        else:
+            manifiesto = sistema.publicar_segmentos(self.compartir)
+            # El proceso principal también pasa a usar los segmentos (libera sus copias privadas)
+            sistema = Sistema.desde_segmentos(manifiesto)
+            gc.collect()
+            print(f"✅ [API] Segmentos compartidos: {', '.join(k for k in manifiesto if k != 'path')}")
+            pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_adjuntar_sistema,
+                                       initargs=(manifiesto, self.precalentar))
+        for futuro in [pool.submit(_tarea_lista) for _ in range(self.workers)]:
+            futuro.result()
+        return pool, sistema
+
+    def _preparar(self, sistema):
+        # Antes del intercambio: en modo 'procesos' el pool nuevo queda listo mientras el anterior atiende
+        if self.modo == 'procesos':
+            self._pool_nuevo, sistema = self._crear_pool_procesos(sistema)
+        return sistema
+
+    def _al_cambiar(self, nuevo, anterior):
+        _SISTEMA['sistema'] = nuevo
+        if self.modo == 'procesos':
+            pool_anterior, self.pool, self._pool_nuevo = self.pool, self._pool_nuevo, None
+            if pool_anterior is not None:
+                # Las tareas ya enviadas al pool anterior terminan; después sus workers salen
+                pool_anterior.shutdown(wait=False)
+
+    async def iniciar(self, host='127.0.0.1', puerto=8000):
+        inicio = time.perf_counter()
+        self.coordinador = CoordinadorRefresco(self.path, intervalo=self.vigilar, preparar=self._preparar,
+                                               al_cambiar=self._al_cambiar)
+        if self.modo == 'hilos' and self.precalentar:
+            self.coordinador.sistema.precalentar(self.precalentar)
+        self.coordinador.iniciar()
+        self.listo = True
+        print(f"✅ [API] Listo en {time.perf_counter() - inicio:.2f}s (modo={self.modo}, motores bajo demanda)")
+        servidor = await asyncio.start_server(self._atender, host, puerto)
+        print(f"🚀 [API] Escuchando en http://{host}:{puerto}")
+        async with servidor:
+            await servidor.serve_forever()
+
+    async def _ejecutar(self, funcion, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.pool, funcion, *args)
+
+    async def _despachar(self, metodo, ruta, params):
+        if ruta == '/refrescar':
+            if metodo != 'POST':
+                return 405, {'error': 'Use POST /refrescar'}
+            if not self.listo:
+                return 503, {'error': 'Sistema cargando'}
+            iniciado = self.coordinador.refrescar_en_segundo_plano(forzar=True)
+            return 202, {'estado': 'refrescando' if iniciado else 'ya en curso',
+                         'version': self.coordinador.estado()['version']}
+        if metodo != 'GET':
+            return 405, {'error': 'Solo se admite GET'}
+        if ruta == '/salud':
+            cuerpo = {'estado': 'ok' if self.listo else 'cargando'}
+            if self.listo:
+                estado = self.coordinador.estado()
+                cuerpo['version'] = {k: estado[k] for k in ('version', 'creado', 'segundos', 'construccion',
+                                                            'reentrenados', 'refrescando', 'ultimo_error')}
+            if self.listo and self.modo == 'hilos':
+                sistema = _SISTEMA['sistema']
+                cuerpo['motores'] = {'cargados': sistema.cargados(), 'segundos': sistema.tiempos}
+                if 'nlp' in sistema.cargados():
+                    cuerpo['cache_nlp'] = sistema.nlp.estadisticas_cache()
+            return 200, cuerpo
+        if ruta == '/metricas':
+            # En modo 'procesos' solo refleja el proceso principal (carga inicial)
+            if params.get('formato', [''])[0] == 'json':
+                return 200, {**METRICAS.resumen(), 'spans': METRICAS.exportar_json()}
+            return 200, METRICAS.exportar_prometheus()
+        if not self.listo:
+            return 503, {'error': 'Sistema cargando'}
+
+        p = {k: v[0] for k, v in params.items()}
+        if ruta == '/recomendar':
+            if not p.get('q'):
+                return 400, {'error': "Falta el parámetro 'q'"}
+            alta = p.get('alta_demanda', '0').lower() in ('1', 'true', 'si', 'sí')
+            fuente, pooling = p.get('fuente', 'carreras'), p.get('pooling', 'max')
+            if fuente not in ('carreras', 'ofertas') or pooling not in ('max', 'sum', 'mean'):
+                return 400, {'error': "fuente: carreras|ofertas, pooling: max|sum|mean"}
+            return 200, {'resultados': await self._ejecutar(_tarea_recomendar, p['q'], alta, fuente, pooling)}
+        if ruta == '/predecir':
+            try:
+                valores = [float(p[k]) for k in ('est', 'ofe', 'sal', 'tasa')]
+            except (KeyError, ValueError):
+                return 400, {'error': "Parámetros numéricos requeridos: est, ofe, sal, tasa"}
+            return 200, await self._ejecutar(_tarea_predecir, *valores)
+        if ruta == '/carreras':
+            return 200, {'carreras': await self._ejecutar(_tarea_carreras, p.get('categoria'))}
+        if ruta == '/cortes':
+            if 'provincia' not in p and 'trimestre' not in p:
+                return 200, await self._ejecutar(_tarea_opciones_cortes)
+            from src.snapshots import TODAS, TOTAL
+            provincia, trimestre = p.get('provincia', TODAS), p.get('trimestre', TOTAL)
+            corte = await self._ejecutar(_tarea_corte, provincia, trimestre)
+            if corte is None:
+                return 404, {'error': f"No hay corte para {provincia}, {trimestre}", **await self._ejecutar(_tarea_opciones_cortes)}
+            return 200, corte
+        return 404, {'error': f"Ruta no encontrada: {ruta}"}
+
+    async def _atender(self, reader, writer):
+        """Una conexión HTTP/1.1 con keep-alive: atiende peticiones hasta que el cliente cierre."""
+        try:
+            while True:
+                cabecera = await reader.readuntil(b'\r\n\r\n')
+                lineas = cabecera.decode('latin-1').split('\r\n')
+                metodo, objetivo, version = lineas[0].split(' ', 2)
+                headers = {}
+                for linea in lineas[1:]:
+                    if ':' in linea:
+                        k, v = linea.split(':', 1)
+                        headers[k.strip().lower()] = v.strip()
+                if int(headers.get('content-length', 0)):
+                    await reader.readexactly(int(headers['content-length']))
+
+                url = urlsplit(objetivo)
+                try:
+                    codigo, cuerpo = await self._despachar(metodo, url.path, parse_qs(url.query))
+                except Exception as e:
+                    codigo, cuerpo = 500, {'error': str(e)}
+
+                if isinstance(cuerpo, str):
+                    tipo, datos = 'text/plain; version=0.0.4', cuerpo.encode('utf-8')
+                else:
+                    tipo, datos = 'application/json', json.dumps(cuerpo, ensure_ascii=False, default=_a_json).encode('utf-8')
+                mantener = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                writer.write(
+                    f"HTTP/1.1 {codigo} {ESTADOS_HTTP.get(codigo, '')}\r\n"
+                    f"Content-Type: {tipo}; charset=utf-8\r\n"
+                    f"Content-Length: {len(datos)}\r\n"
+                    f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n".encode('latin-1') + datos
+                )
+                await writer.drain()
+                if not mantener:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        except (ValueError, asyncio.LimitOverrunError):
+            # Petición mal formada o cabeceras demasiado grandes
+            writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+        finally:
+            writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor HTTP/JSON de CareerMatch AI")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 4)
+    parser.add_argument('--modo', choices=['hilos', 'procesos'], default='hilos')
+    parser.add_argument('--data', default='data/')
+    parser.add_argument('--metricas', action='store_true', help="Activa la instrumentación por etapa (/metricas)")
+    parser.add_argument('--compartir', default='clustering,nlp,predictor',
+                        help="Modo procesos: etapas publicadas en segmentos compartidos ('' = cada worker carga las suyas)")
+    parser.add_argument('--precalentar', default='', help="Motores a cargar en segundo plano, p.ej. 'nlp,predictor'")
+    parser.add_argument('--vigilar', type=float, default=0,
+                        help="Segundos entre revisiones de los CSV; si cambian se refresca en segundo plano (0 = no)")
+    parser.add_argument('--perfil', default=None, help="Etapas a perfilar con cProfile/tracemalloc, p.ej. 'nlp.*'")
+    args = parser.parse_args()
+    if args.metricas or args.perfil:
+        METRICAS.configurar(habilitado=True, perfil=args.perfil)
+
+    precalentar = [e.strip() for e in args.precalentar.split(',') if e.strip()]
+    compartir = [e.strip() for e in args.compartir.split(',') if e.strip()]
+    servidor = APIServer(workers=args.workers, modo=args.modo, path=args.data, precalentar=precalentar,
+                         compartir=compartir, vigilar=args.vigilar)
+    try:
+        asyncio.run(servidor.iniciar(args.host, args.puerto))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Compara el vectorizador TF-IDF original (stop words en inglés) con el
+analizador en español (acentos plegados, stop words ES, stemming ligero):
+tamaño de vocabulario, nnz de la matriz, throughput de transform y acierto
+en las frases de prueba del recomendador (con y sin tildes).
+
+Uso: python benchmarks/bench_nlp_analyzer.py [--data data/]
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.sector_mapper import mapper_por_defecto
+from src.text_es import AnalizadorEspanol
+
+# Frase de prueba -> sector esperado en el top-5
+FRASES_PRUEBA = {
+    'construcción de obras': 'Construcción',
+    'construccion de obras': 'Construcción',
+    'cuidar pacientes': 'Salud Humana',
+    'empresarial': 'Actividades Financieras',
+    'salud': 'Salud Humana',
+    'software': 'Información y Comunicación',
+    'informacion y tecnologia': 'Información y Comunicación',
+    'negocios': 'Actividades Financieras',
+    'educacion': 'Educación',
+    'enseñanza en colegios': 'Educación',
+    'animales de granja': 'Agricultura y Ganadería',
+}
+
+# Carreras de la oferta académica sin ofertas de empleo en el CSV (cubren todos los sectores)
+CARRERAS_EXTRA = ['Pedagogía', 'Educación Inicial', 'Educación Básica', 'Veterinaria', 'Agronomía',
+                  'Agroindustria', 'Arquitectura', 'Derecho', 'Odontología', 'Computación']
+
+
+def perfiles(path):
+    """Perfiles NLP (carrera + sector + sinónimos) a partir de títulos y carreras de las ofertas."""
+    ofertas = pd.read_csv(os.path.join(path, 'encuentra_empleo_ofertas_2.csv'))
+    fuentes = [ofertas['carrera_requerida'], ofertas['titulo_puesto'], pd.Series(CARRERAS_EXTRA)]
+    ruta_matricula = os.path.join(path, 'matricula_senescyt_2015_2023.csv')
+    if os.path.exists(ruta_matricula):
+        fuentes.append(pd.read_csv(ruta_matricula, usecols=['carrera'])['carrera'])
+    carreras = pd.Series(pd.concat(fuentes).dropna().unique())
+    mapper = mapper_por_defecto()
+    sectores = mapper.clasificar(carreras)
+    texto = (carreras + ' ' + sectores).str.lower()
+    extra = mapper.sinonimos_de(sectores)
+    return texto.where(extra == '', texto + ' ' + extra), sectores.to_numpy()
+
+
+def evaluar(nombre, vectorizador, textos, sectores, repeticiones):
+    inicio = time.perf_counter()
+    matriz = vectorizador.fit_transform(textos)
+    t_fit = time.perf_counter() - inicio
+
+    consultas = list(FRASES_PRUEBA) * repeticiones
+    inicio = time.perf_counter()
+    q = vectorizador.transform(consultas)
+    t_transform = time.perf_counter() - inicio
+
+    q = vectorizador.transform(list(FRASES_PRUEBA))
+    scores = (q @ matriz.T).toarray()
+    aciertos = 0
+    for fila, esperado in zip(scores, FRASES_PRUEBA.values()):
+        top = np.argsort(-fila, kind='stable')[:5]
+        aciertos += bool(fila[top[0]] > 0 and esperado in sectores[top[fila[top] > 0]])
+
+    print(f"{nombre:<28} {len(vectorizador.vocabulary_):>8} {matriz.nnz:>8} {t_fit * 1000:>9.1f} "
+          f"{len(consultas) / t_transform:>12,.0f} {aciertos:>5}/{len(FRASES_PRUEBA)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--data', default='data/')
+    parser.add_argument('--repeticiones', type=int, default=2000)
+    args = parser.parse_args()
+
+    textos, sectores = perfiles(args.data)
+    print(f"{len(textos)} perfiles\n")
+    print(f"{'vectorizador':<28} {'vocab':>8} {'nnz':>8} {'fit ms':>9} {'consultas/s':>12} {'hit@5':>7}")
+    evaluar('original (stop_words=en)', TfidfVectorizer(stop_words='english'), textos, sectores, args.repeticiones)
+    evaluar('español', TfidfVectorizer(analyzer=AnalizadorEspanol(stemming=True)), textos, sectores, args.repeticiones)
+    evaluar('español sin stemming', TfidfVectorizer(analyzer=AnalizadorEspanol(stemming=False)), textos, sectores, args.repeticiones)
+    evaluar('español + n-gramas (3,4)', TfidfVectorizer(analyzer=AnalizadorEspanol(ngramas_char=(3, 4))), textos, sectores, args.repeticiones)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,256 @@
+"""
+Benchmark del pipeline completo (lo que hace load_system) con datos sintéticos
+del mismo esquema que los CSV reales, a varias escalas. Mide cada etapa por
+separado (tiempo, RSS pico y throughput), guarda los resultados en JSON y
+marca regresiones frente a una línea base guardada.
+
+Uso:
+    python benchmarks/bench_pipeline.py --ofertas 1000 100000 --carreras 100 1000
+    python benchmarks/bench_pipeline.py --guardar-baseline      # fija la línea base
+    python benchmarks/bench_pipeline.py --tolerancia 0.25       # compara contra ella
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from src.pipeline import ARCHIVOS
+
+BASELINE = os.path.join(RAIZ, 'benchmarks', 'baseline_pipeline.json')
+DIR_RESULTADOS = os.path.join(RAIZ, 'benchmarks', 'resultados')
+
+# Nombres base de carreras (uno por sector de la taxonomía) y vocabulario de las ofertas
+CARRERAS_BASE = ['Ingeniería en Sistemas', 'Administración de Empresas', 'Medicina', 'Enfermería',
+                 'Ingeniería Civil', 'Educación Básica', 'Agronomía', 'Ingeniería Industrial',
+                 'Derecho', 'Turismo', 'Comunicación Social', 'Contabilidad y Auditoría']
+PUESTOS = ['Analista', 'Asistente', 'Jefe', 'Coordinador', 'Técnico', 'Especialista', 'Ingeniero', 'Médico']
+EMPRESAS = ['Corporación Favorita', 'Banco Pichincha', 'Movistar Ecuador', 'Tecnipak', 'Pronaca',
+            'Hospital Metropolitano', 'Holcim', 'Produbanco', 'Kruger', 'Ministerio de Salud']
+PROVINCIAS = ['Pichincha', 'Guayas', 'Azuay', 'Manabí', 'El Oro', 'Loja', 'Tungurahua', 'Imbabura']
+EXPERIENCIA = ['Sin experiencia', '1 año', '2 años', '3 años', '5+ años']
+SECTORES_INEC = ['Información y Comunicación', 'Actividades Financieras', 'Salud Humana', 'Construcción',
+                 'Enseñanza', 'Agricultura', 'Manufactura', 'Actividades Profesionales']
+NIVELES = ['Educación Superior Universitaria', 'Educación Superior Tecnológica', 'Bachillerato']
+CONSULTAS = ['salud', 'software', 'negocios', 'construcción de obras', 'empresarial',
+             'cuidar pacientes', 'agro', 'docencia', 'industria', 'marketing digital']
+
+
+def nombres_carreras(n):
+    """n nombres distintos: los nombres base y luego variantes numeradas."""
+    return [CARRERAS_BASE[i % len(CARRERAS_BASE)] + ('' if i < len(CARRERAS_BASE) else f' {i}')
+            for i in range(n)]
+
+
+def generar_datos(directorio, n_ofertas, n_carreras, seed=42):
+    """Escribe los tres CSV sintéticos (mismas columnas que los reales) en `directorio`."""
+    rng = np.random.default_rng(seed)
+    carreras = np.array(nombres_carreras(n_carreras))
+    f_matricula, f_ofertas, f_inec = (os.path.join(directorio, f) for f in ARCHIVOS)
+
+    # Matrícula: una fila por carrera, año y provincia (submuestreada para no explotar con muchas carreras)
+    n_mat = max(n_carreras * 4, min(n_carreras * len(PROVINCIAS) * 9, 2_000_000))
+    pd.DataFrame({
+        'año': rng.integers(2015, 2024, n_mat),
+        'carrera': np.concatenate([carreras, rng.choice(carreras, n_mat - n_carreras)]),
+        'provincia': rng.choice(PROVINCIAS, n_mat),
+        'num_estudiantes': rng.integers(10, 3000, n_mat),
+    }).to_csv(f_matricula, index=False)
+
+    # Ofertas: se escriben por bloques para no materializar 10^7 filas de texto a la vez
+    tam_bloque = 500_000
+    fechas = pd.date_range('2025-01-01', '2025-12-31').strftime('%Y-%m-%d').to_numpy()
+    for inicio in range(0, n_ofertas, tam_bloque):
+        n = min(tam_bloque, n_ofertas - inicio)
+        carrera = rng.choice(carreras, n)
+        minimo = rng.integers(460, 3000, n)
+        pd.DataFrame({
+            'titulo_puesto': pd.Series(rng.choice(PUESTOS, n)) + ' ' + carrera,
+            'empresa': rng.choice(EMPRESAS, n),
+            'carrera_requerida': carrera,
+            'provincia': rng.choice(PROVINCIAS, n),
+            'experiencia_requerida': rng.choice(EXPERIENCIA, n),
+            'salario_minimo': minimo,
+            'salario_maximo': minimo + rng.integers(100, 800, n),
+            'fecha_publicacion': rng.choice(fechas, n),
+            'sector': rng.choice(['Privado', 'Público'], n),
+        }).to_csv(f_ofertas, index=False, mode='w' if inicio == 0 else 'a', header=inicio == 0)
+
+    # INEC: tabla pequeña y fija (sector × nivel × trimestre)
+    indice = pd.MultiIndex.from_product([['2023-Q1', '2023-Q2', '2023-Q3', '2023-Q4'], SECTORES_INEC, NIVELES],
+                                        names=['trimestre', 'sector_economico', 'nivel_educacion'])
+    n = len(indice)
+    inec = indice.to_frame(index=False)
+    inec['salario_promedio_mensual'] = rng.integers(500, 2000, n)
+    inec['tasa_empleo_formal'] = rng.uniform(30, 95, n).round(2)
+    inec['tasa_desempleo'] = rng.uniform(2, 12, n).round(2)
+    inec['empleados_estimados'] = rng.integers(1000, 50_000, n)
+    inec['crecimiento_anual'] = rng.uniform(-5, 15, n).round(1)
+    inec.to_csv(f_inec, index=False)
+
+
+def rss_pico_mb():
+    """RSS máximo del proceso (ru_maxrss está en KB en Linux y en bytes en macOS)."""
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+
+def medir(etapas, nombre, funcion, n_items):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    segundos = time.perf_counter() - inicio
+    etapas[nombre] = {
+        'segundos': round(segundos, 4),
+        'rss_pico_mb': round(rss_pico_mb(), 1),
+        'items': n_items,
+        'items_por_s': round(n_items / segundos, 1) if segundos > 0 else None,
+    }
+    return resultado
+
+
+def ejecutar_escala(n_ofertas, n_carreras, n_consultas, usar_cache, seed):
+    """Corre todas las etapas en un proceso limpio (así el RSS pico es de esta escala)."""
+    from src.clustering_module import CareerClusterer
+    from src.data_manager import DataManager
+    from src.nlp_module import NLPRecommender
+    from src.prediction_module import CareerPredictor
+
+    directorio = tempfile.mkdtemp(prefix='bench_pipeline_')
+    try:
+        generar_datos(directorio, n_ofertas, n_carreras, seed)
+        etapas = {'inicio': {'rss_pico_mb': round(rss_pico_mb(), 1)}}
+
+        dm = DataManager(use_cache=usar_cache, cache_dir=os.path.join(directorio, '.cache'), medir_memoria=True)
+        medir(etapas, 'load_data', lambda: dm.load_data(*ARCHIVOS, path=directorio + os.sep), n_ofertas)
+        df_master = medir(etapas, 'process_and_merge', dm.process_and_merge, n_ofertas)
+
+        clusterer = CareerClusterer(df_master)
+        df_labeled = medir(etapas, 'ejecutar_clustering', clusterer.ejecutar_clustering, len(df_master))
+
+        nlp = medir(etapas, 'nlp_entrenar', lambda: NLPRecommender(df_labeled), len(df_labeled))
+        rng = np.random.default_rng(seed)
+        consultas = [f"{c} {i}" for i, c in enumerate(rng.choice(CONSULTAS, n_consultas))]
+        medir(etapas, 'nlp_recomendar', lambda: [nlp.recomendar(q) for q in consultas], n_consultas)
+
+        predictor = CareerPredictor()
+        # Igual que construir_sistema: entrenar y compilar el bosque
+        medir(etapas, 'predictor_entrenar', lambda: (predictor.entrenar_modelo(), predictor.compilar()),
+              predictor.params_datos['n'])
+        entradas = np.column_stack([rng.integers(0, 20_000, n_consultas), rng.integers(0, 1000, n_consultas),
+                                    rng.integers(400, 5000, n_consultas), rng.integers(0, 100, n_consultas)])
+        medir(etapas, 'predictor_predecir', lambda: [predictor.predecir(*fila) for fila in entradas.tolist()],
+              n_consultas)
+
+        return {'ofertas': n_ofertas, 'carreras': n_carreras, 'filas_master': len(df_master), 'etapas': etapas,
+                'memoria_tablas': dm.reporte_memoria}
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def entorno():
+    import sklearn
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def comparar(resultados, baseline, tolerancia, umbral_segundos):
+    """Regresiones: etapas más lentas (o con más RSS) que la línea base más allá de la tolerancia."""
+    base = {(r['ofertas'], r['carreras']): r['etapas'] for r in baseline['resultados']}
+    regresiones = []
+    for r in resultados:
+        etapas_base = base.get((r['ofertas'], r['carreras']))
+        if etapas_base is None:
+            continue
+        for etapa, actual in r['etapas'].items():
+            previo = etapas_base.get(etapa)
+            if not previo or 'segundos' not in actual:
+                continue
+            if (actual['segundos'] > previo['segundos'] * (1 + tolerancia)
+                    and actual['segundos'] - previo['segundos'] > umbral_segundos):
+                regresiones.append((r['ofertas'], r['carreras'], etapa, 'segundos', previo['segundos'], actual['segundos']))
+            if actual['rss_pico_mb'] > previo['rss_pico_mb'] * (1 + tolerancia):
+                regresiones.append((r['ofertas'], r['carreras'], etapa, 'rss_pico_mb', previo['rss_pico_mb'], actual['rss_pico_mb']))
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--ofertas', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--carreras', type=int, nargs='+', default=[100, 1_000])
+    parser.add_argument('--consultas', type=int, default=500, help="Consultas NLP y predicciones por escala")
+    parser.add_argument('--cache', action='store_true', help="Leer los CSV con la caché columnar")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--salida', default=None, help="Archivo JSON de resultados")
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--guardar-baseline', action='store_true')
+    parser.add_argument('--tolerancia', type=float, default=0.2, help="Margen relativo antes de marcar regresión")
+    parser.add_argument('--umbral-segundos', type=float, default=0.05, help="Diferencia absoluta mínima (ruido)")
+    args = parser.parse_args()
+
+    resultados = []
+    # Un proceso nuevo por escala: el RSS pico no arrastra memoria de escalas anteriores
+    contexto = multiprocessing.get_context('spawn')
+    for n_carreras in args.carreras:
+        for n_ofertas in args.ofertas:
+            with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as pool:
+                r = pool.submit(ejecutar_escala, n_ofertas, n_carreras, args.consultas, args.cache, args.seed).result()
+            resultados.append(r)
+            print(f"\nofertas={n_ofertas:,} carreras={n_carreras:,} (filas master: {r['filas_master']:,})")
+            print(f"  {'etapa':<22} {'segundos':>10} {'RSS pico MB':>12} {'items/s':>14}")
+            for etapa, m in r['etapas'].items():
+                if 'segundos' in m:
+                    print(f"  {etapa:<22} {m['segundos']:>10.3f} {m['rss_pico_mb']:>12.1f} {m['items_por_s'] or 0:>14,.0f}")
+            print(f"  {'tabla':<22} {'MB antes':>10} {'MB después':>12}")
+            for tabla, m in r['memoria_tablas'].items():
+                print(f"  {tabla:<22} {m['antes_mb']:>10.2f} {m['despues_mb']:>12.2f}")
+
+    informe = {'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'), 'entorno': entorno(),
+               'config': {'consultas': args.consultas, 'cache': args.cache, 'seed': args.seed},
+               'resultados': resultados}
+
+    salida = args.salida or os.path.join(DIR_RESULTADOS, f"pipeline-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    with open(salida, 'w', encoding='utf-8') as f:
+        json.dump(informe, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Resultados en {salida}")
+
+    if args.guardar_baseline:
+        shutil.copyfile(salida, args.baseline)
+        print(f"📌 Línea base actualizada: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("ℹ️ Sin línea base; usa --guardar-baseline para crearla.")
+        return 0
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regresiones = comparar(resultados, baseline, args.tolerancia, args.umbral_segundos)
+    if not regresiones:
+        print(f"✅ Sin regresiones frente a la línea base ({baseline['fecha']}).")
+        return 0
+    print(f"⚠️ {len(regresiones)} regresión(es) frente a la línea base ({baseline['fecha']}):")
+    for ofertas, carreras, etapa, metrica, previo, actual in regresiones:
+        print(f"  ofertas={ofertas:,} carreras={carreras:,} {etapa}: {metrica} {previo} -> {actual} "
+              f"({(actual / previo - 1) * 100:+.0f}%)")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""
+Benchmark de inferencia del CareerPredictor: sklearn (predict_proba) frente
+al bosque compilado en arrays NumPy, para una fila y por lotes.
+
+Uso: python benchmarks/bench_predictor.py [--repeticiones 200]
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.prediction_module import CareerPredictor, generar_datos_sinteticos
+
+
+def medir(funcion, repeticiones):
+    """Tiempo medio por llamada en milisegundos."""
+    funcion()  # calentamiento
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeticiones', type=int, default=200)
+    args = parser.parse_args()
+
+    predictor = CareerPredictor()
+    predictor.entrenar_modelo()
+    predictor.compilar()
+
+    X, _ = generar_datos_sinteticos(n=25_000, seed=7)
+    X = X.astype(float)
+
+    # Validación: ambas rutas deben dar las mismas probabilidades
+    diff = np.abs(predictor.rf_model.predict_proba(X[:2000]) - predictor.bosque.predict_proba(X[:2000])).max()
+    print(f"Diferencia máxima de probabilidades (sklearn vs compilado): {diff:.2e}")
+
+    fila = [5000, 50, 800, 50]
+    t_original = medir(lambda: (predictor.rf_model.predict([fila]), predictor.rf_model.predict_proba([fila])), args.repeticiones)
+    t_sklearn = medir(lambda: predictor.predecir_batch([fila], compilado=False), args.repeticiones)
+    t_compilado = medir(lambda: predictor.predecir_batch([fila], compilado=True), args.repeticiones)
+    print("\n1 fila (ms/llamada)")
+    print(f"  predict + predict_proba (original): {t_original:8.3f}")
+    print(f"  predecir_batch sklearn:             {t_sklearn:8.3f}")
+    print(f"  predecir_batch compilado:           {t_compilado:8.3f}")
+
+    print("\nLotes (filas/s)")
+    print(f"  {'n':>7} {'sklearn':>12} {'compilado':>12}")
+    for n in [10, 100, 1000, 10_000, 100_000]:
+        lote = X[:n] if n <= len(X) else np.resize(X, (n, X.shape[1]))
+        rep = max(3, args.repeticiones // max(1, n // 100))
+        t_s = medir(lambda: predictor.predecir_batch(lote, compilado=False), rep)
+        t_c = medir(lambda: predictor.predecir_batch(lote, compilado=True), rep)
+        print(f"  {n:>7} {n / t_s * 1000:>12,.0f} {n / t_c * 1000:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark de la grilla de decisión del simulador: tiempo de construcción,
+tamaño frente a la grilla completa, latencia de consulta frente al modelo
+y verificación de exactitud contra llamadas directas.
+
+Uso: python benchmarks/bench_simulador.py [--paso-tasa 1] [--muestras 5000]
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.decision_grid import EJES_SIMULADOR, DecisionGrid
+from src.prediction_module import CareerPredictor
+
+
+def medir(funcion, repeticiones):
+    """Tiempo medio por llamada en microsegundos."""
+    funcion()  # calentamiento
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--paso-estudiantes', type=float, default=EJES_SIMULADOR['num_estudiantes'][2])
+    parser.add_argument('--paso-ofertas', type=float, default=EJES_SIMULADOR['num_ofertas'][2])
+    parser.add_argument('--paso-salario', type=float, default=EJES_SIMULADOR['salario_oferta'][2])
+    parser.add_argument('--paso-tasa', type=float, default=EJES_SIMULADOR['tasa_empleo_formal'][2])
+    parser.add_argument('--muestras', type=int, default=5000, help="Puntos de la verificación de exactitud")
+    parser.add_argument('--repeticiones', type=int, default=2000)
+    args = parser.parse_args()
+
+    pasos = {'num_estudiantes': args.paso_estudiantes, 'num_ofertas': args.paso_ofertas,
+             'salario_oferta': args.paso_salario, 'tasa_empleo_formal': args.paso_tasa}
+    ejes = {f: (lo, hi, pasos[f]) for f, (lo, hi, _) in EJES_SIMULADOR.items()}
+
+    predictor = CareerPredictor()
+    predictor.entrenar_modelo()
+    predictor.compilar()
+
+    inicio = time.perf_counter()
+    grilla = DecisionGrid(predictor, ejes).construir()
+    segundos = time.perf_counter() - inicio
+
+    completa = int(np.prod([len(v) for v in grilla.valores]))
+    print(f"Construcción: {segundos:.2f}s")
+    print(f"  Puntos de la grilla:   {completa:>12,} ({' × '.join(str(len(v)) for v in grilla.valores)})")
+    print(f"  Celdas evaluadas:      {grilla.clase.size:>12,} ({' × '.join(str(n) for n in grilla.clase.shape)})")
+    print(f"  Memoria (uint8):       {(grilla.probs.nbytes + grilla.clase.nbytes) / 2 ** 20:>11.2f} MB"
+          f" (grilla completa: {completa * (len(grilla.classes_) + 1) / 2 ** 20:,.1f} MB)")
+
+    print("\nExactitud frente al modelo directo")
+    for nombre, r in grilla.verificar(n=args.muestras).items():
+        print(f"  {nombre:<10} acuerdo de clase {r['acuerdo_clase']:.4f}  error máx. prob. {r['error_max_prob']:.4f}"
+              f"  desde la grilla {r['desde_grilla']:.1%}")
+
+    fila = (5000, 50, 800, 50)
+    print("\n1 consulta (µs/llamada)")
+    print(f"  modelo sklearn:    {medir(lambda: predictor.predecir_batch([fila], compilado=False), args.repeticiones):10.1f}")
+    print(f"  bosque compilado:  {medir(lambda: predictor.predecir(*fila), args.repeticiones):10.1f}")
+    print(f"  grilla:            {medir(lambda: grilla.predecir(*fila), args.repeticiones):10.1f}")
+    print(f"  sensibilidad (eje salario, {len(grilla.valores[2])} puntos): "
+          f"{medir(lambda: grilla.sensibilidad(*fila, 'salario_oferta'), args.repeticiones // 10):.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Prueba de carga para api_server.py: N conexiones keep-alive concurrentes
+durante un tiempo fijo; reporta latencia p50/p99 y throughput por endpoint.
+
+Uso: python benchmarks/load_test.py --url http://127.0.0.1:8000 --conexiones 32 --segundos 10
+"""
+import argparse
+import asyncio
+import random
+import time
+from urllib.parse import quote, urlsplit
+import numpy as np
+
+CONSULTAS = ['salud', 'software', 'negocios', 'construcción de obras', 'empresarial',
+             'cuidar pacientes', 'agro', 'docencia', 'industria', 'marketing digital']
+
+
+def generar_ruta(rng):
+    tipo = rng.choices(['recomendar', 'predecir', 'carreras'], weights=[6, 3, 1])[0]
+    if tipo == 'recomendar':
+        return tipo, f"/recomendar?q={quote(rng.choice(CONSULTAS))}&alta_demanda={rng.randint(0, 1)}"
+    if tipo == 'predecir':
+        return tipo, (f"/predecir?est={rng.randrange(0, 20001, 500)}&ofe={rng.randrange(0, 1001, 10)}"
+                      f"&sal={rng.randrange(400, 5001, 50)}&tasa={rng.randint(0, 100)}")
+    return tipo, "/carreras"
+
+
+async def cliente(host, puerto, fin, semilla, latencias, errores):
+    rng = random.Random(semilla)
+    reader, writer = await asyncio.open_connection(host, puerto)
+    try:
+        while time.perf_counter() < fin:
+            tipo, ruta = generar_ruta(rng)
+            inicio = time.perf_counter()
+            writer.write(f"GET {ruta} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode('latin-1'))
+            await writer.drain()
+            cabecera = await reader.readuntil(b'\r\n\r\n')
+            largo = 0
+            for linea in cabecera.decode('latin-1').split('\r\n'):
+                if linea.lower().startswith('content-length:'):
+                    largo = int(linea.split(':', 1)[1])
+            await reader.readexactly(largo)
+            latencias.setdefault(tipo, []).append(time.perf_counter() - inicio)
+            if not cabecera.startswith(b'HTTP/1.1 200'):
+                errores[tipo] = errores.get(tipo, 0) + 1
+    finally:
+        writer.close()
+
+
+async def ejecutar(url, conexiones, segundos):
+    partes = urlsplit(url)
+    latencias, errores = {}, {}
+    inicio = time.perf_counter()
+    fin = inicio + segundos
+    await asyncio.gather(*(cliente(partes.hostname, partes.port or 80, fin, i, latencias, errores)
+                           for i in range(conexiones)))
+    duracion = time.perf_counter() - inicio
+
+    print(f"{'endpoint':<12} {'n':>8} {'p50 ms':>9} {'p99 ms':>9} {'req/s':>9} {'errores':>8}")
+    todas = []
+    for tipo, valores in sorted(latencias.items()):
+        ms = np.array(valores) * 1000
+        todas.extend(valores)
+        print(f"{tipo:<12} {len(ms):>8} {np.percentile(ms, 50):>9.2f} {np.percentile(ms, 99):>9.2f} "
+              f"{len(ms) / duracion:>9.1f} {errores.get(tipo, 0):>8}")
+    ms = np.array(todas) * 1000
+    print(f"{'TOTAL':<12} {len(ms):>8} {np.percentile(ms, 50):>9.2f} {np.percentile(ms, 99):>9.2f} "
+          f"{len(ms) / duracion:>9.1f} {sum(errores.values()):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga del servidor HTTP de CareerMatch AI")
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--conexiones', type=int, default=32)
+    parser.add_argument('--segundos', type=float, default=10)
+    args = parser.parse_args()
+    asyncio.run(ejecutar(args.url, args.conexiones, args.segundos))
+
+
+if __name__ == '__main__':
+    main()
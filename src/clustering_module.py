@@ -1,18 +1,78 @@
+import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
-import plotly.express as px
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+from src.instrumentation import instrumentado
+
+# Máximo de puntos que se envían al navegador en el gráfico 3D
+MAX_PUNTOS_3D = 5000
+
+# Warm start: solo se confía en él si los datos cambiaron poco frente a la corrida anterior
+TOLERANCIA_FILAS = 0.10    # filas nuevas o eliminadas, relativo a las de la corrida anterior
+TOLERANCIA_INERCIA = 0.05  # aumento relativo de la inercia media por fila
+
+
+def submuestrear_por_densidad(df, columnas, max_puntos, bins=20, estrato=None, random_state=42):
+    """
+    Reduce df a ~max_puntos filas conservando la forma de la nube: los puntos
+    se agrupan en una grilla (bins^d celdas, y por `estrato` si se indica) y de
+    cada celda se toman como máximo `cupo` puntos. Las zonas densas se recortan
+    y las dispersas (outliers, clusters pequeños) se conservan completas.
+    """
+    if len(df) <= max_puntos:
+        return df
+
+    valores = df[columnas].to_numpy(dtype=float)
+    minimos, maximos = np.nanmin(valores, axis=0), np.nanmax(valores, axis=0)
+    rango = np.where(maximos > minimos, maximos - minimos, 1.0)
+    celdas = np.clip(((valores - minimos) / rango * bins).astype(np.int64), 0, bins - 1)
+    clave = np.ravel_multi_index(celdas.T, (bins,) * len(columnas))
+    if estrato is not None:
+        codigos = pd.factorize(df[estrato])[0]
+        clave = clave * (codigos.max() + 1) + codigos
+
+    _, grupo, conteos = np.unique(clave, return_inverse=True, return_counts=True)
+
+    # Cupo por celda: el mayor entero con sum(min(conteo, cupo)) <= max_puntos
+    bajo, alto = 1, conteos.max()
+    while bajo < alto:
+        medio = (bajo + alto + 1) // 2
+        if np.minimum(conteos, medio).sum() <= max_puntos:
+            bajo = medio
+        else:
+            alto = medio - 1
+
+    # Orden aleatorio reproducible y rango de cada punto dentro de su celda
+    rng = np.random.default_rng(random_state)
+    orden = np.lexsort((rng.random(len(df)), grupo))
+    inicio_grupo = np.concatenate([[0], np.cumsum(conteos)[:-1]])
+    rango_en_celda = np.empty(len(df), dtype=np.int64)
+    rango_en_celda[orden] = np.arange(len(df)) - inicio_grupo[grupo[orden]]
+    return df[rango_en_celda < bajo]
+
 
 # --- FUNCIÓN DE VISUALIZACIÓN (FIEL AL NOTEBOOK) ---
-def plot_clusters_3d(df):
+def plot_clusters_3d(df, max_puntos=MAX_PUNTOS_3D):
     """
     Genera el gráfico 3D de clusters replicando exactamente el Notebook 02.
+    Con más de `max_puntos` filas se envía una submuestra por densidad.
     """
+    # plotly solo se importa cuando se dibuja (el entrenamiento no lo necesita)
+    import plotly.express as px
+
     # Aseguramos que existan las columnas necesarias
     required = ['num_estudiantes', 'num_ofertas', 'salario_oferta', 'categoria']
     if not all(col in df.columns for col in required):
         return None
 
+    total = len(df)
+    df = submuestrear_por_densidad(df, required[:3], max_puntos, estrato='categoria')
+    titulo = '<b>Clustering de Carreras 2025</b>'
+    if len(df) < total:
+        titulo += f' <span style="font-size:11px">(muestra de {len(df):,} de {total:,} puntos)</span>'
+
     fig = px.scatter_3d(
         df,
         x='num_estudiantes',
@@ -23,7 +83,7 @@ def plot_clusters_3d(df):
         hover_name='carrera',
         # Formato de hover data idéntico al notebook
         hover_data={'tasa_empleo_formal':':.1f%', 'sector_economico':True},
-        title='<b>Clustering de Carreras 2025</b>',
+        title=titulo,
         labels={
             'num_estudiantes': 'Total Graduados (2015-2023)',
             'num_ofertas': 'Ofertas Activas',
@@ -50,22 +110,123 @@ def plot_clusters_3d(df):
     )
     return fig
 
+# --- BARRIDO DE K (función de módulo para poder ejecutarse en otros procesos) ---
+def _evaluar_k(X_scaled, k, modo, random_state, n_init, muestra_silueta):
+    modelo = _crear_modelo(modo, k, random_state, n_init)
+    etiquetas = modelo.fit_predict(X_scaled)
+    silueta = np.nan
+    if 1 < len(np.unique(etiquetas)) < len(X_scaled):
+        silueta = silhouette_score(X_scaled, etiquetas, random_state=random_state,
+                                   sample_size=min(muestra_silueta, len(X_scaled)))
+    return {'k': k, 'inercia': modelo.inertia_, 'silueta': silueta}
+
+
+def _crear_modelo(modo, n_clusters, random_state, n_init, init='k-means++'):
+    if modo == 'minibatch':
+        # Para agrupar ofertas individuales (cientos de miles de filas)
+        return MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state, n_init=n_init,
+                               init=init, batch_size=4096)
+    if modo == 'kmeans':
+        return KMeans(n_clusters=n_clusters, random_state=random_state, n_init=n_init, init=init)
+    raise ValueError(f"Modo de clustering desconocido: {modo}. Opciones: ['kmeans', 'minibatch']")
+
+
 # --- CLASE DE LÓGICA DE NEGOCIO ---
 class CareerClusterer:
-    def __init__(self, df_master):
-        self.df = df_master.copy()
+    def __init__(self, df_master, estado=None, n_clusters=4, modo='kmeans', random_state=42, n_init=10):
+        # Copia superficial: comparte las columnas de df_master (solo se agregan cluster/categoria)
+        self.df = df_master.copy(deep=False)
         self.features = ['num_estudiantes', 'num_ofertas', 'salario_oferta', 'tasa_empleo_formal']
+        self.params = {'modo': modo, 'n_clusters': n_clusters, 'random_state': random_state, 'n_init': n_init}
+        self.scaler = None
         self.kmeans = None
+        self.mapa_labels = None
+        # Huella de cada fila usada en el ajuste (para decidir un warm start en la siguiente corrida)
+        self.huellas_filas = None
+        if estado is not None:
+            self.cargar_estado(estado)
+
+    def exportar_estado(self):
+        """Modelos ajustados para guardar en el ModelStore."""
+        return {'scaler': self.scaler, 'kmeans': self.kmeans, 'mapa_labels': self.mapa_labels,
+                'huellas_filas': self.huellas_filas}
+
+    def cargar_estado(self, estado):
+        self.scaler = estado['scaler']
+        self.kmeans = estado['kmeans']
+        self.mapa_labels = estado['mapa_labels']
+        self.huellas_filas = estado.get('huellas_filas')
+
+    def _huellas(self):
+        return pd.util.hash_pandas_object(self.df[self.features], index=False).to_numpy()
+
+    @staticmethod
+    def centroides_de(estado):
+        """Centroides en unidades originales de un estado guardado (para warm start)."""
+        return estado['scaler'].inverse_transform(estado['kmeans'].cluster_centers_)
+
+    @instrumentado('clustering.barrido_k')
+    def barrido_k(self, rango_k=range(2, 9), n_jobs=-1, muestra_silueta=10_000):
+        """
+        Evalúa varios K en paralelo (un proceso por K) con inercia y silueta.
+        Cada K usa la misma semilla, por lo que el resultado es determinista.
+        """
+        X_scaled = StandardScaler().fit_transform(self.df[self.features])
+        p = self.params
+        resultados = Parallel(n_jobs=n_jobs)(
+            delayed(_evaluar_k)(X_scaled, k, p['modo'], p['random_state'], p['n_init'], muestra_silueta)
+            for k in rango_k
+        )
+        return pd.DataFrame(resultados)
+
+    def _ajustar(self, X_scaled, previo=None):
+        """
+        K-Means sobre X_scaled. Con `previo` (estado de la corrida anterior) se
+        usa un warm start de una sola inicialización solo si casi todas las filas
+        son las mismas que vio ese ajuste y la inercia media por fila no empeora.
+        Si no, se ajusta con n_init completo y se queda el de menor inercia: las
+        etiquetas no dependen de qué artefacto haya quedado en la caché.
+        """
+        p = self.params
+        rapido = None
+        previas = previo.get('huellas_filas') if previo is not None else None
+        if previas is not None and np.shape(self.centroides_de(previo)) == (p['n_clusters'], len(self.features)):
+            comunes = np.isin(self.huellas_filas, previas).sum()
+            cambios = (len(self.huellas_filas) - comunes) + (len(previas) - comunes)
+            if cambios <= TOLERANCIA_FILAS * len(previas):
+                init = self.scaler.transform(pd.DataFrame(self.centroides_de(previo), columns=self.features))
+                rapido = _crear_modelo(p['modo'], p['n_clusters'], p['random_state'], 1, init=init).fit(X_scaled)
+                limite = (1 + TOLERANCIA_INERCIA) * previo['kmeans'].inertia_ / len(previas)
+                if rapido.inertia_ / len(X_scaled) <= limite:
+                    return rapido
+
+        completo = _crear_modelo(p['modo'], p['n_clusters'], p['random_state'], p['n_init']).fit(X_scaled)
+        if rapido is not None and rapido.inertia_ < completo.inertia_:
+            return rapido
+        return completo
+
+    @instrumentado('clustering.ejecutar')
+    def ejecutar_clustering(self, previo=None):
+        """
+        Ejecuta K-Means (o reutiliza el modelo cargado) y aplica etiquetas.
+        previo: estado guardado de la corrida anterior, para un warm start
+        cuando los datos cambian poco (ver _ajustar).
+        """
+        if self.kmeans is not None:
+            # Modelo restaurado del ModelStore: solo se asignan clusters y etiquetas
+            X_scaled = self.scaler.transform(self.df[self.features])
+            self.df['cluster'] = self.kmeans.predict(X_scaled)
+            self.df['categoria'] = self.df['cluster'].map(self.mapa_labels)
+            return self.df
 
-    def ejecutar_clustering(self):
-        """Ejecuta K-Means y aplica etiquetas."""
         # 1. Escalar
-        scaler = StandardScaler()
-        X_scaled = scaler.fit_transform(self.df[self.features])
+        self.scaler = StandardScaler()
+        X_scaled = self.scaler.fit_transform(self.df[self.features])
+        self.huellas_filas = self._huellas()
         
-        # 2. Modelo (K=4)
-        self.kmeans = KMeans(n_clusters=4, random_state=42, n_init=10)
-        self.df['cluster'] = self.kmeans.fit_predict(X_scaled)
+        # 2. Modelo (K=4 por defecto)
+        self.kmeans = self._ajustar(X_scaled, previo)
+        self.df['cluster'] = self.kmeans.labels_
         
         # 3. Etiquetado Inteligente
         centroides = self.df.groupby('cluster')[self.features].mean()
@@ -82,7 +243,7 @@ class CareerClusterer:
             elif not muchos_graduados and (buen_sueldo or empleo_estable): return "Nicho"
             else: return "Balanceada"
 
-        mapa_labels = {i: _get_label(centroides.loc[i], medias) for i in centroides.index}
-        self.df['categoria'] = self.df['cluster'].map(mapa_labels)
+        self.mapa_labels = {i: _get_label(centroides.loc[i], medias) for i in centroides.index}
+        self.df['categoria'] = self.df['cluster'].map(self.mapa_labels)
         
-        return self.df
\ No newline at end of file
+        return self.df
@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+import pandas as pd
+from src.instrumentation import METRICAS
+
+# pyarrow es opcional: sin él se lee el CSV directamente (comportamiento original)
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+# Columnas de texto con pocos valores distintos que se guardan como categóricas
+COLUMNAS_CATEGORICAS = ['carrera_requerida', 'provincia', 'sector', 'empresa']
+
+FORMATO_VERSION = 1
+
+
+class ColumnarCache:
+    """
+    Caché columnar (Feather/Arrow sin compresión) para los CSV de entrada.
+    El CSV se convierte una sola vez; las siguientes cargas hacen memory-map
+    del archivo cacheado y solo se reconstruye si cambia el tamaño, la fecha
+    de modificación o el hash del contenido del CSV original.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def disponible():
+        return feather is not None
+
+    def _rutas(self, ruta_csv):
+        # El hash de la ruta absoluta distingue CSV homónimos de distintas carpetas
+        ruta = os.path.abspath(ruta_csv)
+        base = f"{os.path.basename(ruta)}-{hashlib.sha256(ruta.encode('utf-8')).hexdigest()[:12]}"
+        return (os.path.join(self.cache_dir, base + '.feather'),
+                os.path.join(self.cache_dir, base + '.meta.json'))
+
+    @staticmethod
+    def hash_archivo(ruta, bloque=1 << 20):
+        h = hashlib.sha256()
+        with open(ruta, 'rb') as f:
+            for chunk in iter(lambda: f.read(bloque), b''):
+                h.update(chunk)
+        return h.hexdigest()
+
+    def _es_valida(self, ruta_csv, ruta_cache, ruta_meta):
+        """Comprueba tamaño/mtime (rápido) y, si hace falta, el hash del contenido."""
+        if not (os.path.exists(ruta_cache) and os.path.exists(ruta_meta)):
+            return False
+        try:
+            with open(ruta_meta, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            # Metadatos truncados o corruptos: se reconstruye la caché
+            return False
+        if not isinstance(meta, dict):
+            return False
+        st = os.stat(ruta_csv)
+        if meta.get('version') != FORMATO_VERSION or meta.get('size') != st.st_size:
+            return False
+        if meta.get('mtime_ns') == st.st_mtime_ns:
+            return True
+        # Misma longitud pero mtime distinto (p.ej. `touch`): decidir por contenido
+        if meta.get('sha256') != self.hash_archivo(ruta_csv):
+            return False
+        meta['mtime_ns'] = st.st_mtime_ns
+        self._escribir_meta(ruta_meta, meta)
+        return True
+
+    @staticmethod
+    def _escribir_meta(ruta_meta, meta):
+        tmp = ruta_meta + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp, ruta_meta)
+
+    @staticmethod
+    def _tipar(df):
+        for col in COLUMNAS_CATEGORICAS:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+        return df
+
+    def _construir(self, ruta_csv, ruta_cache, ruta_meta):
+        st = os.stat(ruta_csv)
+        sha = self.hash_archivo(ruta_csv)
+        df = self._tipar(pd.read_csv(ruta_csv))
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = ruta_cache + '.tmp'
+            # Sin compresión para que la lectura posterior pueda hacer memory-map
+            feather.write_feather(df, tmp, compression='uncompressed')
+            os.replace(tmp, ruta_cache)
+            self._escribir_meta(ruta_meta, {
+                'version': FORMATO_VERSION,
+                'size': st.st_size,
+                'mtime_ns': st.st_mtime_ns,
+                'sha256': sha,
+            })
+        except OSError as e:
+            print(f"⚠️ [Cache] No se pudo escribir la caché de {ruta_csv}: {e}")
+        return df
+
+    def read_csv(self, ruta_csv):
+        """Devuelve el DataFrame del CSV usando la caché columnar si está vigente."""
+        if not self.disponible():
+            return pd.read_csv(ruta_csv)
+
+        ruta_cache, ruta_meta = self._rutas(ruta_csv)
+        if self._es_valida(ruta_csv, ruta_cache, ruta_meta):
+            self.hits += 1
+            METRICAS.contar_cache('csv_columnar', True)
+            tabla = feather.read_table(ruta_cache, memory_map=True)
+            return tabla.to_pandas(split_blocks=True)
+
+        self.misses += 1
+        METRICAS.contar_cache('csv_columnar', False)
+        return self._construir(ruta_csv, ruta_cache, ruta_meta)
@@ -1,66 +1,355 @@
 import pandas as pd
 import numpy as np
 import os
+from collections import Counter
+from src.data_cache import ColumnarCache
+from src.instrumentation import METRICAS, instrumentado
+from src.fuzzy_join import ResolutorCarreras, normalizar_serie
+from src.schema import COLUMNAS_ANDAMIAJE, aplicar_esquema, memoria_mb
+from src.sector_mapper import mapper_por_defecto
+
+# Columnas que necesita el modo streaming para los agregados de ofertas
+COLUMNAS_STREAMING = ['titulo_puesto', 'carrera_requerida', 'salario_minimo', 'salario_maximo', 'fecha_publicacion']
+
+
+class ResumenOfertas:
+    """
+    Agregados de ofertas construidos en una sola pasada por lotes:
+    estadísticos por carrera, conteo de carrera_requerida e histograma de salarios.
+    """
+
+    def __init__(self, ancho_bin=25):
+        self.ancho_bin = ancho_bin
+        self.stats = None
+        self.conteo_carreras = pd.Series(dtype='int64')
+        self.histograma = pd.Series(dtype='int64')  # índice: número de bin (salario // ancho_bin)
+        self.filas = 0
+        self.watermark_fecha = None
+        self.vistas_watermark = Counter()
+
+    def actualizar(self, chunk):
+        """Incorpora un lote (debe traer la columna salario_oferta)."""
+        delta = DataManager._estadisticas_ofertas(chunk)
+        if self.stats is None:
+            self.stats = delta
+        else:
+            stats = self.stats.add(delta, fill_value=0).sort_index()
+            self.stats = stats.astype({'n_titulos': 'int64', 'n_salarios': 'int64'})
+
+        self.conteo_carreras = self.conteo_carreras.add(chunk['carrera_requerida'].value_counts(), fill_value=0).astype('int64')
+
+        bins = np.floor(chunk['salario_oferta'].dropna() / self.ancho_bin).astype('int64')
+        self.histograma = self.histograma.add(bins.value_counts(), fill_value=0).astype('int64')
+
+        self.filas += len(chunk)
+        self.watermark_fecha, self.vistas_watermark = DataManager._avanzar_watermark(
+            self.watermark_fecha, self.vistas_watermark, chunk)
+
+    def histograma_salarios(self, nbins=20):
+        """Reagrupa los bins finos en `nbins` barras de igual ancho (salario_inicio, ancho, conteo)."""
+        if self.histograma.empty:
+            return pd.DataFrame(columns=['salario_inicio', 'ancho', 'conteo'])
+        ids = self.histograma.index.to_numpy()
+        inicio, fin = ids.min() * self.ancho_bin, (ids.max() + 1) * self.ancho_bin
+        bordes = np.linspace(inicio, fin, nbins + 1)
+        conteo, _ = np.histogram(ids * self.ancho_bin, bins=bordes, weights=self.histograma.to_numpy())
+        return pd.DataFrame({'salario_inicio': bordes[:-1], 'ancho': np.diff(bordes), 'conteo': conteo.astype('int64')})
+
 
 class DataManager:
-    def __init__(self):
+    def __init__(self, use_cache=True, cache_dir=None, medir_memoria=False):
         self.df_matricula = None
         self.df_ofertas = None
         self.df_inec = None
+        self.use_cache = use_cache
+        self.cache_dir = cache_dir
+        self.cache = None
+        # Estado del modo incremental
+        self._df_est = None
+        self._df_inec_agg = None
+        self._stats_ofertas = None
+        self._filas_procesadas = 0
+        self.watermark_fecha = None
+        # Huellas de las filas ya contadas con fecha == watermark (para no perder ni repetir ese día)
+        self._vistas_watermark = Counter()
+        self.resumen_ofertas = None
+        # Memoria (MB) antes/después de compactar cada tabla (ver src/schema.py)
+        self.medir_memoria = medir_memoria
+        self.reporte_memoria = {}
+        # Alias carrera de matrícula -> carrera de ofertas (ver src/fuzzy_join.py)
+        self.resolutor = None
+        self._dir_cache = None
+
+    def _reporte(self):
+        """Dict donde registrar memoria, o None si no se mide (deep=True cuesta en tablas grandes)."""
+        return self.reporte_memoria if (self.medir_memoria or METRICAS.habilitado) else None
+
+    def _resolutor(self):
+        """Resolutor de alias, persistido junto a la caché columnar si está habilitada."""
+        if self.resolutor is None:
+            ruta = os.path.join(self._dir_cache, 'alias_carreras.json') if self.use_cache and self._dir_cache else None
+            self.resolutor = ResolutorCarreras(ruta)
+        return self.resolutor
 
     def load_data(self, file_matricula, file_ofertas, file_inec, path='data/'):
-        """Carga los datos desde CSVs."""
+        """Carga los datos desde CSVs (vía caché columnar si está habilitada)."""
+        try:
+            with METRICAS.etapa('data.load_data') as span:
+                self._dir_cache = self.cache_dir or os.path.join(path, '.cache')
+                if self.use_cache:
+                    self.cache = ColumnarCache(self._dir_cache)
+                    leer = self.cache.read_csv
+                else:
+                    leer = pd.read_csv
+                self.df_matricula = aplicar_esquema(leer(os.path.join(path, file_matricula)), 'matricula', self._reporte())
+                self.df_ofertas = aplicar_esquema(leer(os.path.join(path, file_ofertas)), 'ofertas', self._reporte())
+                self.df_inec = aplicar_esquema(leer(os.path.join(path, file_inec)), 'inec', self._reporte())
+                span.registrar(filas=len(self.df_matricula) + len(self.df_ofertas) + len(self.df_inec),
+                               memoria=dict(self.reporte_memoria))
+            return True
+        except Exception as e:
+            print(f"Error cargando datos: {e}")
+            return False
+
+    @instrumentado('data.load_data_streaming', filas=None)
+    def load_data_streaming(self, file_matricula, file_ofertas, file_inec, path='data/', chunksize=100_000):
+        """
+        Igual que load_data, pero las ofertas se leen por bloques y solo se guardan
+        sus agregados (ResumenOfertas). df_ofertas queda en None y la memoria pico
+        no depende del tamaño del CSV de ofertas.
+        """
         try:
-            self.df_matricula = pd.read_csv(os.path.join(path, file_matricula))
-            self.df_ofertas = pd.read_csv(os.path.join(path, file_ofertas))
-            self.df_inec = pd.read_csv(os.path.join(path, file_inec))
+            self._dir_cache = self.cache_dir or os.path.join(path, '.cache')
+            leer = ColumnarCache(self._dir_cache).read_csv if self.use_cache else pd.read_csv
+            self.df_matricula = aplicar_esquema(leer(os.path.join(path, file_matricula)), 'matricula', self._reporte())
+            self.df_inec = aplicar_esquema(leer(os.path.join(path, file_inec)), 'inec', self._reporte())
+
+            self.resumen_ofertas = ResumenOfertas()
+            for chunk in self.iter_ofertas(os.path.join(path, file_ofertas), chunksize):
+                self.resumen_ofertas.actualizar(chunk)
+            self.df_ofertas = None
             return True
         except Exception as e:
             print(f"Error cargando datos: {e}")
             return False
 
+    @staticmethod
+    def iter_ofertas(ruta, chunksize=100_000, saltar_filas=0):
+        """Generador de lotes del CSV de ofertas con solo las columnas necesarias."""
+        lector = pd.read_csv(
+            ruta,
+            usecols=COLUMNAS_STREAMING,
+            chunksize=chunksize,
+            skiprows=range(1, saltar_filas + 1) if saltar_filas else None,
+        )
+        for chunk in lector:
+            chunk['salario_oferta'] = (chunk['salario_minimo'] + chunk['salario_maximo']) / 2
+            yield chunk
+
+    @instrumentado('data.process_and_merge')
     def process_and_merge(self):
-        """Procesa y fusiona los dataframes."""
+        """Procesa y fusiona los dataframes (recálculo completo)."""
         if self.df_matricula is None: return None
 
         # 1. Agrupar Estudiantes
-        df_est = self.df_matricula.groupby('carrera')['num_estudiantes'].sum().reset_index()
-        df_est['key'] = df_est['carrera'].str.lower().str.strip()
-
-        # 2. Agrupar Ofertas
-        self.df_ofertas['salario_oferta'] = (self.df_ofertas['salario_minimo'] + self.df_ofertas['salario_maximo']) / 2
-        df_off = self.df_ofertas.groupby('carrera_requerida').agg({
-            'titulo_puesto': 'count',
-            'salario_oferta': 'mean'
+        self._df_est = self._agrupar_estudiantes()
+
+        # 2. Agrupar Ofertas (estadísticos suficientes: conteos y suma de salarios)
+        if self.df_ofertas is None and self.resumen_ofertas is not None:
+            # Modo streaming: los agregados ya se calcularon al leer
+            self._stats_ofertas = self.resumen_ofertas.stats
+            self._filas_procesadas = self.resumen_ofertas.filas
+            self.watermark_fecha = self.resumen_ofertas.watermark_fecha
+            self._vistas_watermark = Counter(self.resumen_ofertas.vistas_watermark)
+        else:
+            self.df_ofertas['salario_oferta'] = (self.df_ofertas['salario_minimo'] + self.df_ofertas['salario_maximo']) / 2
+            self._stats_ofertas = self._estadisticas_ofertas(self.df_ofertas)
+            self._filas_procesadas = len(self.df_ofertas)
+            self.watermark_fecha, self._vistas_watermark = self._avanzar_watermark(None, Counter(), self.df_ofertas)
+
+        # INEC no cambia entre incrementos: se agrega una sola vez
+        self._df_inec_agg = self._agregar_inec()
+
+        return self._construir_master()
+
+    @instrumentado('data.agregar_ofertas')
+    def agregar_ofertas(self, df_nuevas):
+        """
+        Modo incremental: incorpora solo las ofertas nuevas a los estadísticos
+        acumulados y devuelve el df_master actualizado (igual a un recálculo completo).
+        """
+        if self._stats_ofertas is None:
+            raise RuntimeError("Ejecuta process_and_merge() antes de agregar ofertas.")
+        if df_nuevas is None or df_nuevas.empty:
+            return self._construir_master()
+
+        df_nuevas = df_nuevas.copy()
+        df_nuevas['salario_oferta'] = (df_nuevas['salario_minimo'] + df_nuevas['salario_maximo']) / 2
+        if self.resumen_ofertas is not None and self.df_ofertas is None:
+            # Modo streaming: el resumen lleva los estadísticos, no se guardan filas
+            self.resumen_ofertas.actualizar(df_nuevas)
+            self._stats_ofertas = self.resumen_ofertas.stats
+        else:
+            delta = self._estadisticas_ofertas(df_nuevas)
+            stats = self._stats_ofertas.add(delta, fill_value=0).sort_index()
+            self._stats_ofertas = stats.astype({'n_titulos': 'int64', 'n_salarios': 'int64'})
+            self.df_ofertas = aplicar_esquema(pd.concat([self.df_ofertas, df_nuevas], ignore_index=True), 'ofertas')
+        self._filas_procesadas += len(df_nuevas)
+        self.watermark_fecha, self._vistas_watermark = self._avanzar_watermark(
+            self.watermark_fecha, self._vistas_watermark, df_nuevas)
+
+        return self._construir_master()
+
+    def ofertas_nuevas(self, df_ofertas, por='filas'):
+        """
+        Devuelve las filas de df_ofertas que aún no se han procesado.
+        - por='filas': el CSV crece solo por append; se toman las filas posteriores a las ya procesadas.
+        - por='fecha': filas con fecha_publicacion posterior al watermark, más las
+          de la misma fecha que aún no se contaron (las ya contadas se descuentan
+          una por huella de fila, así se admiten filas repetidas legítimas).
+        """
+        if por == 'filas':
+            return df_ofertas.iloc[self._filas_procesadas:]
+        if self.watermark_fecha is None:
+            return df_ofertas
+        fechas = pd.to_datetime(df_ofertas['fecha_publicacion'], errors='coerce')
+        nuevas = (fechas > self.watermark_fecha).to_numpy(copy=True)
+        en_watermark = np.flatnonzero((fechas == self.watermark_fecha).to_numpy())
+        pendientes = Counter(self._vistas_watermark)
+        for i, huella in zip(en_watermark, self._huellas_filas(df_ofertas.iloc[en_watermark])):
+            if pendientes[huella] > 0:
+                pendientes[huella] -= 1
+            else:
+                nuevas[i] = True
+        return df_ofertas[nuevas]
+
+    @staticmethod
+    def _huellas_filas(df):
+        """Hash por fila que no depende del dtype (texto, categórica, fecha ya convertida o int32)."""
+        columnas = {}
+        for col in COLUMNAS_STREAMING:
+            serie = df[col]
+            if col == 'fecha_publicacion':
+                serie = pd.to_datetime(serie, errors='coerce')
+            elif pd.api.types.is_numeric_dtype(serie):
+                serie = serie.astype('float64')
+            else:
+                serie = serie.astype(str)
+            columnas[col] = serie.to_numpy()
+        return pd.util.hash_pandas_object(pd.DataFrame(columnas), index=False).tolist()
+
+    @staticmethod
+    def _avanzar_watermark(fecha, vistas, df):
+        """Watermark (fecha máxima) y huellas de las filas con esa fecha tras incorporar df."""
+        if 'fecha_publicacion' not in df.columns or df.empty:
+            return fecha, vistas
+        fechas = pd.to_datetime(df['fecha_publicacion'], errors='coerce')
+        maxima = fechas.max()
+        if pd.isna(maxima) or (fecha is not None and maxima < fecha):
+            return fecha, vistas
+        huellas = Counter(DataManager._huellas_filas(df[(fechas == maxima).to_numpy()]))
+        return maxima, (vistas + huellas if maxima == fecha else huellas)
+
+    @staticmethod
+    def _estadisticas_ofertas(df, por=()):
+        """
+        Conteo de títulos, conteo y suma de salarios por carrera_requerida
+        (precedida de las columnas `por`, p.ej. provincia y trimestre).
+        """
+        stats = df.groupby([*por, 'carrera_requerida'], observed=True).agg(
+            n_titulos=('titulo_puesto', 'count'),
+            n_salarios=('salario_oferta', 'count'),
+            suma_salario=('salario_oferta', 'sum'),
+        )
+        # Índice como texto para poder combinar lotes con categorías distintas
+        if por:
+            stats.index = stats.index.set_levels([nivel.astype(object) for nivel in stats.index.levels])
+        else:
+            stats.index = stats.index.astype(object)
+        return stats
+
+    def _agrupar_estudiantes(self):
+        df_est = self.df_matricula.groupby('carrera', observed=True)['num_estudiantes'].sum().reset_index()
+        df_est['carrera'] = df_est['carrera'].astype(str)
+        # Clave canónica: sin acentos ni abreviaturas ("Ing. Civil" == "Ingeniería Civil")
+        df_est['key'] = normalizar_serie(df_est['carrera']).to_numpy()
+        return df_est
+
+    def _agregar_inec(self):
+        if self.df_inec is None:
+            return None
+        # Limpieza básica INEC
+        df_inec_clean = self.df_inec[self.df_inec['nivel_educacion'] == 'Educación Superior Universitaria']
+        return df_inec_clean.groupby('sector_economico', observed=True).agg({
+            'tasa_empleo_formal': 'mean',
+            'salario_promedio_mensual': 'mean'
         }).reset_index()
-        df_off.rename(columns={'titulo_puesto': 'num_ofertas'}, inplace=True)
-        df_off['key'] = df_off['carrera_requerida'].str.lower().str.strip()
-
-        # 3. Mapeo de Sectores (CRÍTICO: Debe coincidir con NLP)
-        def _mapear_sector(carrera):
-            c = str(carrera).lower()
-            if 'sistemas' in c or 'software' in c or 'informática' in c or 'computación' in c: return 'Información y Comunicación'
-            elif 'administración' in c or 'contabilidad' in c or 'financ' in c or 'marketing' in c or 'comercio' in c or 'negocios' in c: return 'Actividades Financieras'
-            elif 'medicina' in c or 'enfermería' in c or 'salud' in c or 'odont' in c: return 'Salud Humana'
-            elif 'civil' in c or 'arquitectura' in c or 'construcción' in c: return 'Construcción'
-            elif 'mecánica' in c or 'industrial' in c or 'eléctrica' in c: return 'Industrias Manufactureras'
-            elif 'educación' in c or 'docencia' in c or 'pedagogía' in c: return 'Educación'
-            elif 'agro' in c or 'veterinaria' in c or 'agrónom' in c: return 'Agricultura y Ganadería'
-            else: return 'Actividades Profesionales'
-
-        df_est['sector_economico'] = df_est['carrera'].apply(_mapear_sector)
-
-        # 4. Merges
+
+    def _construir_master(self):
+        """Reconstruye df_master a partir de los agregados ya calculados."""
+        df_off = self.ofertas_por_clave(self._stats_ofertas)
+        # 4. Unión difusa: cada clave de matrícula se lleva a la clave de ofertas más parecida
+        alias = self._resolutor().resolver(self._df_est['key'], df_off['key'])
+        return self.combinar_master(self._df_est, df_off, self._df_inec_agg, alias, reporte=self._reporte())
+
+    def alias_y_nombres(self):
+        """
+        Alias y nombre mostrado por clave canónica del último df_master: los
+        cortes (src/snapshots.py) los reutilizan para que una carrera se llame
+        igual en todos ellos.
+        """
+        if self._stats_ofertas is None:
+            raise RuntimeError("Ejecuta process_and_merge() antes de pedir los alias.")
+        df_off = self.ofertas_por_clave(self._stats_ofertas)
+        alias = self._resolutor().resolver(self._df_est['key'], df_off['key'])
+        return alias, self.nombres_carreras(self._df_est, df_off, alias)
+
+    @staticmethod
+    def ofertas_por_clave(stats):
+        """Estadísticos de ofertas por clave canónica (se conserva la grafía con más ofertas)."""
+        # Variantes de escritura de una misma carrera en las ofertas se suman bajo su clave canónica
+        stats = stats.sort_values('n_titulos', ascending=False, kind='stable')
+        df_off = stats.assign(carrera_oferta=stats.index).groupby(normalizar_serie(stats.index).to_numpy()).agg(
+            carrera_oferta=('carrera_oferta', 'first'), n_titulos=('n_titulos', 'sum'),
+            n_salarios=('n_salarios', 'sum'), suma_salario=('suma_salario', 'sum'))
+        return pd.DataFrame({
+            'key': df_off.index,
+            'carrera_oferta': df_off['carrera_oferta'].to_numpy(),
+            'num_ofertas': df_off['n_titulos'].to_numpy(),
+            'salario_oferta': (df_off['suma_salario'] / df_off['n_salarios'].where(df_off['n_salarios'] > 0)).to_numpy(),
+        })
+
+    @staticmethod
+    def nombres_carreras(df_est, df_off, alias):
+        """Nombre mostrado por clave: el de las ofertas si hubo coincidencia; si no, la grafía con más estudiantes."""
+        df_est = df_est.assign(key=df_est['key'].map(alias)).sort_values('num_estudiantes', ascending=False, kind='stable')
+        nombres = dict(zip(df_est['key'], df_est['carrera']))
+        nombres.update((k, v) for k, v in zip(df_off['key'], df_off['carrera_oferta']) if k in nombres)
+        return nombres
+
+    @staticmethod
+    def combinar_master(df_est, df_off, df_inec_agg, alias, nombres=None, reporte=None):
+        """
+        df_master a partir de estudiantes por carrera (con 'key'), ofertas por
+        clave y el agregado INEC. Función pura: también la usan los cortes por
+        provincia y trimestre en otros procesos.
+        """
+        if nombres is None:
+            nombres = DataManager.nombres_carreras(df_est, df_off, alias)
+        # Variantes de una misma carrera en la matrícula se suman bajo una sola fila
+        df_est = (df_est.assign(key=df_est['key'].map(alias))
+                  .groupby('key', sort=False)['num_estudiantes'].sum().reset_index())
+
+        # Merges
         df_master = pd.merge(df_est, df_off, on='key', how='left')
-        
+        df_master.insert(0, 'carrera', df_master['key'].map(nombres).astype(str))
+        df_master = df_master.sort_values('carrera', ignore_index=True)
+
+        # 3. Mapeo de Sectores (taxonomía compartida con NLP)
+        df_master['sector_economico'] = mapper_por_defecto().clasificar(df_master['carrera']).to_numpy()
+
         # Merge con INEC (Opcional para salarios de referencia)
-        if self.df_inec is not None:
-             # Limpieza básica INEC
-            df_inec_clean = self.df_inec[self.df_inec['nivel_educacion'] == 'Educación Superior Universitaria']
-            df_inec_agg = df_inec_clean.groupby('sector_economico').agg({
-                'tasa_empleo_formal': 'mean',
-                'salario_promedio_mensual': 'mean'
-            }).reset_index()
+        if df_inec_agg is not None:
             # Left join para no perder carreras
             df_master = pd.merge(df_master, df_inec_agg, on='sector_economico', how='left')
 
@@ -70,7 +359,12 @@ class DataManager:
         promedio_global = df_master['salario_oferta'].mean()
         df_master['salario_oferta'] = df_master['salario_oferta'].fillna(df_master['salario_promedio_mensual'])
         df_master['salario_oferta'] = df_master['salario_oferta'].fillna(promedio_global)
-        
+
         df_master['tasa_empleo_formal'] = df_master['tasa_empleo_formal'].fillna(50.0)
 
-        return df_master
\ No newline at end of file
+        # 6. Sin columnas auxiliares del merge y con tipos compactos
+        antes = memoria_mb(df_master) if reporte is not None else None
+        df_master = aplicar_esquema(df_master.drop(columns=COLUMNAS_ANDAMIAJE), 'master', reporte)
+        if reporte is not None:
+            reporte['master']['antes_mb'] = round(float(antes), 3)
+        return df_master
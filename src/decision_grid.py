@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+from src.instrumentation import instrumentado
+
+# Ejes del simulador: (mínimo, máximo, paso) por feature, los mismos que los controles de la página
+EJES_SIMULADOR = {
+    'num_estudiantes': (0, 20000, 500),
+    'num_ofertas': (0, 1000, 10),
+    'salario_oferta': (400, 5000, 50),
+    'tasa_empleo_formal': (0, 100, 1),
+}
+# Probabilidades cuantizadas a uint8: error máximo 1/(2*255)
+ESCALA = 255
+
+
+class DecisionGrid:
+    """
+    Superficie de decisión precalculada del CareerPredictor sobre la grilla del
+    simulador. Un bosque solo compara cada feature contra sus umbrales de corte
+    (en float32, como sklearn): dos valores entre los mismos umbrales dan
+    exactamente la misma predicción. Cada eje se reduce a los intervalos que
+    toca la grilla, el bosque se evalúa una vez por celda (por lotes) y se
+    guardan las probabilidades en uint8 junto con la clase ganadora.
+
+    Consultar es ubicar cada valor en su intervalo (searchsorted sobre unos
+    cientos de umbrales) e indexar el array. Vale para cualquier valor cuyo
+    intervalo esté en la grilla, aunque no sea un múltiplo del paso; el resto
+    se delega al modelo.
+    """
+
+    def __init__(self, predictor, ejes=None, tam_lote=200_000, estado=None):
+        self.predictor = predictor
+        self.features = list(predictor.features)
+        ejes = {**EJES_SIMULADOR, **(ejes or {})}
+        self.ejes = {f: tuple(ejes[f]) for f in self.features}
+        self.tam_lote = tam_lote
+        self.classes_ = predictor.classes_
+        self.valores = [np.arange(lo, hi + paso / 2, paso, dtype=float) for lo, hi, paso in self.ejes.values()]
+        self.umbrales = None
+        self.mapa = None
+        self.representantes = None
+        self.probs = None
+        self.clase = None
+        if estado is not None:
+            self.cargar_estado(estado)
+
+    def exportar_estado(self):
+        """Arrays de la grilla para guardar en el ModelStore."""
+        return {'ejes': self.ejes, 'umbrales': self.umbrales, 'mapa': self.mapa,
+                'representantes': self.representantes, 'probs': self.probs, 'clase': self.clase}
+
+    def cargar_estado(self, estado):
+        self.umbrales = estado['umbrales']
+        self.mapa = estado['mapa']
+        self.representantes = estado['representantes']
+        self.probs = estado['probs']
+        self.clase = estado['clase']
+
+    def _intervalo(self, f, valores):
+        """Índice del intervalo entre umbrales del feature f (misma comparación float32 que sklearn)."""
+        return np.searchsorted(self.umbrales[f], np.asarray(valores, dtype=np.float32), side='left')
+
+    @instrumentado('simulador.construir', filas=lambda g: g.clase.size)
+    def construir(self):
+        """Evalúa el bosque una vez por celda distinta de la grilla, en lotes vectorizados."""
+        self.umbrales, self.mapa, self.representantes = [], [], []
+        for f, valores in enumerate(self.valores):
+            umbrales = np.unique(self.predictor.umbrales(f))
+            self.umbrales.append(umbrales)
+            intervalos, primera = np.unique(self._intervalo(f, valores), return_index=True)
+            mapa = np.full(len(umbrales) + 1, -1, dtype=np.int32)
+            mapa[intervalos] = np.arange(len(intervalos), dtype=np.int32)
+            self.mapa.append(mapa)
+            self.representantes.append(valores[primera])
+
+        forma = tuple(len(r) for r in self.representantes)
+        n = int(np.prod(forma))
+        probs = np.empty((n, len(self.classes_)), dtype=np.uint8)
+        clase = np.empty(n, dtype=np.uint8)
+        for inicio in range(0, n, self.tam_lote):
+            celdas = np.arange(inicio, min(n, inicio + self.tam_lote))
+            coords = np.unravel_index(celdas, forma)
+            X = np.column_stack([r[c] for r, c in zip(self.representantes, coords)])
+            _, p = self.predictor.predecir_batch(X)
+            probs[celdas] = np.rint(p * ESCALA).astype(np.uint8)
+            clase[celdas] = p.argmax(axis=1)
+        self.probs = probs.reshape(*forma, len(self.classes_))
+        self.clase = clase.reshape(forma)
+        return self
+
+    # --- Consulta ---
+    def predecir_batch(self, X):
+        """Como CareerPredictor.predecir_batch: (etiquetas, probabilidades) desde la grilla."""
+        X = np.asarray(X, dtype=float).reshape(-1, len(self.features))
+        celdas = np.column_stack([self.mapa[f][self._intervalo(f, X[:, f])] for f in range(len(self.features))])
+        en_grilla = (celdas >= 0).all(axis=1)
+
+        probs = np.empty((len(X), len(self.classes_)))
+        clase = np.empty(len(X), dtype=np.intp)
+        idx = tuple(celdas[en_grilla].T)
+        probs[en_grilla] = self.probs[idx] / ESCALA
+        clase[en_grilla] = self.clase[idx]
+        if not en_grilla.all():
+            # Intervalos que la grilla no cubre: se consulta al modelo
+            _, p = self.predictor.predecir_batch(X[~en_grilla])
+            probs[~en_grilla] = p
+            clase[~en_grilla] = p.argmax(axis=1)
+        return self.classes_[clase], probs
+
+    def predecir(self, est, ofe, sal, tasa):
+        """Misma salida que CareerPredictor.predecir, con una búsqueda en el array."""
+        celda = tuple(int(self.mapa[f][self._intervalo(f, v)]) for f, v in enumerate((est, ofe, sal, tasa)))
+        if min(celda) < 0:
+            return self.predictor.predecir(est, ofe, sal, tasa)
+        return self.classes_[self.clase[celda]], dict(zip(self.classes_, self.probs[celda] / ESCALA))
+
+    def sensibilidad(self, est, ofe, sal, tasa, feature):
+        """Probabilidad de cada categoría a lo largo de un eje, con los demás valores fijos."""
+        f = self.features.index(feature)
+        X = np.tile([est, ofe, sal, tasa], (len(self.valores[f]), 1)).astype(float)
+        X[:, f] = self.valores[f]
+        _, probs = self.predecir_batch(X)
+        return pd.DataFrame(probs, index=pd.Index(self.valores[f], name=feature), columns=self.classes_)
+
+    def verificar(self, n=5000, seed=0):
+        """
+        Compara contra el modelo directo en puntos de la grilla y en valores
+        continuos al azar dentro de los rangos: acuerdo de clase y error de probabilidad.
+        """
+        rng = np.random.default_rng(seed)
+        en_grilla = np.column_stack([rng.choice(v, n) for v in self.valores])
+        continuos = np.column_stack([rng.uniform(lo, hi, n) for lo, hi, _ in self.ejes.values()])
+        resultado = {}
+        for nombre, X in (('grilla', en_grilla), ('continuos', continuos)):
+            etiquetas, probs = self.predecir_batch(X)
+            directas, probs_directas = self.predictor.predecir_batch(X, compilado=False)
+            celdas = np.column_stack([self.mapa[f][self._intervalo(f, X[:, f])] for f in range(len(self.features))])
+            resultado[nombre] = {
+                'muestras': n,
+                'acuerdo_clase': float((etiquetas == directas).mean()),
+                'error_max_prob': float(np.abs(probs - probs_directas).max()),
+                'desde_grilla': float((celdas >= 0).all(axis=1).mean()),
+            }
+        return resultado
@@ -1,21 +1,129 @@
+import threading
+from collections import OrderedDict
+from functools import wraps
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from src.instrumentation import METRICAS
+from src.model_store import ModelStore
+
+# Caché compartida entre instancias (y usuarios): huella de datos -> agregados y figuras
+_CACHE = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+MAX_VERSIONES_CACHE = 4
+# Por encima de este número de ofertas el histograma se agrupa en el servidor
+MAX_FILAS_HISTOGRAMA_CRUDO = 5000
+# Marca de entrada ausente (una figura cacheada puede ser None)
+_FALTA = object()
+
+
+def _figura_cacheada(metodo):
+    """
+    Memoriza la figura por versión de datos y argumentos. Se guarda el objeto
+    Figure y se devuelve el mismo en cada acierto: reconstruirlo desde JSON
+    costaba ~15 ms, más que dibujar algunos gráficos.
+
+    La figura es compartida entre sesiones y no debe modificarse: quien quiera
+    cambiarle el estilo debe trabajar sobre una copia (go.Figure(fig)).
+    """
+    @wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        figuras = self._cache()['figuras']
+        clave = (metodo.__name__, args, tuple(sorted(kwargs.items())))
+        return self._memorizar(figuras, clave, 'eda_figuras', f'eda.{metodo.__name__}',
+                               lambda: metodo(self, *args, **kwargs))
+    return envoltura
+
 
 class EDAModule:
-    def __init__(self, df_matricula, df_ofertas, df_inec):
+    def __init__(self, df_matricula, df_ofertas, df_inec, resumen_ofertas=None):
         self.df_matricula = df_matricula
         self.df_ofertas = df_ofertas
         self.df_inec = df_inec
+        # Agregados del modo streaming (se usan cuando df_ofertas es None)
+        self.resumen_ofertas = resumen_ofertas
+        self.hits = 0
+        self.misses = 0
+        self.huella = self._calcular_huella()
+
+    def _calcular_huella(self):
+        if self.df_ofertas is not None:
+            ofertas = self.df_ofertas[['carrera_requerida', 'salario_minimo', 'salario_maximo']]
+        else:
+            r = self.resumen_ofertas
+            ofertas = pd.concat([r.conteo_carreras, r.histograma], keys=['carreras', 'salarios']).to_frame()
+        return ModelStore.huella(self.df_matricula, ofertas)
+
+    def _cache(self):
+        """Entrada de la caché para esta versión de datos (se descartan las más antiguas)."""
+        with _CACHE_LOCK:
+            if self.huella not in _CACHE:
+                _CACHE[self.huella] = {'agregados': {}, 'figuras': {}}
+                while len(_CACHE) > MAX_VERSIONES_CACHE:
+                    _CACHE.popitem(last=False)
+            else:
+                _CACHE.move_to_end(self.huella)
+            return _CACHE[self.huella]
+
+    def _memorizar(self, entradas, clave, metrica, etapa, calcular):
+        """
+        Valor de `entradas[clave]`, calculándolo si falta. El cálculo va fuera
+        del lock (no bloquea a las demás sesiones); la inserción con setdefault
+        va dentro, así dos sesiones que calculan a la vez reciben el mismo objeto.
+        """
+        with _CACHE_LOCK:
+            valor = entradas.get(clave, _FALTA)
+        METRICAS.contar_cache(metrica, valor is not _FALTA)
+        if valor is not _FALTA:
+            self.hits += 1
+            return valor
+        self.misses += 1
+        with METRICAS.etapa(etapa):
+            nuevo = calcular()
+        with _CACHE_LOCK:
+            return entradas.setdefault(clave, nuevo)
+
+    def _agregado(self, nombre, calcular):
+        """Tabla derivada calculada una sola vez por versión de datos."""
+        agregados = self._cache()['agregados']
+        return self._memorizar(agregados, nombre, 'eda_agregados', f'eda.agregado.{nombre}', calcular)
 
+    # --- Agregados compartidos entre gráficos ---
+    def _matricula_ultimo_anio(self):
+        """(año máximo, estudiantes por carrera en ese año ordenados de mayor a menor)"""
+        def calcular():
+            anio_max = self.df_matricula['año'].max()
+            df_curr = self.df_matricula[self.df_matricula['año'] == anio_max]
+            por_carrera = df_curr.groupby('carrera', observed=True)['num_estudiantes'].sum().sort_values(ascending=False)
+            return anio_max, por_carrera
+        return self._agregado('matricula_ultimo_anio', calcular)
+
+    def _demanda_por_carrera(self):
+        def calcular():
+            if self.df_ofertas is None:
+                demanda = self.resumen_ofertas.conteo_carreras.sort_values(ascending=False).reset_index()
+            else:
+                demanda = self.df_ofertas['carrera_requerida'].value_counts().reset_index()
+            demanda.columns = ['carrera', 'Total_Ofertas']
+            demanda['carrera'] = demanda['carrera'].astype(str)
+            return demanda
+        return self._agregado('demanda_por_carrera', calcular)
+
+    def _salario_promedio(self):
+        # Solo la columna derivada: no se copia el DataFrame de ofertas
+        return self._agregado('salario_promedio', lambda: (
+            (self.df_ofertas['salario_minimo'] + self.df_ofertas['salario_maximo']) / 2
+        ).rename('salario_promedio'))
+
+    @_figura_cacheada
     def plot_top_carreras_matricula(self):
         """Top 10 Carreras con mayor matrícula (Replica Notebook 01)"""
         if 'año' not in self.df_matricula.columns: return None
         # Filtramos último año disponible (usualmente 2023)
-        anio_max = self.df_matricula['año'].max()
-        df_curr = self.df_matricula[self.df_matricula['año'] == anio_max]
+        anio_max, por_carrera = self._matricula_ultimo_anio()
         
-        top = df_curr.groupby('carrera')['num_estudiantes'].sum().sort_values(ascending=False).head(10).reset_index()
+        top = por_carrera.head(10).reset_index()
         
         fig = px.bar(top, x='num_estudiantes', y='carrera', orientation='h', 
                      title=f'Top 10 Carreras con Mayor Matrícula ({anio_max})',
@@ -23,6 +131,7 @@ class EDAModule:
         fig.update_layout(yaxis={'categoryorder':'total ascending'})
         return fig
 
+    @_figura_cacheada
     def plot_tendencia_temporal(self):
         """Evolución temporal: Tradicionales vs Nuevas"""
         carreras_interes = ['Derecho', 'Desarrollo de Software', 'Medicina', 'Administración de Empresas']
@@ -31,28 +140,27 @@ class EDAModule:
         
         if df_trend.empty: return None
         
-        trend_data = df_trend.groupby(['año', 'carrera'])['num_estudiantes'].sum().reset_index()
+        trend_data = df_trend.groupby(['año', 'carrera'], observed=True)['num_estudiantes'].sum().reset_index()
         
         fig = px.line(trend_data, x='año', y='num_estudiantes', color='carrera', markers=True,
                       title='Tendencia Histórica: Carreras Tradicionales vs Tecnológicas')
         return fig
 
+    @_figura_cacheada
     def plot_brecha_talento(self):
         """
         GRÁFICO CRÍTICO: Doble Eje (Estudiantes vs Ofertas)
         Replica la celda 5 del Notebook 01.
         """
         # 1. Preparar Oferta Académica (Estudiantes último año)
-        anio_max = self.df_matricula['año'].max()
-        oferta = self.df_matricula[self.df_matricula['año'] == anio_max].groupby('carrera')['num_estudiantes'].sum().reset_index()
-        oferta.rename(columns={'num_estudiantes': 'Total_Estudiantes'}, inplace=True)
+        _, por_carrera = self._matricula_ultimo_anio()
         
         # 2. Preparar Demanda Laboral (Total histórico de ofertas)
-        demanda = self.df_ofertas['carrera_requerida'].value_counts().reset_index()
-        demanda.columns = ['carrera', 'Total_Ofertas']
+        demanda = self._demanda_por_carrera()
         
         # 3. Merge y Top 15
-        top_est = oferta.sort_values('Total_Estudiantes', ascending=False).head(15)
+        top_est = por_carrera.head(15).rename('Total_Estudiantes').reset_index()
+        top_est['carrera'] = top_est['carrera'].astype(str)
         df_cruce = pd.merge(top_est, demanda, on='carrera', how='left').fillna(0)
         
         # 4. Gráfico Dual Axis (Plotly Graph Objects)
@@ -88,13 +196,40 @@ class EDAModule:
         )
         return fig
 
-    def plot_distribucion_salarios(self):
-        """Histograma de salarios ofertados"""
-        df = self.df_ofertas.copy()
-        df['salario_promedio'] = (df['salario_minimo'] + df['salario_maximo']) / 2
+    @_figura_cacheada
+    def plot_distribucion_salarios(self, nbins=20, preagregado=None):
+        """
+        Histograma de salarios ofertados. preagregado=None agrupa con NumPy en el
+        servidor (barras) solo cuando hay más de MAX_FILAS_HISTOGRAMA_CRUDO ofertas.
+        """
+        if self.df_ofertas is None:
+            hist = self.resumen_ofertas.histograma_salarios(nbins=nbins)
+            return self._plot_histograma_barras(hist['salario_inicio'].to_numpy(), hist['ancho'].to_numpy(), hist['conteo'])
+
+        salarios = self._salario_promedio()
+        if preagregado is None:
+            preagregado = len(salarios) > MAX_FILAS_HISTOGRAMA_CRUDO
+        if preagregado:
+            conteo, bordes = np.histogram(salarios.dropna(), bins=nbins)
+            return self._plot_histograma_barras(bordes[:-1], np.diff(bordes), conteo)
+
+        df = salarios.to_frame()
         
-        fig = px.histogram(df, x='salario_promedio', nbins=20, 
+        fig = px.histogram(df, x='salario_promedio', nbins=nbins, 
                            title='Distribución de Salarios Ofertados',
                            color_discrete_sequence=['#00CC96'])
         fig.update_layout(bargap=0.1)
-        return fig
\ No newline at end of file
+        return fig
+
+    @staticmethod
+    def _plot_histograma_barras(inicio, ancho, conteo):
+        """Histograma pre-agregado: solo viajan nbins barras, no las filas crudas."""
+        fig = go.Figure(go.Bar(
+            x=inicio + ancho / 2,
+            y=conteo,
+            width=ancho,
+            marker_color='#00CC96'
+        ))
+        fig.update_layout(title='Distribución de Salarios Ofertados', bargap=0.1,
+                          xaxis_title='salario_promedio', yaxis_title='count')
+        return fig
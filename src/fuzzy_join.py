@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import re
+import numpy as np
+import pandas as pd
+from src.text_es import plegar_acentos
+
+# Abreviaturas frecuentes en nombres de carreras (ya sin acentos, con o sin punto)
+ABREVIATURAS = {
+    'ing': 'ingenieria', 'lic': 'licenciatura', 'adm': 'administracion', 'admin': 'administracion',
+    'tec': 'tecnologia', 'tecn': 'tecnologia', 'cc': 'ciencias', 'cs': 'ciencias', 'educ': 'educacion',
+}
+_ABREVIATURA = re.compile(r'\b(' + '|'.join(ABREVIATURAS) + r')\b\.?')
+_NO_ALFANUMERICO = re.compile(r'[^\w]+')
+
+VERSION_ALIAS = 1
+
+
+def normalizar_carrera(nombre):
+    """Clave canónica: sin acentos, abreviaturas expandidas ("Ing." -> "ingenieria"), sin puntuación."""
+    texto = _ABREVIATURA.sub(lambda m: ABREVIATURAS[m.group(1)] + ' ', plegar_acentos(str(nombre)))
+    return _NO_ALFANUMERICO.sub(' ', texto).strip()
+
+
+def normalizar_serie(nombres):
+    """normalizar_carrera sobre una columna, calculando cada valor distinto una sola vez."""
+    nombres = pd.Series(nombres)
+    unicos = pd.unique(nombres.astype(str))
+    return nombres.astype(str).map(dict(zip(unicos, map(normalizar_carrera, unicos))))
+
+
+class ResolutorCarreras:
+    """
+    Resolución de entidades entre nombres de carreras ya normalizados:
+    1. coincidencia exacta de la clave canónica (diccionario);
+    2. para el resto, TF-IDF de n-gramas de caracteres y coseno disperso contra
+       un índice invertido n-grama -> destino (bloqueo): solo se puntúan los pares
+       que comparten algún n-grama, nunca el producto cartesiano completo.
+    La tabla de alias se guarda en JSON; mientras los destinos no cambien, las
+    siguientes uniones son una búsqueda en diccionario.
+    """
+
+    def __init__(self, ruta=None, umbral=0.8, ngramas=(3, 3), tam_lote=2000):
+        self.ruta = ruta
+        self.umbral = umbral
+        self.ngramas = tuple(ngramas)
+        self.tam_lote = tam_lote
+        self.alias = {}
+        self.puntajes = {}
+        self._huella_destinos = None
+        self._cargar()
+
+    @staticmethod
+    def _huella(destinos):
+        return hashlib.sha256('\n'.join(sorted(destinos)).encode('utf-8')).hexdigest()
+
+    def _config(self):
+        return {'version': VERSION_ALIAS, 'umbral': self.umbral, 'ngramas': list(self.ngramas)}
+
+    def _cargar(self):
+        if not self.ruta or not os.path.exists(self.ruta):
+            return
+        try:
+            with open(self.ruta, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ [Alias] Tabla de alias ilegible {self.ruta}: {e}")
+            return
+        if datos.get('config') == self._config():
+            self._huella_destinos = datos['huella_destinos']
+            self.alias = datos['alias']
+            self.puntajes = datos.get('puntajes', {})
+
+    def _guardar(self):
+        if not self.ruta:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.ruta) or '.', exist_ok=True)
+            tmp = f"{self.ruta}.{os.getpid()}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'config': self._config(), 'huella_destinos': self._huella_destinos,
+                           'alias': self.alias, 'puntajes': self.puntajes}, f, ensure_ascii=False, indent=1)
+            os.replace(tmp, self.ruta)
+        except OSError as e:
+            print(f"⚠️ [Alias] No se pudo guardar la tabla de alias: {e}")
+
+    def resolver(self, origenes, destinos):
+        """
+        Dict clave_origen -> clave_destino (la propia clave si no hay destino
+        con similitud >= umbral). Solo se calculan los orígenes nuevos.
+        """
+        destinos = sorted(set(destinos))
+        huella = self._huella(destinos)
+        if huella != self._huella_destinos:
+            # Cambió el catálogo de destino: la tabla anterior ya no es válida
+            self.alias, self.puntajes, self._huella_destinos = {}, {}, huella
+
+        conjunto = set(destinos)
+        nuevos = [o for o in set(origenes) if o not in self.alias]
+        if nuevos:
+            for o in nuevos:
+                if o in conjunto:
+                    self.alias[o] = o
+            pendientes = sorted(o for o in nuevos if o not in conjunto)
+            if pendientes and destinos:
+                self._puntuar(pendientes, destinos)
+            for o in pendientes:
+                self.alias.setdefault(o, o)
+            self._guardar()
+        return {o: self.alias[o] for o in origenes}
+
+    def _puntuar(self, pendientes, destinos):
+        """Mejor destino por coseno de n-gramas de caracteres (solo pares candidatos)."""
+        # Import diferido: src.data_manager importa este módulo y no debe arrastrar sklearn
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        vectorizador = TfidfVectorizer(analyzer='char_wb', ngram_range=self.ngramas)
+        vectorizador.fit(list(destinos) + list(pendientes))
+        indice = vectorizador.transform(destinos).T.tocsr()  # n-grama -> destinos
+        for inicio in range(0, len(pendientes), self.tam_lote):
+            lote = pendientes[inicio:inicio + self.tam_lote]
+            similitud = (vectorizador.transform(lote) @ indice).tocsr()
+            mejores = np.asarray(similitud.argmax(axis=1)).ravel()
+            valores = similitud.max(axis=1).toarray().ravel()
+            for origen, j, valor in zip(lote, mejores, valores):
+                if valor >= self.umbral:
+                    self.alias[origen] = destinos[j]
+                    self.puntajes[origen] = round(float(valor), 4)
@@ -0,0 +1,274 @@
+import cProfile
+import fnmatch
+import json
+import logging
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from functools import wraps
+
+logger = logging.getLogger('careermatch.metricas')
+
+# Variables de entorno para activar la instrumentación sin tocar código
+ENV_METRICAS = 'CAREERMATCH_METRICAS'          # "1" activa spans y contadores
+ENV_PERFIL = 'CAREERMATCH_PERFIL'              # patrones de etapas a perfilar, p.ej. "nlp.*,clustering.*"
+ENV_DIR_PERFILES = 'CAREERMATCH_PERFIL_DIR'
+MAX_SPANS_RECIENTES = 1000
+
+# tracemalloc es global al proceso: los spans perfilados que se solapan (en
+# distintos hilos) lo comparten y solo el último en terminar lo detiene
+_TRACEMALLOC_LOCK = threading.Lock()
+_TRACEMALLOC = {'spans': 0, 'propio': False}
+
+
+def _rss_mb():
+    """RSS actual en MB (/proc en Linux; si no existe, el pico de getrusage)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError, IndexError):
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return pico / 2 ** 20 if sys.platform == 'darwin' else pico / 1024
+
+
+def _adquirir_tracemalloc():
+    with _TRACEMALLOC_LOCK:
+        if _TRACEMALLOC['spans'] == 0:
+            # Si ya estaba activo (lo inició otro código) no se detiene al terminar
+            _TRACEMALLOC['propio'] = not tracemalloc.is_tracing()
+            if _TRACEMALLOC['propio']:
+                tracemalloc.start()
+        _TRACEMALLOC['spans'] += 1
+
+
+def _liberar_tracemalloc():
+    with _TRACEMALLOC_LOCK:
+        _TRACEMALLOC['spans'] -= 1
+        if _TRACEMALLOC['spans'] == 0 and _TRACEMALLOC['propio']:
+            tracemalloc.stop()
+
+
+def _filas_de(resultado):
+    """Número de filas de un resultado típico (DataFrame, array, lista) o None."""
+    try:
+        return len(resultado)
+    except TypeError:
+        return None
+
+
+class _SpanNulo:
+    """Span sin efecto: lo que se devuelve cuando la instrumentación está apagada."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def registrar(self, **datos):
+        pass
+
+
+_SPAN_NULO = _SpanNulo()
+
+
+class Span:
+    """Mide una etapa: duración, delta de RSS, filas y, si se pidió, cProfile + tracemalloc."""
+
+    def __init__(self, metricas, nombre, filas=None, perfilar=False):
+        self.metricas = metricas
+        self.nombre = nombre
+        self.datos = {'filas': filas}
+        self.perfilar = perfilar
+        self._perfil = None
+
+    def registrar(self, **datos):
+        self.datos.update(datos)
+
+    def __enter__(self):
+        if self.perfilar:
+            self._perfil = cProfile.Profile()
+            try:
+                self._perfil.enable()
+            except ValueError:
+                # Ya hay otro perfilador activo (etapa anidada): solo se mide
+                self._perfil = None
+            else:
+                _adquirir_tracemalloc()
+        self._rss = _rss_mb()
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, error, tb):
+        segundos = time.perf_counter() - self._inicio
+        rss = _rss_mb()
+        if self._perfil is not None:
+            self._perfil.disable()
+            try:
+                self.metricas._volcar_perfil(self.nombre, self._perfil)
+            finally:
+                _liberar_tracemalloc()
+        self.metricas._cerrar_span(self.nombre, segundos, rss - self._rss, rss, error is not None, self.datos)
+        return False
+
+
+class Instrumentacion:
+    """
+    Métricas por etapa para los módulos de src: spans de tiempo, filas, delta de
+    memoria y aciertos de caché. Apagada por defecto: `etapa()` devuelve un span
+    nulo compartido y `contar_cache()` retorna de inmediato, así el costo es
+    despreciable. Exporta a logs JSON y a texto estilo Prometheus.
+    """
+
+    def __init__(self, habilitado=False, perfil=None, dir_perfiles='data/.cache/perfiles'):
+        self._lock = threading.Lock()
+        self.habilitado = False
+        self.perfil = []
+        self.dir_perfiles = dir_perfiles
+        self.configurar(habilitado, perfil, dir_perfiles)
+        self.reiniciar()
+
+    def configurar(self, habilitado=None, perfil=None, dir_perfiles=None):
+        """perfil: patrones (lista o texto separado por comas) de etapas a perfilar."""
+        if perfil is not None:
+            self.perfil = [p.strip() for p in (perfil.split(',') if isinstance(perfil, str) else perfil) if p.strip()]
+        if dir_perfiles is not None:
+            self.dir_perfiles = dir_perfiles
+        if habilitado is not None:
+            self.habilitado = habilitado
+        # Perfilar implica medir
+        self.habilitado = self.habilitado or bool(self.perfil)
+        return self
+
+    @classmethod
+    def desde_entorno(cls):
+        return cls(habilitado=os.environ.get(ENV_METRICAS, '0').lower() in ('1', 'true', 'si', 'sí'),
+                   perfil=os.environ.get(ENV_PERFIL, ''),
+                   dir_perfiles=os.environ.get(ENV_DIR_PERFILES, 'data/.cache/perfiles'))
+
+    def reiniciar(self):
+        with self._lock:
+            self.etapas = {}
+            self.caches = {}
+            self.recientes = deque(maxlen=MAX_SPANS_RECIENTES)
+
+    # --- Registro ---
+    def etapa(self, nombre, filas=None):
+        """Context manager que mide una etapa (`with METRICAS.etapa('nlp.entrenar') as span:`)."""
+        if not self.habilitado:
+            return _SPAN_NULO
+        perfilar = any(fnmatch.fnmatchcase(nombre, p) for p in self.perfil)
+        return Span(self, nombre, filas, perfilar)
+
+    def contar_cache(self, nombre, acierto):
+        if not self.habilitado:
+            return
+        with self._lock:
+            c = self.caches.setdefault(nombre, {'hits': 0, 'misses': 0})
+            c['hits' if acierto else 'misses'] += 1
+
+    def _cerrar_span(self, nombre, segundos, delta_rss, rss, fallo, datos):
+        with self._lock:
+            e = self.etapas.setdefault(nombre, {'llamadas': 0, 'errores': 0, 'segundos_total': 0.0,
+                                                'segundos_max': 0.0, 'filas_total': 0, 'delta_rss_mb': 0.0})
+            e['llamadas'] += 1
+            e['errores'] += int(fallo)
+            e['segundos_total'] += segundos
+            e['segundos_max'] = max(e['segundos_max'], segundos)
+            e['delta_rss_mb'] = delta_rss
+            if datos.get('filas') is not None:
+                e['filas_total'] += int(datos['filas'])
+            registro = {'etapa': nombre, 'ts': time.time(), 'segundos': round(segundos, 6),
+                        'delta_rss_mb': round(delta_rss, 2), 'rss_mb': round(rss, 1), 'error': fallo, **datos}
+            self.recientes.append(registro)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(registro, ensure_ascii=False, default=str))
+
+    def _volcar_perfil(self, nombre, perfil):
+        """Guarda <etapa>-<marca>.prof (cProfile) y <etapa>-<marca>.memoria.txt (top de tracemalloc)."""
+        marca = f"{time.strftime('%Y%m%d-%H%M%S')}-{time.time_ns() // 1_000_000 % 1000:03d}"
+        base = os.path.join(self.dir_perfiles, f"{nombre}-{marca}")
+        try:
+            os.makedirs(self.dir_perfiles, exist_ok=True)
+            perfil.dump_stats(base + '.prof')
+            # Otro código pudo detener tracemalloc mientras tanto: take_snapshot lanza RuntimeError
+            if tracemalloc.is_tracing():
+                top = tracemalloc.take_snapshot().statistics('lineno')[:25]
+                with open(base + '.memoria.txt', 'w', encoding='utf-8') as f:
+                    f.write('\n'.join(str(s) for s in top))
+            print(f"📊 [Métricas] Perfil de {nombre} en {base}.prof")
+        except (OSError, RuntimeError) as e:
+            print(f"⚠️ [Métricas] No se pudo guardar el perfil de {nombre}: {e}")
+
+    # --- Exportación ---
+    def resumen(self):
+        with self._lock:
+            return {'etapas': {k: dict(v) for k, v in self.etapas.items()},
+                    'caches': {k: dict(v) for k, v in self.caches.items()}}
+
+    def exportar_json(self):
+        """Spans recientes como lista de dicts (logs estructurados)."""
+        with self._lock:
+            return list(self.recientes)
+
+    def exportar_prometheus(self):
+        """Formato de exposición de texto de Prometheus."""
+        r = self.resumen()
+        lineas = []
+
+        def familia(nombre, tipo, ayuda, valores, etiqueta):
+            lineas.append(f"# HELP {nombre} {ayuda}")
+            lineas.append(f"# TYPE {nombre} {tipo}")
+            for clave, valor in valores:
+                lineas.append(f'{nombre}{{{etiqueta}="{clave}"}} {valor}')
+
+        etapas = sorted(r['etapas'].items())
+        familia('careermatch_etapa_llamadas_total', 'counter', 'Ejecuciones de la etapa',
+                [(k, v['llamadas']) for k, v in etapas], 'etapa')
+        familia('careermatch_etapa_errores_total', 'counter', 'Ejecuciones con excepción',
+                [(k, v['errores']) for k, v in etapas], 'etapa')
+        familia('careermatch_etapa_segundos_total', 'counter', 'Tiempo acumulado en la etapa',
+                [(k, round(v['segundos_total'], 6)) for k, v in etapas], 'etapa')
+        familia('careermatch_etapa_segundos_max', 'gauge', 'Ejecución más lenta',
+                [(k, round(v['segundos_max'], 6)) for k, v in etapas], 'etapa')
+        familia('careermatch_etapa_filas_total', 'counter', 'Filas procesadas',
+                [(k, v['filas_total']) for k, v in etapas], 'etapa')
+        familia('careermatch_etapa_delta_rss_mb', 'gauge', 'Delta de RSS de la última ejecución (MB)',
+                [(k, round(v['delta_rss_mb'], 2)) for k, v in etapas], 'etapa')
+        caches = sorted(r['caches'].items())
+        familia('careermatch_cache_hits_total', 'counter', 'Aciertos de caché',
+                [(k, v['hits']) for k, v in caches], 'cache')
+        familia('careermatch_cache_misses_total', 'counter', 'Fallos de caché',
+                [(k, v['misses']) for k, v in caches], 'cache')
+        lineas.append("# HELP careermatch_rss_mb RSS actual del proceso (MB)")
+        lineas.append("# TYPE careermatch_rss_mb gauge")
+        lineas.append(f"careermatch_rss_mb {_rss_mb():.1f}")
+        return '\n'.join(lineas) + '\n'
+
+
+def instrumentado(nombre, filas=_filas_de):
+    """
+    Decorador: mide la función como la etapa `nombre`. `filas(resultado)` se
+    evalúa solo con la instrumentación activa.
+    """
+    def decorador(funcion):
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not METRICAS.habilitado:
+                return funcion(*args, **kwargs)
+            with METRICAS.etapa(nombre) as span:
+                resultado = funcion(*args, **kwargs)
+                if filas is not None:
+                    span.registrar(filas=filas(resultado))
+                return resultado
+        return envoltura
+    return decorador
+
+
+# Instancia global compartida por todos los módulos
+METRICAS = Instrumentacion.desde_entorno()
@@ -0,0 +1,79 @@
+import glob
+import hashlib
+import json
+import os
+import joblib
+import pandas as pd
+from src.instrumentation import METRICAS
+
+# Subir este número invalida todos los artefactos guardados (cambios de formato)
+VERSION_ARTEFACTOS = 1
+
+
+class ModelStore:
+    """
+    Almacén de modelos entrenados en disco. Cada artefacto se guarda con una
+    huella (hash) de los datos de entrada y los hiperparámetros; si la huella
+    coincide, los workers cargan el modelo (arrays NumPy con memory-map) en vez
+    de reentrenarlo.
+    """
+
+    def __init__(self, directorio='data/.cache/modelos'):
+        self.directorio = directorio
+
+    @staticmethod
+    def huella(*partes):
+        """Hash estable de DataFrames, arrays y objetos serializables a JSON."""
+        h = hashlib.sha256(f"v{VERSION_ARTEFACTOS}".encode())
+        for parte in partes:
+            if isinstance(parte, pd.DataFrame):
+                h.update(json.dumps(list(map(str, parte.columns))).encode())
+                h.update(pd.util.hash_pandas_object(parte, index=True).to_numpy().tobytes())
+            else:
+                h.update(json.dumps(parte, sort_keys=True, default=str).encode())
+        return h.hexdigest()
+
+    def _ruta(self, nombre, huella):
+        return os.path.join(self.directorio, f"{nombre}-{huella[:16]}.joblib")
+
+    def cargar(self, nombre, huella):
+        """Devuelve el estado guardado o None si no existe para esa huella."""
+        ruta = self._ruta(nombre, huella)
+        METRICAS.contar_cache(f'modelo_{nombre}', os.path.exists(ruta))
+        if not os.path.exists(ruta):
+            return None
+        try:
+            return joblib.load(ruta, mmap_mode='r')
+        except Exception as e:
+            print(f"⚠️ [ModelStore] Artefacto ilegible {ruta}: {e}")
+            return None
+
+    def cargar_ultimo(self, nombre):
+        """Último artefacto guardado de un modelo, sin importar la huella (para warm start)."""
+        rutas = glob.glob(os.path.join(self.directorio, f"{nombre}-*.joblib"))
+        if not rutas:
+            return None
+        try:
+            return joblib.load(max(rutas, key=os.path.getmtime), mmap_mode='r')
+        except Exception as e:
+            print(f"⚠️ [ModelStore] Artefacto ilegible de {nombre}: {e}")
+            return None
+
+    def guardar(self, nombre, huella, estado):
+        """Guarda el estado de forma atómica y elimina versiones anteriores del mismo modelo."""
+        ruta = self._ruta(nombre, huella)
+        try:
+            os.makedirs(self.directorio, exist_ok=True)
+            tmp = f"{ruta}.{os.getpid()}.tmp"
+            # Sin compresión para poder hacer memory-map de los arrays al cargar
+            joblib.dump(estado, tmp)
+            os.replace(tmp, ruta)
+        except OSError as e:
+            print(f"⚠️ [ModelStore] No se pudo guardar {nombre}: {e}")
+            return
+        for antigua in glob.glob(os.path.join(self.directorio, f"{nombre}-*.joblib")):
+            if antigua != ruta:
+                try:
+                    os.remove(antigua)
+                except OSError:
+                    pass
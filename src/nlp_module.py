@@ -1,93 +1,250 @@
+import numpy as np
 import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from src.instrumentation import METRICAS, instrumentado
+from src.offer_index import OfferIndex
+from src.query_cache import LRUCache
+from src.retrieval import ExactRetriever, crear_motor
+from src.sector_mapper import mapper_por_defecto
+from src.shared_segments import arrays_csr, csr_de
+from src.text_es import AnalizadorEspanol
 
 class NLPRecommender:
-    def __init__(self, df_final):
+    def __init__(self, df_final, backend='exacto', estado=None, cache_max=1024, cache_ttl=None, **opciones_backend):
         # Reset index es vital para que los índices de la matriz coincidan con el DF
-        self.df = df_final.copy().reset_index(drop=True)
-        self.tfidf = TfidfVectorizer(stop_words='english')
+        # (sin copiar los datos: solo se agrega la columna perfil_nlp)
+        self.df = df_final.copy(deep=False)
+        self.df.index = pd.RangeIndex(len(self.df))
+        self.tfidf = self._crear_vectorizador()
         self.tfidf_matrix = None
-        self._entrenar_nlp()
+        # Motor de búsqueda top-k ('exacto' o 'ivf'), ver src/retrieval.py
+        self.backend = backend
+        self.opciones_backend = opciones_backend
+        self.motor = None
+        self.params = self.parametros(backend, **opciones_backend)
+        # Caché de resultados compactos (índices + afinidad) por consulta normalizada
+        self.cache = LRUCache(max_entradas=cache_max, ttl=cache_ttl)
+        self._analizador = None
+        # Índice opcional sobre ofertas individuales (ver indexar_ofertas)
+        self.indice_ofertas = None
+        if estado is not None:
+            self.cargar_estado(estado)
+        else:
+            self._entrenar_nlp()
 
+    @staticmethod
+    def _crear_vectorizador():
+        # Analizador en español compartido por el entrenamiento y las consultas
+        return TfidfVectorizer(analyzer=AnalizadorEspanol(stemming=True))
+
+    @staticmethod
+    def parametros(backend='exacto', **opciones_backend):
+        """Hiperparámetros que definen el índice (para la huella del ModelStore)."""
+        return {
+            'backend': backend,
+            'opciones': opciones_backend,
+            'tfidf': NLPRecommender._crear_vectorizador().get_params(),
+            'sinonimos': mapper_por_defecto().sinonimos,
+        }
+
+    def exportar_estado(self):
+        """Vectorizador, matriz TF-IDF y motor de búsqueda para guardar en el ModelStore."""
+        return {'tfidf': self.tfidf, 'tfidf_matrix': self.tfidf_matrix, 'motor': self.motor}
+
+    def cargar_estado(self, estado):
+        self.tfidf = estado['tfidf']
+        self.tfidf_matrix = estado['tfidf_matrix']
+        self.motor = estado['motor']
+        self._invalidar_cache()
+
+    def exportar_segmentos(self):
+        """
+        Arrays de solo lectura (matriz TF-IDF, índice invertido, índice de ofertas)
+        y el resto del estado, pequeño, para reconstruir el recomendador en otro proceso.
+        """
+        arrays = arrays_csr(self.tfidf_matrix, 'tfidf')
+        compartido = isinstance(self.motor, ExactRetriever)
+        if compartido:
+            arrays.update(arrays_csr(self.motor.indice, 'motor'))
+        if self.indice_ofertas is not None:
+            arrays.update(self.indice_ofertas.exportar_arrays())
+        resto = {'tfidf': self.tfidf, 'motor': None if compartido else self.motor,
+                 'ofertas': self.indice_ofertas is not None}
+        return arrays, resto
+
+    @classmethod
+    def desde_segmentos(cls, df_final, arrays, resto, **kwargs):
+        """Recomendador sobre arrays ya publicados (ver src/shared_segments.py)."""
+        motor = resto['motor'] or ExactRetriever.desde_indice(csr_de(arrays, 'motor'))
+        estado = {'tfidf': resto['tfidf'], 'tfidf_matrix': csr_de(arrays, 'tfidf'), 'motor': motor}
+        nlp = cls(df_final, estado=estado, **kwargs)
+        if resto['ofertas']:
+            nlp.cargar_indice_ofertas(OfferIndex.desde_arrays(nlp.df['carrera'], arrays))
+        return nlp
+
+    @instrumentado('nlp.indexar_ofertas', filas=lambda indice: indice.n_ofertas)
+    def indexar_ofertas(self, ofertas, chunksize=100_000, **opciones):
+        """
+        Construye el índice de ofertas individuales por lotes, desde un DataFrame
+        o directamente desde la ruta del CSV (sin cargarlo entero en memoria).
+        """
+        if isinstance(ofertas, str):
+            self.indice_ofertas = OfferIndex.desde_csv(ofertas, self.df['carrera'], chunksize, **opciones)
+        else:
+            self.indice_ofertas = OfferIndex.desde_dataframe(ofertas, self.df['carrera'], chunksize, **opciones)
+        self.cache.clear()
+        print(f"✅ [NLP] Índice de ofertas con {self.indice_ofertas.n_ofertas} ofertas.")
+        return self.indice_ofertas
+
+    def cargar_indice_ofertas(self, indice):
+        self.indice_ofertas = indice
+        self.cache.clear()
+
+    def _invalidar_cache(self):
+        """El índice cambió: los resultados guardados ya no son válidos."""
+        self._analizador = self.tfidf.build_analyzer()
+        self.cache.clear()
+
+    def normalizar_consulta(self, consulta):
+        """
+        Clave de caché: tokens del mismo analizador del TF-IDF (minúsculas, sin
+        acentos, sin stop words), solo los del vocabulario y ordenados. Dos consultas con la
+        misma clave producen exactamente el mismo vector y el mismo resultado.
+        """
+        vocabulario = self.tfidf.vocabulary_
+        return tuple(sorted(t for t in self._analizador(consulta.lower()) if t in vocabulario))
+
+    def estadisticas_cache(self):
+        return self.cache.estadisticas()
+
+    @instrumentado('nlp.entrenar', filas=None)
     def _entrenar_nlp(self):
         """Genera el perfil semántico y entrena el modelo."""
         
-        def crear_perfil_busqueda(row):
-            # 1. Texto Base: Carrera + Sector
-            texto = f"{row['carrera']} {row['sector_economico']}".lower()
-            
-            # 2. Diccionario de Sinónimos (Fiel al Notebook + Correcciones de robustez)
-            sinonimos = {
-                # TI
-                'información': 'tecnología software digital programacion desarrollo sistemas computacion',
-                # Negocios (Agregado 'empresarial' para que pase tu prueba)
-                'financieras': 'negocios dinero banca economia gerencia administracion contabilidad empresarial empresa finanzas',
-                # Salud
-                'salud': 'medicina clinica hospital cuidado bienestar enfermeria medico paciente',
-                # Construcción (Agregado 'obras' para que pase tu prueba)
-                'construcción': 'obra obras infraestructura diseño edificacion civil arquitectura planos',
-                # Industria
-                'manufactureras': 'produccion fabrica industria procesos ingenieria mantenimiento',
-                # Agro
-                'agricultura': 'agro campo rural cultivo alimentos veterinaria animales granja',
-                # Educación
-                'educación': 'docencia pedagogia enseñanza escuela colegio aprender'
-            }
-            
-            # 3. Inyección de Sinónimos
-            sector_lower = str(row['sector_economico']).lower()
-            
-            for key, val in sinonimos.items():
-                if key in sector_lower:
-                    texto += " " + val
-            
-            return texto
+        # 1. Texto Base: Carrera + Sector
+        texto = (self.df['carrera'].astype(str) + ' ' + self.df['sector_economico'].astype(str)).str.lower()
+
+        # 2. Inyección de Sinónimos (taxonomía compartida con DataManager)
+        extra = mapper_por_defecto().sinonimos_de(self.df['sector_economico'])
 
         # Crear columna de perfil
-        self.df['perfil_nlp'] = self.df.apply(crear_perfil_busqueda, axis=1)
-        
+        self.df['perfil_nlp'] = texto.where(extra == '', texto + ' ' + extra)
+
         # Vectorización
         self.tfidf_matrix = self.tfidf.fit_transform(self.df['perfil_nlp'])
+        self.motor = crear_motor(self.backend, self.tfidf_matrix, **self.opciones_backend)
+        self._invalidar_cache()
         print(f"✅ [NLP] Motor entrenado con {len(self.df)} registros.")
 
-    def recomendar(self, consulta, filtrar_alta_demanda=False):
-        """Busca carreras similares a la consulta."""
+    @instrumentado('nlp.recomendar')
+    def recomendar(self, consulta, filtrar_alta_demanda=False, fuente='carreras', pooling='max'):
+        """
+        Busca carreras similares a la consulta. Con fuente='ofertas' la afinidad
+        de cada carrera sale de sus ofertas individuales (pooling 'max', 'sum' o 'mean').
+        """
         if not consulta:
             return pd.DataFrame()
             
         try:
-            # 1. Vectorizar consulta
-            query_vec = self.tfidf.transform([consulta.lower()])
-            
-            # 2. Calcular similitud
-            sim_scores = cosine_similarity(query_vec, self.tfidf_matrix).flatten()
-            
-            # 3. Si no hay coincidencia
-            if sim_scores.max() == 0:
-                return pd.DataFrame()
-            
-            # 4. Top índices
-            top_indices = sim_scores.argsort()[::-1][:10]
-            
-            # 5. Crear DF de resultados
-            res = self.df.iloc[top_indices].copy()
-            res['Afinidad'] = (sim_scores[top_indices] * 100).round(1)
-            
-            # FILTRO: Eliminar lo que tenga 0 afinidad (Ruido)
-            res = res[res['Afinidad'] > 0]
-            
-            # FILTRO: Alta Demanda (Opcional)
-            if filtrar_alta_demanda:
-                res = res[res['categoria'].isin(['En Demanda', 'Nicho'])]
-            
-            if res.empty:
+            if fuente == 'ofertas':
+                if self.indice_ofertas is None:
+                    raise ValueError("No hay índice de ofertas: llama primero a indexar_ofertas()")
+                # El índice de ofertas usa su propio vocabulario (hashing): la clave es la consulta plegada
+                clave = (' '.join(self._analizador(consulta.lower())), filtrar_alta_demanda, fuente, pooling)
+            else:
+                clave = (self.normalizar_consulta(consulta), filtrar_alta_demanda)
+            resultado = self.cache.get(clave)
+            METRICAS.contar_cache('nlp_consultas', resultado is not None)
+            if resultado is None:
+                resultado = self._buscar(consulta, filtrar_alta_demanda, fuente, pooling)
+                self.cache.put(clave, resultado)
+            indices, afinidad = resultado
+
+            if indices.size == 0:
                 return pd.DataFrame()
 
             # Selección de columnas finales
-            cols = ['carrera', 'categoria', 'salario_oferta', 'Afinidad', 'sector_economico']
-            return res[cols].head(5)
+            res = self.df.iloc[indices][['carrera', 'categoria', 'salario_oferta', 'sector_economico']]
+            res.insert(3, 'Afinidad', afinidad)
+            return res
             
         except Exception as e:
             print(f"Error en recomendación: {e}")
-            return pd.DataFrame()
\ No newline at end of file
+            return pd.DataFrame()
+
+    def _buscar(self, consulta, filtrar_alta_demanda, fuente='carreras', pooling='max'):
+        """Top-5 filtrado como arrays compactos (índices de self.df, afinidad en %)."""
+        vacio = (np.empty(0, dtype=np.int64), np.empty(0))
+
+        if fuente == 'ofertas':
+            # 1-2. Puntajes por oferta agregados por carrera
+            top_indices, top_scores = self.indice_ofertas.buscar(consulta.lower(), k=10, pooling=pooling)
+        else:
+            # 1. Vectorizar consulta
+            query_vec = self.tfidf.transform([consulta.lower()])
+
+            # 2. Top índices según el motor configurado (sin ordenar todo el catálogo)
+            top_indices, top_scores = self.motor.buscar(query_vec, k=10)
+            validos = top_indices[0] >= 0
+            top_indices, top_scores = top_indices[0][validos], top_scores[0][validos]
+
+        # 3. Si no hay coincidencia
+        if top_scores.size == 0 or top_scores.max() == 0:
+            return vacio
+
+        afinidad = (top_scores * 100).round(1)
+
+        # FILTRO: Eliminar lo que tenga 0 afinidad (Ruido)
+        mascara = afinidad > 0
+
+        # FILTRO: Alta Demanda (Opcional)
+        if filtrar_alta_demanda:
+            mascara &= self.df['categoria'].iloc[top_indices].isin(['En Demanda', 'Nicho']).to_numpy()
+
+        return top_indices[mascara][:5], afinidad[mascara][:5]
+
+    def evaluar_recall(self, consultas, k=10):
+        """Recall@k del motor configurado frente al top-k por fuerza bruta."""
+        query_vecs = self.tfidf.transform([c.lower() for c in consultas])
+        return {self.motor.nombre: self.motor.recall(query_vecs, k)}
+
+    @instrumentado('nlp.recomendar_batch')
+    def recomendar_batch(self, consultas, k=5, filtrar_alta_demanda=False, tam_lote=1024):
+        """
+        Versión vectorizada de `recomendar` para muchas consultas a la vez.
+        Devuelve un único DataFrame largo (id_consulta, indice, Afinidad), donde
+        `indice` es la fila de self.df; aplica los mismos filtros que la consulta individual.
+        """
+        textos = [str(c).lower() if c else '' for c in consultas]
+        ids, indices, afinidades = [], [], []
+
+        if filtrar_alta_demanda:
+            permitidas = self.df['categoria'].isin(['En Demanda', 'Nicho']).to_numpy()
+
+        for inicio in range(0, len(textos), tam_lote):
+            # 1. Vectorizar todas las consultas del lote en una sola matriz dispersa
+            query_vecs = self.tfidf.transform(textos[inicio:inicio + tam_lote])
+
+            # 2. Top-10 por consulta, como recomendar(), o top-k si se piden más
+            #    (el motor acota la memoria del producto disperso)
+            top_indices, top_scores = self.motor.buscar(query_vecs, k=max(k, 10))
+            afinidad = (top_scores * 100).round(1)
+
+            # 3. Mismos filtros que recomendar(): afinidad > 0, categoría opcional y top-k
+            mascara = (top_indices >= 0) & (afinidad > 0)
+            if filtrar_alta_demanda:
+                mascara &= permitidas[np.maximum(top_indices, 0)]
+            mascara &= np.cumsum(mascara, axis=1) <= k
+
+            filas, _ = np.nonzero(mascara)
+            ids.append(filas + inicio)
+            indices.append(top_indices[mascara])
+            afinidades.append(afinidad[mascara])
+
+        if not ids:
+            return pd.DataFrame({'id_consulta': [], 'indice': [], 'Afinidad': []})
+        return pd.DataFrame({
+            'id_consulta': np.concatenate(ids),
+            'indice': np.concatenate(indices),
+            'Afinidad': np.concatenate(afinidades),
+        })
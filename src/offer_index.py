@@ -0,0 +1,141 @@
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from src.fuzzy_join import normalizar_serie
+from src.retrieval import top_k
+from src.shared_segments import arrays_csr, csr_de
+from src.text_es import AnalizadorEspanol
+
+# Campos de cada oferta que forman su texto indexado
+CAMPOS_OFERTA = ['titulo_puesto', 'carrera_requerida', 'empresa', 'provincia', 'experiencia_requerida']
+
+
+def clave_carrera(serie):
+    """Clave de unión entre carreras de ofertas y de df_master (la misma clave canónica del merge)."""
+    return normalizar_serie(serie)
+
+
+class OfferIndex:
+    """
+    Índice TF-IDF sobre ofertas individuales construido por lotes: se usa un
+    HashingVectorizer (sin vocabulario que ajustar) y las frecuencias de
+    documento se acumulan lote a lote, así el índice escala a millones de
+    ofertas sin tener el CSV completo en memoria.
+    La afinidad por carrera se obtiene agregando (max/sum/mean) los puntajes
+    de sus ofertas con una matriz dispersa de agrupación carrera × oferta.
+    """
+
+    def __init__(self, carreras, n_features=2 ** 18):
+        # carreras: columna 'carrera' de df_master (el orden define el id de carrera)
+        self.vectorizador = HashingVectorizer(analyzer=AnalizadorEspanol(), n_features=n_features,
+                                              alternate_sign=False, norm=None)
+        claves = clave_carrera(pd.Series(carreras)).to_numpy()
+        # Con carreras duplicadas gana la primera aparición
+        self._id_carrera = {c: i for i, c in reversed(list(enumerate(claves)))}
+        self.n_carreras = len(claves)
+        self._lotes = []
+        self._carrera_lotes = []
+        self._df = np.zeros(n_features, dtype=np.int64)
+        self.n_ofertas = 0
+        self.indice = None
+        self.idf = None
+        self.agrupacion = None
+
+    # --- Construcción ---
+    def agregar_lote(self, df_lote):
+        """Vectoriza un lote de ofertas y acumula sus frecuencias de documento."""
+        texto = df_lote[CAMPOS_OFERTA[0]].astype(str)
+        for campo in CAMPOS_OFERTA[1:]:
+            if campo in df_lote.columns:
+                texto = texto + ' ' + df_lote[campo].astype(str)
+        X = self.vectorizador.transform(texto).tocsr()
+        self._df += np.bincount(X.indices, minlength=X.shape[1])
+        self._lotes.append(X)
+        ids = clave_carrera(df_lote['carrera_requerida']).map(self._id_carrera).fillna(-1).astype(np.int64)
+        self._carrera_lotes.append(ids.to_numpy())
+        self.n_ofertas += X.shape[0]
+        return self
+
+    def finalizar(self):
+        """Aplica IDF, normaliza (L2) y arma el índice invertido y la matriz de agrupación."""
+        self.idf = np.log((1 + self.n_ofertas) / (1 + self._df)) + 1
+        X = sp.vstack(self._lotes, format='csr') if self._lotes else sp.csr_matrix((0, len(self.idf)))
+        X = normalize(X @ sp.diags(self.idf), norm='l2', copy=False)
+        # Índice invertido: término -> ofertas
+        self.indice = X.T.tocsr()
+
+        carreras = np.concatenate(self._carrera_lotes) if self._carrera_lotes else np.empty(0, dtype=np.int64)
+        validas = np.flatnonzero(carreras >= 0)
+        self.carrera_oferta = carreras
+        self.agrupacion = sp.csr_matrix(
+            (np.ones(validas.size), (carreras[validas], validas)),
+            shape=(self.n_carreras, self.n_ofertas),
+        )
+        self.ofertas_por_carrera = np.asarray(self.agrupacion.sum(axis=1)).ravel()
+        self._lotes, self._carrera_lotes = [], []
+        return self
+
+    def exportar_arrays(self, prefijo='ofertas'):
+        """Arrays de solo lectura del índice ya finalizado (ver src/shared_segments.py)."""
+        arrays = {**arrays_csr(self.indice, f'{prefijo}.indice'), **arrays_csr(self.agrupacion, f'{prefijo}.agrupacion')}
+        arrays.update({f'{prefijo}.idf': self.idf, f'{prefijo}.carrera_oferta': self.carrera_oferta,
+                       f'{prefijo}.ofertas_por_carrera': self.ofertas_por_carrera})
+        return arrays
+
+    @classmethod
+    def desde_arrays(cls, carreras, arrays, prefijo='ofertas'):
+        """Índice finalizado sobre arrays existentes (sin copiarlos)."""
+        indice = cls(carreras, n_features=len(arrays[f'{prefijo}.idf']))
+        indice.idf = arrays[f'{prefijo}.idf']
+        indice.indice = csr_de(arrays, f'{prefijo}.indice')
+        indice.agrupacion = csr_de(arrays, f'{prefijo}.agrupacion')
+        indice.carrera_oferta = arrays[f'{prefijo}.carrera_oferta']
+        indice.ofertas_por_carrera = arrays[f'{prefijo}.ofertas_por_carrera']
+        indice.n_ofertas = indice.indice.shape[1]
+        return indice
+
+    @classmethod
+    def desde_dataframe(cls, df_ofertas, carreras, tam_lote=100_000, **kwargs):
+        indice = cls(carreras, **kwargs)
+        for inicio in range(0, len(df_ofertas), tam_lote):
+            indice.agregar_lote(df_ofertas.iloc[inicio:inicio + tam_lote])
+        return indice.finalizar()
+
+    @classmethod
+    def desde_csv(cls, ruta, carreras, chunksize=100_000, **kwargs):
+        indice = cls(carreras, **kwargs)
+        for lote in pd.read_csv(ruta, usecols=CAMPOS_OFERTA, chunksize=chunksize):
+            indice.agregar_lote(lote)
+        return indice.finalizar()
+
+    # --- Consulta ---
+    def puntuar_carreras(self, consulta, pooling='max'):
+        """Afinidad (0-1 para max/mean) de cada carrera a partir de sus ofertas."""
+        q = self.vectorizador.transform([consulta]).multiply(self.idf)
+        q = normalize(sp.csr_matrix(q))
+        # Solo se tocan las ofertas que comparten algún término con la consulta
+        puntajes = (q @ self.indice).tocsr()
+        ofertas, valores = puntajes.indices, puntajes.data
+        # Agrupación por carrera en O(coincidencias): ofertas sin carrera (-1) se descartan
+        ids = self.carrera_oferta[ofertas]
+        validas = ids >= 0
+        ids, valores = ids[validas], valores[validas]
+
+        if pooling == 'max':
+            resultado = np.zeros(self.n_carreras)
+            np.maximum.at(resultado, ids, valores)
+            return resultado
+
+        suma = np.bincount(ids, weights=valores, minlength=self.n_carreras)
+        if pooling == 'sum':
+            return suma
+        if pooling == 'mean':
+            return np.divide(suma, self.ofertas_por_carrera, out=np.zeros(self.n_carreras),
+                             where=self.ofertas_por_carrera > 0)
+        raise ValueError(f"Pooling desconocido: {pooling}. Opciones: ['max', 'sum', 'mean']")
+
+    def buscar(self, consulta, k=10, pooling='max'):
+        indices, puntajes = top_k(self.puntuar_carreras(consulta, pooling), k)
+        return indices[0], puntajes[0]
@@ -0,0 +1,291 @@
+import threading
+import time
+from src.instrumentation import instrumentado
+
+# Los módulos de motores (sklearn, plotly, joblib) se importan dentro de cada etapa:
+# una página que solo necesita los datos no paga el costo de importarlos.
+
+ARCHIVOS = ('matricula_senescyt_2015_2023.csv', 'encuentra_empleo_ofertas_2.csv', 'inec_enemdu_salarios.csv')
+
+
+def _store():
+    # Modelos persistidos: se reentrena solo si cambian los datos o los hiperparámetros
+    from src.model_store import ModelStore
+    return ModelStore()
+
+
+@instrumentado('pipeline.datos', filas=None)
+def cargar_datos(path='data/'):
+    """DataManager con los CSV cargados y df_master construido. Devuelve (dm, df_master)."""
+    from src.data_manager import DataManager
+    dm = DataManager()
+    if not dm.load_data(*ARCHIVOS, path=path):
+        raise RuntimeError("Error cargando CSVs.")
+    df_master = dm.process_and_merge()
+    if df_master is None:
+        raise RuntimeError("Error procesando master.")
+    return dm, df_master
+
+
+@instrumentado('pipeline.clustering', filas=None)
+def cargar_clustering(df_master, store=None):
+    """df_master etiquetado por el clustering (restaurado del ModelStore o entrenado)."""
+    from src.clustering_module import CareerClusterer
+    from src.model_store import ModelStore
+    store = store or _store()
+    clusterer = CareerClusterer(df_master)
+    huella = ModelStore.huella(df_master, clusterer.features, clusterer.params)
+    estado = store.cargar('clustering', huella)
+    if estado is not None:
+        clusterer.cargar_estado(estado)
+        return clusterer.ejecutar_clustering()
+
+    # Warm start desde la corrida anterior (si existe y los datos cambiaron poco)
+    df_labeled = clusterer.ejecutar_clustering(previo=store.cargar_ultimo('clustering'))
+    store.guardar('clustering', huella, clusterer.exportar_estado())
+    return df_labeled
+
+
+@instrumentado('pipeline.nlp', filas=None)
+def cargar_nlp(df_labeled, df_ofertas=None, store=None):
+    """Recomendador NLP y, si hay ofertas crudas, su índice de ofertas individuales."""
+    from src.fuzzy_join import VERSION_ALIAS
+    from src.model_store import ModelStore
+    from src.nlp_module import NLPRecommender
+    from src.offer_index import CAMPOS_OFERTA
+    store = store or _store()
+    huella = ModelStore.huella(df_labeled[['carrera', 'sector_economico']], NLPRecommender.parametros())
+    estado = store.cargar('nlp', huella)
+    nlp = NLPRecommender(df_labeled, estado=estado)
+    if estado is None:
+        store.guardar('nlp', huella, nlp.exportar_estado())
+
+    # Índice de ofertas individuales (por lotes)
+    if df_ofertas is not None:
+        huella = ModelStore.huella(df_ofertas[CAMPOS_OFERTA], df_labeled[['carrera']], NLPRecommender.parametros(),
+                                   {'clave_carrera': VERSION_ALIAS})
+        indice = store.cargar('ofertas', huella)
+        if indice is not None:
+            nlp.cargar_indice_ofertas(indice)
+        else:
+            store.guardar('ofertas', huella, nlp.indexar_ofertas(df_ofertas))
+    return nlp
+
+
+@instrumentado('pipeline.predictor', filas=None)
+def cargar_predictor(store=None, compilar=True):
+    """Predictor (datos sintéticos: la huella depende solo de la configuración), ya compilado."""
+    from src.model_store import ModelStore
+    from src.prediction_module import CareerPredictor, ESCENARIOS
+    store = store or _store()
+    predictor = CareerPredictor()
+    huella = ModelStore.huella(predictor.params, predictor.params_datos, ESCENARIOS)
+    estado = store.cargar('predictor', huella)
+    if estado is not None:
+        predictor.cargar_estado(estado)
+    else:
+        predictor.entrenar_modelo()
+        store.guardar('predictor', huella, predictor.exportar_estado())
+    if compilar:
+        predictor.compilar()
+    return predictor
+
+
+@instrumentado('pipeline.simulador', filas=None)
+def cargar_simulador(predictor, store=None, ejes=None):
+    """Grilla de decisión del simulador (restaurada del ModelStore o evaluada por lotes)."""
+    from src.decision_grid import DecisionGrid
+    from src.model_store import ModelStore
+    from src.prediction_module import ESCENARIOS
+    store = store or _store()
+    grilla = DecisionGrid(predictor, ejes)
+    huella = ModelStore.huella(predictor.params, predictor.params_datos, ESCENARIOS, grilla.ejes)
+    estado = store.cargar('simulador', huella)
+    if estado is not None:
+        grilla.cargar_estado(estado)
+    else:
+        grilla.construir()
+        store.guardar('simulador', huella, grilla.exportar_estado())
+    return grilla
+
+
+@instrumentado('pipeline.snapshots', filas=None)
+def cargar_snapshots(dm, store=None, n_clusters=4, n_jobs=-1):
+    """Cortes provincia × trimestre (restaurados del ModelStore o calculados en paralelo)."""
+    from src.model_store import ModelStore
+    from src.snapshots import MarketSnapshots
+    store = store or _store()
+    columnas = ['provincia', 'fecha_publicacion', 'carrera_requerida', 'titulo_puesto', 'salario_minimo', 'salario_maximo']
+    huella = ModelStore.huella(dm.df_ofertas[columnas], dm.df_matricula, dm.df_inec,
+                               dm.alias_y_nombres(), {'n_clusters': n_clusters})
+    estado = store.cargar('snapshots', huella)
+    if estado is not None:
+        return MarketSnapshots.desde_estado(estado)
+    snapshots = MarketSnapshots.construir(dm, n_clusters=n_clusters, n_jobs=n_jobs)
+    store.guardar('snapshots', huella, snapshots.exportar_estado())
+    return snapshots
+
+
+def cargar_eda(dm):
+    """EDA con los DataFrames crudos para gráficos detallados."""
+    from src.eda_module import EDAModule
+    return EDAModule(dm.df_matricula, dm.df_ofertas, dm.df_inec, dm.resumen_ofertas)
+
+
+class Sistema:
+    """
+    Motores cargados bajo demanda: cada uno se construye la primera vez que se
+    pide (con su propio lock, así dos hilos no lo entrenan dos veces) y queda
+    memorizado. `precalentar` carga los más costosos en un hilo de fondo.
+    """
+    ETAPAS = ('datos', 'clustering', 'nlp', 'predictor', 'simulador', 'eda', 'snapshots')
+    # Etapas que no leen los CSV (el predictor usa datos sintéticos)
+    SIN_DATOS = ('predictor', 'simulador')
+
+    def __init__(self, path='data/'):
+        self.path = path
+        self._motores = {}
+        self._locks = {etapa: threading.Lock() for etapa in self.ETAPAS}
+        self.tiempos = {}
+        # Resultados derivados de estos motores (p.ej. respuestas memorizadas de la API)
+        self.derivados = {}
+
+    def _obtener(self, etapa, construir):
+        if etapa in self._motores:
+            return self._motores[etapa]
+        with self._locks[etapa]:
+            if etapa not in self._motores:
+                inicio = time.perf_counter()
+                self._motores[etapa] = construir()
+                self.tiempos[etapa] = round(time.perf_counter() - inicio, 3)
+        return self._motores[etapa]
+
+    @property
+    def datos(self):
+        return self._obtener('datos', lambda: cargar_datos(self.path))
+
+    @property
+    def df_master(self):
+        return self.datos[1]
+
+    @property
+    def df_labeled(self):
+        return self._obtener('clustering', lambda: cargar_clustering(self.df_master))
+
+    @property
+    def nlp(self):
+        return self._obtener('nlp', lambda: cargar_nlp(self.df_labeled, self.datos[0].df_ofertas))
+
+    @property
+    def predictor(self):
+        # No depende de los CSV: se puede cargar sin tocar los datos
+        return self._obtener('predictor', cargar_predictor)
+
+    @property
+    def simulador(self):
+        return self._obtener('simulador', lambda: cargar_simulador(self.predictor))
+
+    @property
+    def eda(self):
+        return self._obtener('eda', lambda: cargar_eda(self.datos[0]))
+
+    @property
+    def snapshots(self):
+        return self._obtener('snapshots', lambda: cargar_snapshots(self.datos[0]))
+
+    def obtener(self, etapa):
+        """Motor por nombre de etapa ('clustering' devuelve df_labeled)."""
+        if etapa not in self.ETAPAS:
+            raise ValueError(f"Etapa desconocida: {etapa}. Opciones: {list(self.ETAPAS)}")
+        return getattr(self, 'df_labeled' if etapa == 'clustering' else etapa)
+
+    def cargados(self):
+        return [etapa for etapa in self.ETAPAS if etapa in self._motores]
+
+    def adoptar(self, etapa, otro):
+        """Reutiliza el motor ya cargado de otro Sistema (solo lectura, se comparte tal cual)."""
+        self._motores[etapa] = otro._motores[etapa]
+        self.tiempos[etapa] = 0.0
+
+    # --- Segmentos compartidos entre procesos (ver src/shared_segments.py) ---
+    def publicar_segmentos(self, etapas=('clustering', 'nlp', 'predictor'), segmentos=None):
+        """
+        Carga las etapas indicadas y publica sus arrays de solo lectura. Devuelve
+        el manifiesto (pequeño, serializable) con el que otros procesos arman
+        su Sistema vía `desde_segmentos` sin copiar los datos.
+        """
+        from src.shared_segments import SegmentStore, arrays_dataframe
+        segmentos = segmentos or SegmentStore()
+        manifiesto = {'path': self.path}
+        etapas = set(etapas)
+        if etapas & {'clustering', 'nlp'}:
+            arrays, meta = arrays_dataframe(self.df_labeled)
+            manifiesto['clustering'] = segmentos.publicar('clustering', arrays, meta)
+        if 'nlp' in etapas:
+            manifiesto['nlp'] = segmentos.publicar('nlp', *self.nlp.exportar_segmentos())
+        if 'predictor' in etapas:
+            predictor = self.predictor
+            manifiesto['predictor'] = segmentos.publicar('predictor', predictor.bosque.exportar_arrays(),
+                                                         predictor.classes_)
+        if 'snapshots' in etapas:
+            snapshots = self.snapshots
+            arrays, meta = arrays_dataframe(snapshots.datos)
+            manifiesto['snapshots'] = segmentos.publicar('snapshots', arrays, (meta, snapshots.indice))
+        return manifiesto
+
+    @classmethod
+    def desde_segmentos(cls, manifiesto):
+        """
+        Sistema con las etapas del manifiesto armadas sobre los segmentos
+        mapeados en memoria: solo se reconstruyen los envoltorios
+        (DataFrame, csr_matrix, BosqueCompilado). El predictor no tiene
+        rf_model: predice siempre con el bosque compartido y no restaura ni
+        entrena nada. El resto sigue bajo demanda.
+        """
+        from src.shared_segments import SegmentStore, dataframe_de_arrays
+        sistema = cls(manifiesto['path'])
+        inicio = time.perf_counter()
+        if 'clustering' in manifiesto:
+            m = manifiesto['clustering']
+            sistema._motores['clustering'] = dataframe_de_arrays(SegmentStore.adjuntar(m), m['extra'])
+        if 'nlp' in manifiesto:
+            from src.nlp_module import NLPRecommender
+            m = manifiesto['nlp']
+            sistema._motores['nlp'] = NLPRecommender.desde_segmentos(sistema.df_labeled, SegmentStore.adjuntar(m), m['extra'])
+        if 'predictor' in manifiesto:
+            from src.prediction_module import BosqueCompilado, CareerPredictor
+            m = manifiesto['predictor']
+            bosque = BosqueCompilado.desde_arrays(SegmentStore.adjuntar(m), m['extra'])
+            sistema._motores['predictor'] = CareerPredictor.desde_bosque(bosque)
+        if 'snapshots' in manifiesto:
+            from src.snapshots import MarketSnapshots
+            m = manifiesto['snapshots']
+            meta, indice = m['extra']
+            sistema._motores['snapshots'] = MarketSnapshots(dataframe_de_arrays(SegmentStore.adjuntar(m), meta), dict(indice))
+        sistema.tiempos['segmentos'] = round(time.perf_counter() - inicio, 3)
+        return sistema
+
+    def precalentar(self, etapas=('predictor', 'nlp')):
+        """Carga las etapas indicadas en un hilo daemon; los errores se reportan, no se propagan."""
+        def tarea():
+            for etapa in etapas:
+                try:
+                    self.obtener(etapa)
+                except Exception as e:
+                    print(f"⚠️ [Sistema] No se pudo precalentar {etapa}: {e}")
+        hilo = threading.Thread(target=tarea, name='precalentar-motores', daemon=True)
+        hilo.start()
+        return hilo
+
+
+@instrumentado('pipeline.construir_sistema', filas=None)
+def construir_sistema(path='data/'):
+    """
+    Carga los datos y entrena (o restaura del ModelStore) todos los motores de una vez.
+    Devuelve (df_labeled, nlp, predictor, eda, estado).
+    """
+    sistema = Sistema(path)
+    try:
+        return sistema.df_labeled, sistema.nlp, sistema.predictor, sistema.eda, "OK"
+    except RuntimeError as e:
+        return None, None, None, None, str(e)
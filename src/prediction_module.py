@@ -1,62 +1,204 @@
 import numpy as np
 import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
+from src.instrumentation import instrumentado
+
+# Escenarios Difusos (Fuzzy Logic): (media, desviación, mínimo, máximo) por feature y clase.
+# Orden de features: num_estudiantes, num_ofertas, salario_oferta, tasa_empleo_formal
+ESCENARIOS = {
+    "Saturada":   [(10000, 3500, 3000, 25000), (35, 25, 0, 90),    (650, 200, 400, 950),    (45, 12, 20, 70)],
+    "En Demanda": [(2500, 1200, 800, 6000),    (250, 90, 120, 600), (1600, 400, 1000, 3000), (80, 10, 55, 100)],
+    "Nicho":      [(600, 300, 50, 1500),       (60, 40, 10, 180),   (1400, 450, 900, 2500),  (70, 15, 45, 95)],
+    "Balanceada": [(5000, 2000, 1500, 9000),   (110, 50, 50, 250),  (950, 250, 600, 1400),   (60, 15, 35, 85)],
+}
+
+# Por debajo de este tamaño de lote el bosque compilado es más rápido que sklearn
+# (ver benchmarks/bench_predictor.py)
+LIMITE_COMPILADO = 1000
+
+
+def _muestrear(rng, n, escenarios):
+    """n muestras por clase, intercaladas por clase como en el generador original."""
+    clases = list(escenarios)
+    spec = np.array([escenarios[c] for c in clases], dtype=float)  # (clases, features, 4)
+    medias, desv, mn, mx = (spec[..., i] for i in range(4))
+    valores = rng.normal(medias, desv, size=(n,) + medias.shape)
+    X = np.clip(np.trunc(valores), mn, mx).astype(np.int64).reshape(-1, medias.shape[1])
+    return X, np.tile(np.array(clases), n)
+
+
+def generar_datos_sinteticos(n=1000, seed=42, escenarios=ESCENARIOS):
+    """
+    Genera n muestras por clase en bloque con un np.random.Generator.
+    Con la misma semilla el resultado es idéntico.
+    """
+    return _muestrear(np.random.default_rng(seed), n, escenarios)
+
+
+def iter_datos_sinteticos(n=1000, seed=42, escenarios=ESCENARIOS, tam_lote=100_000):
+    """
+    Versión por lotes de generar_datos_sinteticos para conjuntos muy grandes.
+    Cada lote usa su propia semilla derivada (SeedSequence), por lo que el
+    resultado es reproducible para una misma combinación de seed y tam_lote.
+    """
+    n_lotes = -(-n // tam_lote)
+    semillas = np.random.SeedSequence(seed).spawn(n_lotes)
+    for i, semilla in enumerate(semillas):
+        tam = min(tam_lote, n - i * tam_lote)
+        yield _muestrear(np.random.default_rng(semilla), tam, escenarios)
+
 
 class CareerPredictor:
-    def __init__(self):
+    def __init__(self, estado=None):
         self.rf_model = None
+        self.bosque = None
         self.features = ['num_estudiantes', 'num_ofertas', 'salario_oferta', 'tasa_empleo_formal']
+        # Configuración para evitar overfitting
+        self.params = {
+            'n_estimators': 100,
+            'max_depth': 6,
+            'min_samples_leaf': 15,
+            'class_weight': 'balanced',
+            'random_state': 42
+        }
+        # Tamaño (muestras por clase) y semilla del conjunto sintético
+        self.params_datos = {'n': 1000, 'seed': 42}
+        if estado is not None:
+            self.cargar_estado(estado)
+
+    @classmethod
+    def desde_bosque(cls, bosque):
+        """
+        Predictor liviano sobre un BosqueCompilado ya armado (p. ej. sobre
+        segmentos compartidos): sin rf_model, no entrena ni consulta el ModelStore.
+        """
+        predictor = cls()
+        predictor.bosque = bosque
+        return predictor
+
+    @property
+    def classes_(self):
+        return self.rf_model.classes_ if self.rf_model is not None else self.bosque.classes_
+
+    def umbrales(self, f):
+        """Umbrales de corte del feature f en todos los árboles (nodos internos)."""
+        if self.rf_model is not None:
+            arboles = self.rf_model.estimators_
+            return np.concatenate([a.tree_.threshold[a.tree_.feature == f] for a in arboles])
+        b = self.bosque
+        # En el bosque aplanado las hojas apuntan a sí mismas
+        interno = b.left != np.arange(b.left.size)
+        return b.threshold[interno & (b.feature == f)]
+
+    def exportar_estado(self):
+        """Modelo ajustado para guardar en el ModelStore."""
+        return {'rf_model': self.rf_model}
 
+    def cargar_estado(self, estado):
+        self.rf_model = estado['rf_model']
+
+    @instrumentado('predictor.entrenar', filas=None)
     def entrenar_modelo(self):
         """
         Entrena Random Forest usando Data Augmentation (Datos Sintéticos)
         para evitar overfitting con datasets pequeños.
         """
-        def generar_datos_complejos(n=1000):
-            datos, etiquetas = [], []
-            
-            def gen_val(media, desv, mn, mx):
-                val = np.random.normal(media, desv)
-                return max(mn, min(mx, int(val)))
-
-            # Escenarios Difusos (Fuzzy Logic)
-            for _ in range(n):
-                # Saturada
-                datos.append([gen_val(10000, 3500, 3000, 25000), gen_val(35, 25, 0, 90), gen_val(650, 200, 400, 950), gen_val(45, 12, 20, 70)])
-                etiquetas.append("Saturada")
-                # En Demanda
-                datos.append([gen_val(2500, 1200, 800, 6000), gen_val(250, 90, 120, 600), gen_val(1600, 400, 1000, 3000), gen_val(80, 10, 55, 100)])
-                etiquetas.append("En Demanda")
-                # Nicho
-                datos.append([gen_val(600, 300, 50, 1500), gen_val(60, 40, 10, 180), gen_val(1400, 450, 900, 2500), gen_val(70, 15, 45, 95)])
-                etiquetas.append("Nicho")
-                # Balanceada
-                datos.append([gen_val(5000, 2000, 1500, 9000), gen_val(110, 50, 50, 250), gen_val(950, 250, 600, 1400), gen_val(60, 15, 35, 85)])
-                etiquetas.append("Balanceada")
-                
-            return np.array(datos), np.array(etiquetas)
-
-        X_sint, y_sint = generar_datos_complejos()
+        X_sint, y_sint = generar_datos_sinteticos(**self.params_datos)
         
-        # Configuración para evitar overfitting
-        self.rf_model = RandomForestClassifier(
-            n_estimators=100,
-            max_depth=6,
-            min_samples_leaf=15,
-            class_weight='balanced',
-            random_state=42
-        )
+        self.rf_model = RandomForestClassifier(**self.params)
         self.rf_model.fit(X_sint, y_sint)
 
+    @instrumentado('predictor.compilar', filas=None)
+    def compilar(self):
+        """Aplana el bosque en arrays NumPy para inferencia de baja latencia."""
+        self.bosque = BosqueCompilado(self.rf_model)
+        return self.bosque
+
+    @instrumentado('predictor.predecir_batch', filas=lambda r: len(r[0]))
+    def predecir_batch(self, X, compilado=None):
+        """
+        Predice un array (n, 4) con una sola pasada de predict_proba; la etiqueta
+        se obtiene por argmax. compilado=None usa el bosque compilado (si existe)
+        solo para lotes pequeños, donde sklearn tiene más costo fijo por llamada.
+        Sin rf_model (predictor de `desde_bosque`) siempre se usa el bosque.
+        """
+        X = np.asarray(X, dtype=float).reshape(-1, len(self.features))
+        if compilado is None:
+            compilado = len(X) < LIMITE_COMPILADO
+        if self.bosque is not None and (compilado or self.rf_model is None):
+            probs = self.bosque.predict_proba(X)
+        else:
+            probs = self.rf_model.predict_proba(X)
+        return self.classes_[probs.argmax(axis=1)], probs
+
     def predecir(self, est, ofe, sal, tasa):
-        if not self.rf_model:
+        if self.rf_model is None and self.bosque is None:
             return "Modelo no entrenado", {}
-            
-        # DataFrame con nombres de columnas para coincidir con el entrenamiento (si se usara dataframe)
-        # Como usamos numpy arrays en fit, usamos lista simple aquí, pero mantenemos orden
-        data = [[est, ofe, sal, tasa]]
-        
-        pred = self.rf_model.predict(data)[0]
-        probs = self.rf_model.predict_proba(data)[0]
+
+        # Mantener el orden de features usado en el entrenamiento
+        preds, probs = self.predecir_batch([[est, ofe, sal, tasa]])
         
-        return pred, dict(zip(self.rf_model.classes_, probs))
\ No newline at end of file
+        return preds[0], dict(zip(self.classes_, probs[0]))
+
+
+class BosqueCompilado:
+    """
+    Representación plana de un RandomForestClassifier: los nodos de todos los
+    árboles se concatenan en arrays NumPy y se recorren de forma vectorizada
+    (todas las filas y todos los árboles a la vez, un nivel por iteración).
+    """
+    # Arrays que definen el bosque (los que se comparten entre procesos)
+    CAMPOS = ('feature', 'threshold', 'left', 'right', 'value', 'raices')
+
+    def __init__(self, rf_model):
+        features, umbrales, izq, der, valores, raices = [], [], [], [], [], []
+        offset = 0
+        for est in rf_model.estimators_:
+            t = est.tree_
+            n = t.node_count
+            hoja = t.children_left == -1
+            ids = np.arange(n) + offset
+            # En las hojas ambos hijos apuntan a la propia hoja: el recorrido se estabiliza
+            izq.append(np.where(hoja, ids, t.children_left + offset))
+            der.append(np.where(hoja, ids, t.children_right + offset))
+            features.append(np.where(hoja, 0, t.feature))
+            umbrales.append(t.threshold)
+            v = t.value[:, 0, :]
+            valores.append(v / v.sum(axis=1, keepdims=True))
+            raices.append(offset)
+            offset += n
+
+        self.feature = np.concatenate(features).astype(np.intp)
+        self.threshold = np.concatenate(umbrales)
+        self.left = np.concatenate(izq).astype(np.intp)
+        self.right = np.concatenate(der).astype(np.intp)
+        self.value = np.concatenate(valores)
+        self.raices = np.array(raices, dtype=np.intp)
+        self.profundidad = max(est.tree_.max_depth for est in rf_model.estimators_)
+        self.classes_ = rf_model.classes_
+
+    def exportar_arrays(self, prefijo='bosque'):
+        """Arrays del bosque aplanado para compartir entre procesos (ver src/shared_segments.py)."""
+        arrays = {f'{prefijo}.{campo}': getattr(self, campo) for campo in self.CAMPOS}
+        arrays[f'{prefijo}.profundidad'] = np.array([self.profundidad], dtype=np.int64)
+        return arrays
+
+    @classmethod
+    def desde_arrays(cls, arrays, classes_, prefijo='bosque'):
+        """Bosque sobre arrays existentes (sin recorrer los árboles de sklearn)."""
+        bosque = cls.__new__(cls)
+        for campo in cls.CAMPOS:
+            setattr(bosque, campo, arrays[f'{prefijo}.{campo}'])
+        bosque.profundidad = int(arrays[f'{prefijo}.profundidad'][0])
+        bosque.classes_ = classes_
+        return bosque
+
+    def predict_proba(self, X):
+        # sklearn compara en float32: se replica para obtener las mismas hojas
+        X = np.asarray(X, dtype=np.float32)
+        filas = np.arange(X.shape[0])[:, None]
+        nodos = np.broadcast_to(self.raices, (X.shape[0], self.raices.size))
+        for _ in range(self.profundidad):
+            a_izq = X[filas, self.feature[nodos]] <= self.threshold[nodos]
+            nodos = np.where(a_izq, self.left[nodos], self.right[nodos])
+        return self.value[nodos].mean(axis=1)
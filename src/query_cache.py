@@ -0,0 +1,56 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Caché LRU acotada y segura entre hilos, con expiración opcional (TTL en segundos).
+    Lleva contadores de aciertos, fallos y desalojos para dimensionarla.
+    """
+
+    def __init__(self, max_entradas=1024, ttl=None):
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.desalojos = 0
+
+    def get(self, clave):
+        """Devuelve el valor o None si no existe o expiró."""
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is not None:
+                creado, valor = entrada
+                if self.ttl is None or time.monotonic() - creado <= self.ttl:
+                    self._datos.move_to_end(clave)
+                    self.hits += 1
+                    return valor
+                del self._datos[clave]
+            self.misses += 1
+            return None
+
+    def put(self, clave, valor):
+        with self._lock:
+            self._datos[clave] = (time.monotonic(), valor)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.max_entradas:
+                self._datos.popitem(last=False)
+                self.desalojos += 1
+
+    def clear(self):
+        with self._lock:
+            self._datos.clear()
+
+    def estadisticas(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entradas': len(self._datos),
+            'max_entradas': self.max_entradas,
+            'desalojos': self.desalojos,
+        }
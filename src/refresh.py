@@ -0,0 +1,206 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from src.pipeline import ARCHIVOS, Sistema
+
+# Etapas que no quedan en el ModelStore: no vale la pena construirlas en el proceso aparte
+NO_PERSISTIDAS = ('eda',)
+
+
+def _artefactos():
+    """Archivos del ModelStore; los que aparecen tras una construcción son las etapas reentrenadas."""
+    from src.model_store import ModelStore
+    directorio = ModelStore().directorio
+    return set(os.listdir(directorio)) if os.path.isdir(directorio) else set()
+
+
+def _reentrenados(antes):
+    return sorted({a.rsplit('-', 1)[0] for a in _artefactos() - antes if a.endswith('.joblib')})
+
+
+def _construir_etapas(path, etapas, prioridad=10):
+    """
+    Entrena o restaura las etapas en un proceso aparte con menor prioridad:
+    deja el ModelStore (y la caché de los CSV) al día para que el proceso que
+    atiende solo tenga que restaurarlas. Devuelve (tiempos, reentrenados).
+    """
+    if prioridad and hasattr(os, 'nice'):
+        os.nice(prioridad)
+    antes = _artefactos()
+    sistema = Sistema(path)
+    for etapa in etapas:
+        sistema.obtener(etapa)
+    return dict(sistema.tiempos), _reentrenados(antes)
+
+
+class CoordinadorRefresco:
+    """
+    Mantiene el Sistema vigente y lo reemplaza cuando cambian los CSV de `path`.
+
+    Un hilo vigila tamaño y fecha de los archivos de entrada; cuando cambian
+    (y se mantienen estables un intervalo, para no leer una copia a medias)
+    se construye un Sistema nuevo en segundo plano mientras el anterior sigue
+    atendiendo. El entrenamiento pesado corre en un proceso aparte que deja
+    el ModelStore al día: las etapas cuyas entradas no cambiaron coinciden en
+    huella y se restauran sin reentrenar. Después, en este proceso, se
+    restauran las etapas que el Sistema vigente tenía cargadas y el nuevo se
+    instala con una sola asignación (doble búfer): las consultas en curso
+    terminan con la referencia que ya tenían.
+    """
+
+    def __init__(self, path='data/', etapas=(), intervalo=10.0, en_proceso=True, preparar=None, al_cambiar=None):
+        self.path = path
+        self.etapas = tuple(etapas)
+        self.intervalo = intervalo
+        self.en_proceso = en_proceso
+        # preparar(sistema) -> sistema: se aplica antes de instalar (un error cancela el cambio)
+        self.preparar = preparar
+        # al_cambiar(nuevo, anterior): se llama después de instalar (anterior es None la primera vez)
+        self.al_cambiar = al_cambiar
+        self.ultimo_error = None
+        self._lock = threading.Lock()
+        self._detener = threading.Event()
+        self._hilo = None
+        self._firma_fallida = None
+        self._version = 0
+        self._actual = None
+        self._instalar(Sistema(path), self.firma_datos(), {}, [], None)
+
+    # --- Bundle vigente ---
+    @property
+    def sistema(self):
+        """Sistema vigente. Quien atiende una consulta debe tomarlo una vez y usar esa referencia."""
+        return self._actual[0]
+
+    @property
+    def refrescando(self):
+        return self._lock.locked()
+
+    def estado(self):
+        """Versión vigente, tiempos de construcción y de carga, y estado del refresco."""
+        sistema, info = self._actual
+        return {**info, 'carga': dict(sistema.tiempos), 'cargados': sistema.cargados(),
+                'refrescando': self.refrescando, 'vigilando': self._hilo is not None and self._hilo.is_alive(),
+                'ultimo_error': self.ultimo_error}
+
+    def firma_datos(self):
+        """Tamaño y fecha de modificación de cada CSV de entrada (None si falta)."""
+        firma = []
+        for archivo in ARCHIVOS:
+            try:
+                st = os.stat(os.path.join(self.path, archivo))
+                firma.append((archivo, st.st_size, st.st_mtime_ns))
+            except OSError:
+                firma.append((archivo, None, None))
+        return tuple(firma)
+
+    def _instalar(self, sistema, firma, construccion, reentrenados, segundos):
+        if self.preparar is not None:
+            sistema = self.preparar(sistema)
+        self._version += 1
+        info = {'version': self._version, 'creado': datetime.now().isoformat(timespec='seconds'),
+                'segundos': segundos, 'construccion': construccion, 'reentrenados': reentrenados}
+        anterior = self._actual[0] if self._actual else None
+        # Única asignación: nadie ve un Sistema a medio instalar
+        self._actual = (sistema, info)
+        self._firma = firma
+        if self.al_cambiar is not None:
+            self.al_cambiar(sistema, anterior)
+
+    # --- Refresco ---
+    def refrescar(self, forzar=False):
+        """
+        Construye e instala un Sistema nuevo si cambiaron los datos (o si `forzar`).
+        Bloquea hasta terminar; devuelve True si se instaló uno nuevo. Si falla,
+        el Sistema vigente sigue atendiendo y el error queda en `ultimo_error`.
+        """
+        with self._lock:
+            firma = self.firma_datos()
+            if firma == self._firma and not forzar:
+                return False
+            anterior = self.sistema
+            inicio = time.perf_counter()
+            try:
+                nuevo, construccion, reentrenados = self._construir(anterior)
+                self._instalar(nuevo, firma, construccion, reentrenados, round(time.perf_counter() - inicio, 3))
+            except Exception as e:
+                self.ultimo_error = f"{type(e).__name__}: {e}"
+                self._firma_fallida = firma
+                print(f"⚠️ [Refresco] Se mantiene la versión {self._actual[1]['version']}: {e}")
+                return False
+            self.ultimo_error = None
+            self._firma_fallida = None
+            print(f"✅ [Refresco] Versión {self._version} instalada en {time.perf_counter() - inicio:.2f}s "
+                  f"(reentrenados: {', '.join(reentrenados) or 'ninguno'})")
+            return True
+
+    def _construir(self, anterior):
+        """Sistema nuevo con al menos las etapas que el vigente tenía cargadas."""
+        etapas = [e for e in Sistema.ETAPAS if e in set(anterior.cargados()) | set(self.etapas) | {'datos'}]
+        nuevo = Sistema(self.path)
+        # Las etapas que no dependen de los CSV se reutilizan tal cual
+        for etapa in Sistema.SIN_DATOS:
+            if etapa in anterior.cargados():
+                nuevo.adoptar(etapa, anterior)
+        pendientes = [e for e in etapas if e not in nuevo.cargados()]
+
+        if self.en_proceso:
+            construccion, reentrenados = self._construir_en_proceso([e for e in pendientes if e not in NO_PERSISTIDAS])
+            # Aquí todo sale del ModelStore con la huella recién guardada
+            for etapa in pendientes:
+                nuevo.obtener(etapa)
+        else:
+            antes = _artefactos()
+            for etapa in pendientes:
+                nuevo.obtener(etapa)
+            construccion, reentrenados = dict(nuevo.tiempos), _reentrenados(antes)
+        return nuevo, construccion, reentrenados
+
+    def _construir_en_proceso(self, etapas):
+        # Intérprete nuevo (no fork ni multiprocessing: Streamlit reemplaza __main__ por la app)
+        raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        entorno = {**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, [raiz, os.environ.get('PYTHONPATH')]))}
+        salida = subprocess.run([sys.executable, '-m', 'src.refresh', self.path, *etapas],
+                                capture_output=True, text=True, env=entorno)
+        if salida.returncode != 0:
+            lineas = salida.stderr.strip().splitlines()
+            raise RuntimeError(lineas[-1] if lineas else f"el proceso terminó con código {salida.returncode}")
+        # Los motores imprimen su progreso: el resultado es la última línea
+        return json.loads(salida.stdout.strip().splitlines()[-1])
+
+    def refrescar_en_segundo_plano(self, forzar=False):
+        """Lanza `refrescar` en un hilo daemon; False si ya hay un refresco en curso."""
+        if self.refrescando:
+            return False
+        threading.Thread(target=self.refrescar, args=(forzar,), name='refresco-sistema', daemon=True).start()
+        return True
+
+    # --- Vigilancia de data/ ---
+    def iniciar(self):
+        """Arranca el hilo que vigila los CSV (si intervalo > 0)."""
+        if self.intervalo and (self._hilo is None or not self._hilo.is_alive()):
+            self._detener.clear()
+            self._hilo = threading.Thread(target=self._vigilar, name='vigilar-datos', daemon=True)
+            self._hilo.start()
+        return self
+
+    def detener(self):
+        self._detener.set()
+
+    def _vigilar(self):
+        previa = None
+        while not self._detener.wait(self.intervalo):
+            firma = self.firma_datos()
+            # Se refresca cuando la firma cambió y se mantuvo igual desde la revisión anterior
+            if firma != self._firma and firma == previa and firma != self._firma_fallida:
+                self.refrescar()
+            previa = firma
+
+
+if __name__ == '__main__':
+    # python -m src.refresh <path> <etapa>...: lo lanza CoordinadorRefresco en modo proceso
+    print(json.dumps(_construir_etapas(sys.argv[1], sys.argv[2:])))
@@ -0,0 +1,177 @@
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.preprocessing import normalize
+
+# Memoria máxima (bytes) del producto disperso consulta × índice por bloque de consultas
+MEMORIA_LOTE = 256 * 2 ** 20
+
+
+def top_k(scores, k):
+    """
+    Top-k por fila de una matriz densa de puntajes usando argpartition (O(N))
+    en lugar de un argsort completo. Devuelve (índices, puntajes) ordenados
+    de mayor a menor; a igual puntaje gana el índice menor.
+    """
+    scores = np.atleast_2d(scores)
+    n = scores.shape[1]
+    k = min(k, n)
+    if k == 0:
+        vacio = np.empty((scores.shape[0], 0))
+        return vacio.astype(np.int64), vacio
+    if k < n:
+        # argpartition no desempata en el borde: se toman los que superan al k-ésimo
+        # mayor y, de los que lo igualan, los de menor índice hasta completar k
+        umbral = np.partition(scores, n - k, axis=1)[:, [n - k]]
+        mayores = scores > umbral
+        iguales = scores == umbral
+        faltan = k - mayores.sum(axis=1, keepdims=True)
+        seleccion = mayores | (iguales & (np.cumsum(iguales, axis=1) <= faltan))
+        candidatos = np.nonzero(seleccion)[1].reshape(-1, k)
+    else:
+        candidatos = np.tile(np.arange(n), (scores.shape[0], 1))
+    valores = np.take_along_axis(scores, candidatos, axis=1)
+    orden = np.lexsort((candidatos, -valores), axis=1)
+    indices = np.take_along_axis(candidatos, orden, axis=1)
+    return indices, np.take_along_axis(valores, orden, axis=1)
+
+
+def top_k_disperso(puntajes, k):
+    """
+    Top-k por fila de una matriz dispersa (CSR) sin densificarla: solo se
+    recorren los valores no nulos de cada fila. Mismo orden que top_k; las
+    filas con menos de k valores se completan con índice -1 y puntaje 0.
+    """
+    puntajes = puntajes.tocsr()
+    indices = np.full((puntajes.shape[0], k), -1, dtype=np.int64)
+    valores = np.zeros((puntajes.shape[0], k))
+    for q in range(puntajes.shape[0]):
+        inicio, fin = puntajes.indptr[q], puntajes.indptr[q + 1]
+        cols, vals = puntajes.indices[inicio:fin], puntajes.data[inicio:fin]
+        if len(vals) > k:
+            # Todos los que igualan o superan al k-ésimo mayor; el desempate por índice va abajo
+            umbral = np.partition(vals, len(vals) - k)[len(vals) - k]
+            sel = np.flatnonzero(vals >= umbral)
+            cols, vals = cols[sel], vals[sel]
+        orden = np.lexsort((cols, -vals))[:k]
+        indices[q, :len(orden)] = cols[orden]
+        valores[q, :len(orden)] = vals[orden]
+    return indices, valores
+
+
+def fuerza_bruta(consultas, indice, k):
+    """
+    Top-k de referencia: todos los puntajes consulta × documento en denso y
+    top_k sobre la fila completa. Solo para medir recall (memoria n_consultas × n_docs).
+    """
+    return top_k(np.asarray((consultas @ indice).todense()), k)
+
+
+def _recall(motor, consultas, k, referencia, indice):
+    """Fracción del top-k de referencia (con puntaje > 0) que recupera el motor."""
+    if referencia is None:
+        idx_ref, val_ref = fuerza_bruta(consultas, indice, k)
+    else:
+        idx_ref, val_ref = referencia.buscar(consultas, k)
+    idx_motor, _ = motor.buscar(consultas, k)
+    aciertos, total = 0, 0
+    for q in range(idx_ref.shape[0]):
+        relevantes = set(idx_ref[q][val_ref[q] > 0].tolist())
+        aciertos += len(relevantes & set(idx_motor[q].tolist()))
+        total += len(relevantes)
+    return aciertos / total if total else 1.0
+
+
+class ExactRetriever:
+    """
+    Motor exacto: índice invertido (matriz transpuesta término → documentos)
+    y producto disperso consulta × índice. Con filas TF-IDF normalizadas (L2)
+    el producto punto equivale a la similitud del coseno.
+    """
+    nombre = 'exacto'
+
+    def __init__(self, matriz):
+        self.n_docs = matriz.shape[0]
+        self.indice = matriz.T.tocsr()
+
+    @classmethod
+    def desde_indice(cls, indice):
+        """Motor sobre un índice invertido ya construido (p.ej. en memoria compartida)."""
+        motor = cls.__new__(cls)
+        motor.n_docs = indice.shape[1]
+        motor.indice = indice
+        return motor
+
+    def buscar(self, consultas, k=10):
+        """
+        Top-k por consulta. El producto se hace por bloques de consultas cuyo
+        peor caso (todos los documentos con puntaje) cabe en MEMORIA_LOTE, y el
+        top-k sale del resultado disperso: la memoria no crece con n_consultas × n_docs.
+        """
+        consultas = consultas.tocsr()
+        # 16 bytes por valor no nulo: float64 + índice int64
+        por_bloque = max(1, MEMORIA_LOTE // (16 * max(self.n_docs, 1)))
+        partes = [top_k_disperso(consultas[i:i + por_bloque] @ self.indice, k)
+                  for i in range(0, consultas.shape[0], por_bloque)]
+        if not partes:
+            return np.empty((0, k), dtype=np.int64), np.empty((0, k))
+        return np.vstack([p[0] for p in partes]), np.vstack([p[1] for p in partes])
+
+    def recall(self, consultas, k=10, referencia=None):
+        """Recall@k frente a la referencia (por defecto, fuerza bruta en denso)."""
+        return _recall(self, consultas.tocsr(), k, referencia, self.indice)
+
+
+class IVFRetriever:
+    """
+    Motor aproximado tipo IVF: los documentos se reparten en `n_listas` grupos
+    con K-Means y cada consulta solo se compara (de forma exacta) contra los
+    documentos de las `n_sondas` listas cuyos centroides son más cercanos.
+    """
+    nombre = 'ivf'
+
+    def __init__(self, matriz, n_listas=None, n_sondas=2, random_state=42):
+        self.matriz = matriz.tocsr()
+        self.n_docs = matriz.shape[0]
+        self.n_listas = n_listas or max(1, int(np.sqrt(self.n_docs)))
+        self.n_listas = min(self.n_listas, self.n_docs)
+        self.n_sondas = min(n_sondas, self.n_listas)
+
+        kmeans = KMeans(n_clusters=self.n_listas, random_state=random_state, n_init=1)
+        asignacion = kmeans.fit_predict(self.matriz)
+        self.centroides = normalize(kmeans.cluster_centers_)
+        orden = np.argsort(asignacion, kind='stable')
+        limites = np.searchsorted(asignacion[orden], np.arange(self.n_listas + 1))
+        self.listas = [orden[limites[i]:limites[i + 1]] for i in range(self.n_listas)]
+
+    def buscar(self, consultas, k=10):
+        consultas = consultas.tocsr()
+        sondas, _ = top_k(np.asarray(consultas @ self.centroides.T), self.n_sondas)
+        indices = np.full((consultas.shape[0], k), -1, dtype=np.int64)
+        puntajes = np.zeros((consultas.shape[0], k))
+        for q in range(consultas.shape[0]):
+            # Ordenados: a igual puntaje gana el índice menor, como en el motor exacto
+            candidatos = np.sort(np.concatenate([self.listas[l] for l in sondas[q]]))
+            if candidatos.size == 0:
+                continue
+            s = (consultas[q] @ self.matriz[candidatos].T).toarray()
+            idx, val = top_k(s, k)
+            n = idx.shape[1]
+            indices[q, :n] = candidatos[idx[0]]
+            puntajes[q, :n] = val[0]
+        return indices, puntajes
+
+    def recall(self, consultas, k=10, referencia=None):
+        """Recall@k frente a la referencia (por defecto, fuerza bruta en denso)."""
+        return _recall(self, consultas.tocsr(), k, referencia, self.matriz.T)
+
+
+MOTORES = {
+    ExactRetriever.nombre: ExactRetriever,
+    IVFRetriever.nombre: IVFRetriever,
+}
+
+
+def crear_motor(nombre, matriz, **opciones):
+    if nombre not in MOTORES:
+        raise ValueError(f"Motor de búsqueda desconocido: {nombre}. Opciones: {list(MOTORES)}")
+    return MOTORES[nombre](matriz, **opciones)
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+# Tipos compactos por tabla. Los enteros no bajan de int32 donde se suman o
+# restan elemento a elemento (int16 desbordaría en silencio); los flotantes que
+# alimentan modelos se dejan en float64 para no alterar los resultados.
+ESQUEMAS = {
+    'ofertas': {
+        'titulo_puesto': 'category', 'empresa': 'category', 'carrera_requerida': 'category',
+        'provincia': 'category', 'experiencia_requerida': 'category', 'fecha_publicacion': 'datetime64[ns]',
+        'sector': 'category', 'salario_minimo': 'int32', 'salario_maximo': 'int32',
+    },
+    'matricula': {
+        'año': 'int16', 'carrera': 'category', 'provincia': 'category', 'num_estudiantes': 'int32',
+    },
+    'inec': {
+        'trimestre': 'category', 'sector_economico': 'category', 'nivel_educacion': 'category',
+        'salario_promedio_mensual': 'int32', 'empleados_estimados': 'int32',
+    },
+    'master': {
+        'sector_economico': 'category', 'num_estudiantes': 'int32', 'num_ofertas': 'int32',
+    },
+    # Todos los cortes provincia × trimestre concatenados (src/snapshots.py)
+    'cortes': {
+        'carrera': 'category', 'sector_economico': 'category', 'num_estudiantes': 'int32',
+        'num_ofertas': 'int32', 'cluster': 'int8', 'categoria': 'category',
+    },
+}
+
+# Columnas auxiliares de los merges que no deben quedar en df_master
+COLUMNAS_ANDAMIAJE = ['key', 'carrera_oferta']
+
+# Una columna de texto solo pasa a categórica si repite valores lo suficiente
+MAX_FRACCION_CATEGORIAS = 0.5
+
+
+def memoria_mb(df):
+    """Memoria real del DataFrame (incluye el contenido de los strings)."""
+    return df.memory_usage(deep=True).sum() / 2 ** 20
+
+
+def _convertir(serie, tipo):
+    if tipo == 'category':
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            return serie
+        if serie.nunique(dropna=True) > MAX_FRACCION_CATEGORIAS * max(len(serie), 1):
+            return serie
+        return serie.astype('category')
+    dtype = np.dtype(tipo)
+    if dtype.kind == 'M':
+        if serie.dtype == dtype:
+            return serie
+        fechas = pd.to_datetime(serie, errors='coerce')
+        # Si alguna fecha no se pudo interpretar se conserva el texto original
+        return fechas if fechas.isna().sum() == serie.isna().sum() else serie
+    if serie.dtype == dtype or serie.isna().any():
+        return serie
+    if dtype.kind in 'iu':
+        info = np.iinfo(dtype)
+        if len(serie) and (serie.min() < info.min or serie.max() > info.max):
+            return serie
+    return serie.astype(dtype)
+
+
+def aplicar_esquema(df, nombre, reporte=None):
+    """
+    Convierte las columnas de `df` a los tipos compactos de ESQUEMAS[nombre]
+    (las columnas ausentes se ignoran; un valor fuera de rango deja la columna
+    como estaba). Si se pasa `reporte`, guarda ahí la memoria antes y después.
+    """
+    if df is None:
+        return None
+    antes = memoria_mb(df) if reporte is not None else None
+    convertidas = {col: _convertir(df[col], tipo) for col, tipo in ESQUEMAS[nombre].items() if col in df.columns}
+    if convertidas:
+        df = df.assign(**convertidas)
+    if reporte is not None:
+        reporte[nombre] = {'antes_mb': round(float(antes), 3), 'despues_mb': round(float(memoria_mb(df)), 3)}
+    return df
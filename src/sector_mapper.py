@@ -0,0 +1,47 @@
+import json
+import os
+import re
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+RUTA_TAXONOMIA = os.path.join(os.path.dirname(__file__), '..', 'data', 'taxonomia_sectores.json')
+
+
+class SectorMapper:
+    """
+    Taxonomía de sectores económicos compartida por DataManager y NLPRecommender.
+    Cada sector tiene palabras clave (para clasificar carreras/títulos) y
+    sinónimos (para enriquecer el perfil NLP). El orden del archivo define la
+    prioridad: gana el primer sector cuyas palabras clave aparezcan en el texto.
+    """
+
+    def __init__(self, ruta=RUTA_TAXONOMIA):
+        with open(ruta, 'r', encoding='utf-8') as f:
+            taxonomia = json.load(f)
+
+        self.sector_por_defecto = taxonomia['sector_por_defecto']
+        self.sectores = [s['sector'] for s in taxonomia['sectores']]
+        self.sinonimos = {s['sector']: s.get('sinonimos', '') for s in taxonomia['sectores']}
+        # Una alternación compilada por sector: un solo recorrido por columna y sector
+        self._patrones = [
+            re.compile('|'.join(re.escape(p.lower()) for p in s['palabras_clave']))
+            for s in taxonomia['sectores']
+        ]
+
+    def clasificar(self, textos):
+        """Clasifica una columna completa de textos respetando la prioridad de la taxonomía."""
+        textos = pd.Series(textos)
+        texto = textos.astype(str).str.lower()
+        condiciones = [texto.str.contains(p, regex=True).to_numpy(dtype=bool) for p in self._patrones]
+        return pd.Series(np.select(condiciones, self.sectores, default=self.sector_por_defecto),
+                         index=textos.index)
+
+    def sinonimos_de(self, sectores):
+        """Texto de sinónimos para cada sector ('' si el sector no tiene)."""
+        return pd.Series(sectores).astype(str).map(self.sinonimos).fillna('')
+
+
+@lru_cache(maxsize=None)
+def mapper_por_defecto():
+    return SectorMapper()
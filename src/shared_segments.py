@@ -0,0 +1,116 @@
+import glob
+import hashlib
+import os
+import shutil
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+# Directorio de los segmentos; en Linux puede apuntarse a /dev/shm para no tocar disco
+ENV_SEGMENTOS = 'CAREERMATCH_SEGMENTOS'
+
+
+def arrays_csr(matriz, prefijo):
+    """data/indices/indptr/shape de una matriz dispersa CSR."""
+    m = matriz.tocsr()
+    return {f'{prefijo}.data': m.data, f'{prefijo}.indices': m.indices, f'{prefijo}.indptr': m.indptr,
+            f'{prefijo}.shape': np.array(m.shape, dtype=np.int64)}
+
+
+def csr_de(arrays, prefijo):
+    """Matriz CSR sobre los arrays dados (sin copiarlos)."""
+    forma = tuple(int(n) for n in arrays[f'{prefijo}.shape'])
+    return sp.csr_matrix((arrays[f'{prefijo}.data'], arrays[f'{prefijo}.indices'], arrays[f'{prefijo}.indptr']),
+                         shape=forma, copy=False)
+
+
+def arrays_dataframe(df, prefijo='df'):
+    """
+    Columnas de df como arrays planos. Las numéricas van tal cual; las de texto
+    y categóricas, como códigos (las categorías, pequeñas, van en `meta`).
+    """
+    arrays, meta = {}, []
+    for i, col in enumerate(df.columns):
+        serie = df[col]
+        clave = f'{prefijo}.{i}'
+        if isinstance(serie.dtype, np.dtype) and serie.dtype.kind in 'biufM':
+            arrays[clave] = serie.to_numpy()
+            meta.append((col, serie.dtype, None))
+        else:
+            cat = serie.astype('category')
+            arrays[clave] = cat.cat.codes.to_numpy()
+            meta.append((col, serie.dtype, cat.cat.categories.tolist()))
+    return arrays, meta
+
+
+def dataframe_de_arrays(arrays, meta, prefijo='df'):
+    """Inverso de arrays_dataframe: las columnas numéricas apuntan a los arrays compartidos."""
+    columnas = {}
+    for i, (col, dtype, categorias) in enumerate(meta):
+        valores = arrays[f'{prefijo}.{i}']
+        if categorias is None:
+            columnas[col] = valores
+        elif isinstance(dtype, pd.CategoricalDtype):
+            columnas[col] = pd.Categorical.from_codes(valores, dtype=dtype)
+        else:
+            # El texto se materializa por proceso: es pequeño (una fila por carrera)
+            columnas[col] = pd.Series(pd.Categorical.from_codes(valores, categories=categorias)).astype(dtype)
+    return pd.DataFrame(columnas, copy=False)
+
+
+class SegmentStore:
+    """
+    Segmentos de arrays de solo lectura compartidos entre procesos. Cada grupo
+    se escribe una sola vez como archivos .npy en una carpeta con la huella de
+    su contenido; los demás procesos los abren con np.load(mmap_mode='r'): las
+    páginas las comparte el sistema operativo y ningún worker copia los datos,
+    solo reconstruye sus envoltorios (DataFrame, csr_matrix, BosqueCompilado).
+    """
+
+    def __init__(self, directorio=None):
+        self.directorio = directorio or os.environ.get(ENV_SEGMENTOS, 'data/.cache/segmentos')
+
+    @staticmethod
+    def huella(arrays):
+        h = hashlib.sha256()
+        for clave in sorted(arrays):
+            a = np.ascontiguousarray(arrays[clave])
+            h.update(f"{clave}|{a.dtype.str}|{a.shape}".encode())
+            h.update(a.data)
+        return h.hexdigest()
+
+    def publicar(self, nombre, arrays, extra=None):
+        """
+        Escribe los arrays del grupo (si no existen ya con la misma huella) y
+        devuelve el manifiesto: dict pequeño y serializable para `adjuntar`.
+        `extra` viaja en el manifiesto (metadatos y objetos livianos).
+        """
+        carpeta = os.path.join(self.directorio, f"{nombre}-{self.huella(arrays)[:16]}")
+        if not os.path.isdir(carpeta):
+            tmp = f"{carpeta}.{os.getpid()}.tmp"
+            os.makedirs(tmp, exist_ok=True)
+            for clave, valores in arrays.items():
+                np.save(os.path.join(tmp, f"{clave}.npy"), np.ascontiguousarray(valores), allow_pickle=False)
+            try:
+                os.replace(tmp, carpeta)
+            except OSError:
+                # Otro proceso publicó el mismo contenido primero
+                shutil.rmtree(tmp, ignore_errors=True)
+        # Versiones anteriores: en POSIX los procesos que aún las tienen mapeadas no se ven afectados
+        for antigua in glob.glob(os.path.join(self.directorio, f"{nombre}-*")):
+            if antigua != carpeta and not antigua.endswith('.tmp'):
+                shutil.rmtree(antigua, ignore_errors=True)
+        return {'carpeta': carpeta, 'claves': sorted(arrays), 'extra': extra}
+
+    @staticmethod
+    def adjuntar(manifiesto):
+        """Arrays del grupo mapeados en memoria (solo lectura)."""
+        arrays = {}
+        for clave in manifiesto['claves']:
+            ruta = os.path.join(manifiesto['carpeta'], f"{clave}.npy")
+            try:
+                arrays[clave] = np.load(ruta, mmap_mode='r')
+            except ValueError:
+                # Un array vacío no se puede mapear: se lee normal
+                arrays[clave] = np.load(ruta)
+        return arrays
@@ -0,0 +1,187 @@
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, cpu_count
+from src.data_manager import DataManager
+from src.fuzzy_join import normalizar_serie
+from src.instrumentation import instrumentado
+from src.schema import aplicar_esquema
+from src.text_es import plegar_acentos
+
+# Etiquetas de los cortes agregados
+TODAS = 'Todas'        # todas las provincias
+TOTAL = 'Total'        # todo el periodo
+SIN_FECHA = 'Sin fecha'
+NIVEL_INEC = 'Educación Superior Universitaria'
+COLUMNAS_CORTE = ['carrera', 'num_estudiantes', 'num_ofertas', 'salario_oferta', 'sector_economico',
+                  'tasa_empleo_formal', 'salario_promedio_mensual', 'cluster', 'categoria']
+
+
+def trimestre_de(fechas):
+    """Trimestre en el formato del INEC ('2025-Q3') por fecha; SIN_FECHA si no es válida."""
+    fechas = pd.to_datetime(pd.Series(fechas), errors='coerce')
+    texto = fechas.dt.year.astype('Int64').astype(str) + '-Q' + fechas.dt.quarter.astype('Int64').astype(str)
+    return texto.where(fechas.notna(), SIN_FECHA)
+
+
+def _clave(provincia, trimestre):
+    """Clave de búsqueda tolerante: 'pichincha', '2025q3' y 'Pichincha', '2025-Q3' son el mismo corte."""
+    return plegar_acentos(str(provincia)).strip(), str(trimestre).upper().replace('-', '').replace(' ', '')
+
+
+def _construir_lote(tareas, alias, nombres, n_clusters):
+    """df_master + clustering de varios cortes (se ejecuta en un proceso del pool)."""
+    from src.clustering_module import CareerClusterer
+    resultados = []
+    for clave, df_est, stats, df_inec_agg in tareas:
+        df = DataManager.combinar_master(df_est, DataManager.ofertas_por_clave(stats), df_inec_agg, alias, nombres)
+        if len(df) < n_clusters:
+            df = df.assign(cluster=-1, categoria=None)
+        else:
+            df = CareerClusterer(df, n_clusters=n_clusters).ejecutar_clustering()
+        resultados.append((clave, df[COLUMNAS_CORTE]))
+    return resultados
+
+
+class MarketSnapshots:
+    """
+    df_master con etiquetas de clustering para cada corte provincia × trimestre,
+    más los agregados por provincia (TOTAL), por trimestre (TODAS) y nacional.
+
+    Los datos crudos se agrupan una sola vez por (provincia, trimestre, carrera);
+    los agregados salen de sumar esos estadísticos suficientes, no de volver a
+    filtrar. Cada corte es independiente y se reparte en un pool de procesos.
+    Todos los cortes quedan en un único DataFrame compacto y un dict
+    (provincia, trimestre) -> (inicio, fin), así una consulta es una búsqueda
+    en diccionario y un slice.
+    """
+
+    def __init__(self, datos, indice):
+        self.datos = datos
+        self.indice = indice
+        self._claves = {_clave(p, t): (p, t) for p, t in indice}
+
+    @classmethod
+    @instrumentado('snapshots.construir', filas=lambda s: len(s.indice))
+    def construir(cls, dm, n_clusters=4, n_jobs=-1):
+        """Calcula todos los cortes a partir de un DataManager ya procesado (process_and_merge)."""
+        if dm.df_ofertas is None:
+            raise RuntimeError("Los cortes necesitan las ofertas en memoria (no disponible en modo streaming).")
+        alias, nombres = dm.alias_y_nombres()
+
+        ofertas = cls._ofertas_por_corte(dm.df_ofertas)
+        estudiantes = cls._estudiantes_acumulados(dm.df_matricula)
+        inec_nacional, inec_trimestral = cls._inec(dm.df_inec)
+
+        tareas = []
+        for (provincia, trimestre), stats in ofertas.groupby(['provincia', 'trimestre'], sort=True):
+            stats = stats.set_index('carrera_requerida')[['n_titulos', 'n_salarios', 'suma_salario']]
+            anio = int(trimestre[:4]) if trimestre[:4].isdigit() else None
+            inec = inec_trimestral.get(trimestre, inec_nacional)
+            tareas.append(((provincia, trimestre), estudiantes(provincia, anio), stats, inec))
+
+        n = min(len(tareas), cpu_count() if n_jobs in (None, -1) else max(int(n_jobs), 1)) or 1
+        lotes = Parallel(n_jobs=n)(
+            delayed(_construir_lote)(tareas[i::n], alias, nombres, n_clusters) for i in range(n)
+        )
+        resultados = dict(r for lote in lotes for r in lote)
+
+        partes, indice, inicio = [], {}, 0
+        for clave, _, _, _ in tareas:
+            df = resultados[clave]
+            indice[clave] = (inicio, inicio + len(df))
+            inicio += len(df)
+            partes.append(df)
+        datos = aplicar_esquema(pd.concat(partes, ignore_index=True), 'cortes')
+        return cls(datos, indice)
+
+    @staticmethod
+    def _ofertas_por_corte(df_ofertas):
+        """Estadísticos por (provincia, trimestre, carrera) y sus agregados TODAS/TOTAL, en filas planas."""
+        df = pd.DataFrame({
+            'provincia': df_ofertas['provincia'].astype(str).to_numpy(),
+            'trimestre': trimestre_de(df_ofertas['fecha_publicacion']).to_numpy(),
+            'carrera_requerida': df_ofertas['carrera_requerida'].to_numpy(),
+            'titulo_puesto': df_ofertas['titulo_puesto'].to_numpy(),
+            'salario_oferta': ((df_ofertas['salario_minimo'] + df_ofertas['salario_maximo']) / 2).to_numpy(),
+        })
+        # Única pasada sobre las filas crudas
+        fino = DataManager._estadisticas_ofertas(df, por=('provincia', 'trimestre')).reset_index()
+        columnas = ['n_titulos', 'n_salarios', 'suma_salario']
+        por_provincia = fino.groupby(['provincia', 'carrera_requerida'])[columnas].sum().reset_index()
+        por_trimestre = fino.groupby(['trimestre', 'carrera_requerida'])[columnas].sum().reset_index()
+        nacional = fino.groupby('carrera_requerida')[columnas].sum().reset_index()
+        return pd.concat([
+            fino,
+            por_provincia.assign(trimestre=TOTAL),
+            por_trimestre.assign(provincia=TODAS),
+            nacional.assign(provincia=TODAS, trimestre=TOTAL),
+        ], ignore_index=True)
+
+    @staticmethod
+    def _estudiantes_acumulados(df_matricula):
+        """
+        Función (provincia, año) -> estudiantes por carrera matriculados hasta ese
+        año (todas las carreras del país, con 0 donde no hay matrícula).
+        """
+        tabla = (df_matricula.groupby(['provincia', 'año', 'carrera'], observed=True)['num_estudiantes'].sum()
+                 .unstack('carrera', fill_value=0))
+        carreras = tabla.columns.astype(str)
+        base = pd.DataFrame({'carrera': carreras, 'key': normalizar_serie(carreras).to_numpy()})
+        acumulado = {p: g.droplevel('provincia').cumsum() for p, g in tabla.groupby(level='provincia', observed=True)}
+        acumulado[TODAS] = tabla.groupby(level='año').sum().cumsum()
+
+        def estudiantes(provincia, anio=None):
+            filas = acumulado.get(provincia)
+            conteo = np.zeros(len(carreras), dtype=np.int64)
+            if filas is not None:
+                pos = len(filas) - 1 if anio is None else np.searchsorted(filas.index.to_numpy(), anio, side='right') - 1
+                if pos >= 0:
+                    conteo = filas.iloc[pos].to_numpy(dtype=np.int64)
+            return base.assign(num_estudiantes=conteo)
+        return estudiantes
+
+    @staticmethod
+    def _inec(df_inec):
+        """Agregado INEC nacional y por trimestre (los trimestres sin datos usan el nacional)."""
+        if df_inec is None:
+            return None, {}
+        univ = df_inec[df_inec['nivel_educacion'] == NIVEL_INEC]
+        columnas = {'tasa_empleo_formal': 'mean', 'salario_promedio_mensual': 'mean'}
+        nacional = univ.groupby('sector_economico', observed=True).agg(columnas).reset_index()
+        trimestral = {str(t): g.groupby('sector_economico', observed=True).agg(columnas).reset_index()
+                      for t, g in univ.groupby('trimestre', observed=True)}
+        return nacional, trimestral
+
+    # --- Consulta ---
+    def clave(self, provincia=TODAS, trimestre=TOTAL):
+        """(provincia, trimestre) tal como están en el índice, o None si no existe el corte."""
+        return self._claves.get(_clave(provincia, trimestre))
+
+    def obtener(self, provincia=TODAS, trimestre=TOTAL):
+        """df_master etiquetado del corte, o None si no existe."""
+        clave = self.clave(provincia, trimestre)
+        if clave is None:
+            return None
+        inicio, fin = self.indice[clave]
+        return self.datos.iloc[inicio:fin].reset_index(drop=True)
+
+    @property
+    def provincias(self):
+        return sorted({p for p, _ in self.indice}, key=lambda p: (p != TODAS, p))
+
+    @property
+    def trimestres(self):
+        return sorted({t for _, t in self.indice}, key=lambda t: (t != TOTAL, t))
+
+    def trimestres_de(self, provincia=TODAS):
+        """Trimestres con corte para la provincia (los que tienen ofertas allí)."""
+        clave = _clave(provincia, TOTAL)[0]
+        return sorted({t for (p, t) in self.indice if _clave(p, t)[0] == clave}, key=lambda t: (t != TOTAL, t))
+
+    def exportar_estado(self):
+        """Estado para el ModelStore."""
+        return {'datos': self.datos, 'indice': self.indice}
+
+    @classmethod
+    def desde_estado(cls, estado):
+        return cls(estado['datos'], dict(estado['indice']))
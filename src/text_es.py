@@ -0,0 +1,72 @@
+import re
+from functools import lru_cache
+
+# Tabla precalculada de plegado de acentos (la ñ se conserva: "año" != "ano")
+TABLA_ACENTOS = str.maketrans('áéíóúàèìòùäëïöüâêîôû', 'aeiouaeiouaeiouaeiou')
+
+# Palabras vacías del español (ya sin acentos)
+STOP_WORDS_ES = frozenset("""
+a al algo algunas algunos ante antes como con contra cual cuales cuando de del desde donde
+durante e el ella ellas ellos en entre era eran es esa esas ese eso esos esta estaba estan
+estar estas este esto estos fue fueron ha hay han hasta la las le les lo los mas me mi mis
+mucho muy nada ni no nos nosotros o otra otras otro otros para pero poco por porque que
+quien quienes se sea ser si sin sino sobre su sus tambien tan te tiene tienen todo todos tu
+tus u un una unas uno unos y ya yo quiero quisiera gusta gustaria
+""".split())
+
+_TOKEN = re.compile(r'(?u)\b\w\w+\b')
+# Consonantes tras las que el plural es "-es" (profesor-es, ciudad-es, cancion-es)
+_PLURAL_ES = frozenset('lrndjy')
+
+
+def plegar_acentos(texto):
+    """Minúsculas y sin tildes/diéresis usando la tabla precalculada."""
+    return texto.lower().translate(TABLA_ACENTOS)
+
+
+@lru_cache(maxsize=200_000)
+def stem_ligero(token):
+    """Stemming ligero de plurales: luces->luz, ciudades->ciudad, pacientes->paciente."""
+    n = len(token)
+    if n > 4 and token.endswith('ces'):
+        return token[:-3] + 'z'
+    if n > 4 and token.endswith('es') and token[-3] in _PLURAL_ES:
+        return token[:-2]
+    if n > 3 and token.endswith('s') and not token.endswith('ss'):
+        return token[:-1]
+    return token
+
+
+class AnalizadorEspanol:
+    """
+    Analizador para TfidfVectorizer(analyzer=...): plegado de acentos,
+    stop words en español, stemming ligero opcional y n-gramas de caracteres
+    opcionales. Es una clase (y no una función anidada) para poder serializarse
+    con el ModelStore.
+    """
+
+    def __init__(self, stemming=True, ngramas_char=None):
+        self.stemming = stemming
+        self.ngramas_char = tuple(ngramas_char) if ngramas_char else None
+
+    def __repr__(self):
+        # Representación estable: forma parte de la huella del ModelStore
+        return f"AnalizadorEspanol(stemming={self.stemming}, ngramas_char={self.ngramas_char})"
+
+    def tokens(self, texto):
+        palabras = _TOKEN.findall(plegar_acentos(texto))
+        if self.stemming:
+            return [stem_ligero(t) for t in palabras if t not in STOP_WORDS_ES]
+        return [t for t in palabras if t not in STOP_WORDS_ES]
+
+    def __call__(self, texto):
+        palabras = self.tokens(texto)
+        if not self.ngramas_char:
+            return palabras
+        minimo, maximo = self.ngramas_char
+        ngramas = []
+        for palabra in palabras:
+            w = f" {palabra} "
+            for n in range(minimo, maximo + 1):
+                ngramas.extend(w[i:i + n] for i in range(len(w) - n + 1))
+        return palabras + ngramas
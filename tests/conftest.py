@@ -0,0 +1,56 @@
+import os
+import shutil
+import sys
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from benchmarks.bench_pipeline import generar_datos
+from src.pipeline import ARCHIVOS
+
+
+@pytest.fixture(scope='session')
+def csv_sinteticos(tmp_path_factory):
+    """Los tres CSV sintéticos (mismo esquema que los reales), generados una vez por sesión."""
+    directorio = tmp_path_factory.mktemp('csv')
+    generar_datos(str(directorio), n_ofertas=3000, n_carreras=24, seed=7)
+    return directorio
+
+
+@pytest.fixture
+def data_dir(csv_sinteticos, tmp_path, monkeypatch):
+    """
+    Copia de los CSV en un directorio propio del test. El cwd también se mueve
+    ahí: la caché columnar y el ModelStore (data/.cache) no tocan el repositorio.
+    """
+    directorio = tmp_path / 'data'
+    directorio.mkdir()
+    for archivo in ARCHIVOS:
+        shutil.copy(csv_sinteticos / archivo, directorio / archivo)
+    monkeypatch.chdir(tmp_path)
+    return str(directorio) + os.sep
+
+
+@pytest.fixture
+def dm_cargado(data_dir):
+    """DataManager con los CSV cargados y df_master construido."""
+    from src.data_manager import DataManager
+    dm = DataManager()
+    assert dm.load_data(*ARCHIVOS, path=data_dir)
+    dm.process_and_merge()
+    return dm
+
+
+@pytest.fixture
+def df_labeled(dm_cargado):
+    """df_master etiquetado por el clustering (sin warm start)."""
+    from src.clustering_module import CareerClusterer
+    return CareerClusterer(dm_cargado.process_and_merge()).ejecutar_clustering()
+
+
+@pytest.fixture
+def nlp(df_labeled):
+    """Recomendador NLP (motor exacto) sobre df_labeled."""
+    from src.nlp_module import NLPRecommender
+    return NLPRecommender(df_labeled)
@@ -0,0 +1,86 @@
+import asyncio
+import json
+import pytest
+import api_server
+from api_server import APIServer
+from src.refresh import CoordinadorRefresco
+
+
+@pytest.fixture
+def servidor(data_dir, monkeypatch):
+    monkeypatch.setattr(api_server, '_SISTEMA', {})
+    srv = APIServer(workers=2, modo='hilos', path=data_dir)
+    srv.coordinador = CoordinadorRefresco(data_dir, intervalo=0, al_cambiar=srv._al_cambiar)
+    srv.listo = True
+    yield srv
+    srv.pool.shutdown(wait=True)
+
+
+def despachar(srv, metodo, ruta, **params):
+    return asyncio.run(srv._despachar(metodo, ruta, {k: [str(v)] for k, v in params.items()}))
+
+
+def test_salud_y_carga_bajo_demanda(servidor):
+    codigo, cuerpo = despachar(servidor, 'GET', '/salud')
+    assert codigo == 200 and cuerpo['estado'] == 'ok'
+    assert cuerpo['motores']['cargados'] == []
+
+    codigo, cuerpo = despachar(servidor, 'GET', '/predecir', est=5000, ofe=50, sal=800, tasa=50)
+    assert codigo == 200 and cuerpo['categoria'] in cuerpo['probabilidades']
+    # Solo se cargó el motor que pidió el endpoint
+    assert despachar(servidor, 'GET', '/salud')[1]['motores']['cargados'] == ['predictor']
+
+
+def test_recomendar_y_carreras(servidor):
+    codigo, cuerpo = despachar(servidor, 'GET', '/recomendar', q='ingenieria sistemas')
+    assert codigo == 200
+    assert all({'carrera', 'Afinidad'} <= set(r) for r in cuerpo['resultados'])
+
+    codigo, todas = despachar(servidor, 'GET', '/carreras')
+    categoria = todas['carreras'][0]['categoria']
+    _, filtradas = despachar(servidor, 'GET', '/carreras', categoria=categoria)
+    assert filtradas['carreras'] == [c for c in todas['carreras'] if c['categoria'] == categoria]
+
+
+@pytest.mark.parametrize('metodo, ruta, params, codigo', [
+    ('GET', '/recomendar', {}, 400),
+    ('GET', '/recomendar', {'q': 'salud', 'fuente': 'otra'}, 400),
+    ('GET', '/predecir', {'est': 'x', 'ofe': 1, 'sal': 1, 'tasa': 1}, 400),
+    ('GET', '/no-existe', {}, 404),
+    ('POST', '/salud', {}, 405),
+    ('GET', '/refrescar', {}, 405),
+])
+def test_errores(servidor, metodo, ruta, params, codigo):
+    assert despachar(servidor, metodo, ruta, **params)[0] == codigo
+
+
+def test_cargando_responde_503(servidor):
+    servidor.listo = False
+    assert despachar(servidor, 'GET', '/salud') == (200, {'estado': 'cargando'})
+    assert despachar(servidor, 'GET', '/carreras')[0] == 503
+
+
+def test_http_keep_alive(servidor):
+    async def cliente():
+        srv = await asyncio.start_server(servidor._atender, '127.0.0.1', 0)
+        puerto = srv.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', puerto)
+        respuestas = []
+        # Dos peticiones por la misma conexión; la segunda la cierra
+        for conexion in ('keep-alive', 'close'):
+            writer.write(f"GET /predecir?est=600&ofe=60&sal=1400&tasa=70 HTTP/1.1\r\n"
+                         f"Host: x\r\nConnection: {conexion}\r\n\r\n".encode())
+            await writer.drain()
+            cabecera = (await reader.readuntil(b'\r\n\r\n')).decode()
+            largo = int(cabecera.split('Content-Length: ')[1].split('\r\n')[0])
+            respuestas.append((cabecera, json.loads(await reader.readexactly(largo))))
+        assert await reader.read() == b''
+        writer.close()
+        srv.close()
+        await srv.wait_closed()
+        return respuestas
+
+    (cab1, r1), (cab2, r2) = asyncio.run(cliente())
+    assert cab1.startswith('HTTP/1.1 200') and 'Connection: keep-alive' in cab1
+    assert 'Connection: close' in cab2
+    assert r1 == r2
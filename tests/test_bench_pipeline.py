@@ -0,0 +1,43 @@
+import filecmp
+import pytest
+from benchmarks.bench_pipeline import comparar, ejecutar_escala, generar_datos
+from src.pipeline import ARCHIVOS
+
+
+def _informe(**etapas):
+    return {'resultados': [{'ofertas': 1000, 'carreras': 100,
+                            'etapas': {e: {'segundos': s, 'rss_pico_mb': m} for e, (s, m) in etapas.items()}}]}
+
+
+def test_comparar_marca_solo_regresiones_reales():
+    base = _informe(carga=(1.0, 100.0), nlp=(0.01, 100.0), cluster=(2.0, 100.0))
+    actual = _informe(carga=(1.3, 100.0),    # +30% y +0.3 s: regresión
+                      nlp=(0.03, 100.0),     # +200% pero solo +0.02 s: ruido
+                      cluster=(2.1, 130.0))  # tiempo dentro de la tolerancia, RSS +30%
+    regresiones = comparar(actual['resultados'], base, tolerancia=0.2, umbral_segundos=0.05)
+    assert sorted((r[2], r[3]) for r in regresiones) == [('carga', 'segundos'), ('cluster', 'rss_pico_mb')]
+
+
+def test_comparar_ignora_escalas_y_etapas_nuevas():
+    base = _informe(carga=(1.0, 100.0))
+    actual = _informe(carga=(1.0, 100.0), nueva=(50.0, 900.0))
+    actual['resultados'].append({'ofertas': 5, 'carreras': 5, 'etapas': {'carga': {'segundos': 99, 'rss_pico_mb': 9}}})
+    assert comparar(actual['resultados'], base, 0.2, 0.05) == []
+
+
+def test_generar_datos_reproducible(tmp_path):
+    a, b = tmp_path / 'a', tmp_path / 'b'
+    a.mkdir(), b.mkdir()
+    generar_datos(str(a), n_ofertas=500, n_carreras=10, seed=1)
+    generar_datos(str(b), n_ofertas=500, n_carreras=10, seed=1)
+    for archivo in ARCHIVOS:
+        assert filecmp.cmp(a / archivo, b / archivo, shallow=False)
+
+
+@pytest.mark.parametrize('usar_cache', [False, True])
+def test_ejecutar_escala_mide_todas_las_etapas(usar_cache):
+    r = ejecutar_escala(n_ofertas=500, n_carreras=12, n_consultas=5, usar_cache=usar_cache, seed=3)
+    assert r['filas_master'] > 0
+    assert set(r['etapas']) == {'inicio', 'load_data', 'process_and_merge', 'ejecutar_clustering', 'nlp_entrenar',
+                                'nlp_recomendar', 'predictor_entrenar', 'predictor_predecir'}
+    assert all(m['segundos'] >= 0 and m['rss_pico_mb'] > 0 for e, m in r['etapas'].items() if e != 'inicio')
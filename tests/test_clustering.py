@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.cluster import MiniBatchKMeans
+from src.clustering_module import CareerClusterer
+from src.model_store import ModelStore
+from src.pipeline import cargar_clustering
+
+
+@pytest.fixture
+def df_master(dm_cargado):
+    return dm_cargado.process_and_merge()
+
+
+def _otros_datos(df, seed=0):
+    """Mismas carreras con otras cifras: un artefacto que no corresponde a estos datos."""
+    rng = np.random.default_rng(seed)
+    otro = df.copy()
+    for col in ['num_estudiantes', 'num_ofertas', 'salario_oferta', 'tasa_empleo_formal']:
+        otro[col] = rng.permutation(otro[col].to_numpy())
+    return otro
+
+
+def test_artefacto_ajeno_no_cambia_las_etiquetas(df_master, tmp_path):
+    sin_cache = CareerClusterer(df_master).ejecutar_clustering()['categoria'].copy()
+
+    store = ModelStore(str(tmp_path / 'modelos'))
+    for seed in range(3):
+        ajeno = CareerClusterer(_otros_datos(df_master, seed))
+        ajeno.ejecutar_clustering()
+        store.guardar('clustering', ModelStore.huella({'ajeno': seed}), ajeno.exportar_estado())
+        con_cache = cargar_clustering(df_master, store=store)['categoria']
+        assert (con_cache.to_numpy() == sin_cache.to_numpy()).all()
+        # cargar_clustering guardó su propio artefacto: se vuelve a poner uno ajeno
+        for archivo in (tmp_path / 'modelos').iterdir():
+            archivo.unlink()
+
+
+def test_warm_start_con_cambio_pequeno(df_master):
+    anterior = CareerClusterer(df_master.iloc[:-1])
+    anterior.ejecutar_clustering()
+
+    nuevo = CareerClusterer(df_master)
+    etiquetas = nuevo.ejecutar_clustering(previo=anterior.exportar_estado())['categoria']
+    assert nuevo.kmeans.n_init == 1
+    completo = CareerClusterer(df_master).ejecutar_clustering()['categoria']
+    assert (etiquetas.to_numpy() == completo.to_numpy()).mean() >= 0.95
+
+
+def test_warm_start_descartado_con_muchas_filas_nuevas(df_master):
+    anterior = CareerClusterer(df_master.iloc[:len(df_master) // 2])
+    anterior.ejecutar_clustering()
+
+    nuevo = CareerClusterer(df_master)
+    nuevo.ejecutar_clustering(previo=anterior.exportar_estado())
+    assert nuevo.kmeans.n_init == nuevo.params['n_init']
+
+
+def test_estado_sin_huellas_no_hace_warm_start(df_master):
+    anterior = CareerClusterer(df_master)
+    anterior.ejecutar_clustering()
+    estado = {k: v for k, v in anterior.exportar_estado().items() if k != 'huellas_filas'}
+
+    nuevo = CareerClusterer(df_master)
+    nuevo.ejecutar_clustering(previo=estado)
+    assert nuevo.kmeans.n_init == nuevo.params['n_init']
+
+
+def test_barrido_k_paralelo_igual_al_secuencial(df_master):
+    clusterer = CareerClusterer(df_master, n_init=3)
+    secuencial = clusterer.barrido_k(range(2, 7), n_jobs=1)
+    paralelo = clusterer.barrido_k(range(2, 7), n_jobs=2)
+    assert secuencial['k'].tolist() == [2, 3, 4, 5, 6]
+    assert secuencial['silueta'].between(-1, 1).all()
+    pd.testing.assert_frame_equal(paralelo, secuencial)
+
+
+def test_modo_minibatch_etiqueta_todas_las_filas(df_master):
+    clusterer = CareerClusterer(df_master, modo='minibatch')
+    df = clusterer.ejecutar_clustering()
+    assert isinstance(clusterer.kmeans, MiniBatchKMeans)
+    assert len(df) == len(df_master)
+    assert set(df['cluster']) <= set(range(4))
+    assert df['categoria'].notna().all()
+    assert set(df['categoria']) <= {'En Demanda', 'Saturadas', 'Nicho', 'Balanceada'}
+    assert set(clusterer.mapa_labels) == set(df['cluster'])
@@ -0,0 +1,67 @@
+import os
+import pandas as pd
+import pytest
+from src.data_cache import ColumnarCache
+from src.data_manager import DataManager
+from src.pipeline import ARCHIVOS
+
+pytestmark = pytest.mark.skipif(not ColumnarCache.disponible(), reason="pyarrow no instalado")
+
+
+def _cargar(data_dir, use_cache):
+    dm = DataManager(use_cache=use_cache)
+    assert dm.load_data(*ARCHIVOS, path=data_dir)
+    return dm
+
+
+def test_carga_cacheada_igual_a_sin_cache(data_dir):
+    sin_cache = _cargar(data_dir, use_cache=False)
+    primera = _cargar(data_dir, use_cache=True)
+    segunda = _cargar(data_dir, use_cache=True)
+    assert primera.cache.misses == 3 and segunda.cache.hits == 3
+    for tabla in ('df_matricula', 'df_ofertas', 'df_inec'):
+        pd.testing.assert_frame_equal(getattr(segunda, tabla), getattr(sin_cache, tabla), check_categorical=False)
+    pd.testing.assert_frame_equal(segunda.process_and_merge(), sin_cache.process_and_merge())
+
+
+def test_cambio_en_el_csv_invalida_la_cache(data_dir):
+    _cargar(data_dir, use_cache=True)
+    ruta = os.path.join(data_dir, ARCHIVOS[0])
+    df = pd.read_csv(ruta)
+    df.loc[0, 'num_estudiantes'] += 1
+    df.to_csv(ruta, index=False)
+
+    dm = _cargar(data_dir, use_cache=True)
+    assert dm.cache.misses == 1 and dm.cache.hits == 2
+    assert dm.df_matricula['num_estudiantes'].iloc[0] == df['num_estudiantes'].iloc[0]
+
+
+def test_touch_sin_cambios_sigue_usando_la_cache(data_dir):
+    _cargar(data_dir, use_cache=True)
+    os.utime(os.path.join(data_dir, ARCHIVOS[1]))
+    assert _cargar(data_dir, use_cache=True).cache.hits == 3
+
+
+@pytest.mark.parametrize('contenido', ['{"version": 1, "si', '', '[]'])
+def test_meta_corrupta_reconstruye_la_cache(data_dir, contenido):
+    _cargar(data_dir, use_cache=True)
+    cache = ColumnarCache(os.path.join(data_dir, '.cache'))
+    _, ruta_meta = cache._rutas(os.path.join(data_dir, ARCHIVOS[0]))
+    with open(ruta_meta, 'w', encoding='utf-8') as f:
+        f.write(contenido)
+
+    dm = _cargar(data_dir, use_cache=True)
+    assert dm.cache.misses == 1 and dm.cache.hits == 2
+    assert _cargar(data_dir, use_cache=True).cache.hits == 3
+
+
+def test_csv_homonimos_no_comparten_entrada(tmp_path):
+    cache = ColumnarCache(str(tmp_path / 'cache'))
+    for i, carpeta in enumerate(['a', 'b']):
+        (tmp_path / carpeta).mkdir()
+        pd.DataFrame({'x': [i] * (i + 1)}).to_csv(tmp_path / carpeta / 'datos.csv', index=False)
+    assert cache._rutas(str(tmp_path / 'a' / 'datos.csv')) != cache._rutas(str(tmp_path / 'b' / 'datos.csv'))
+    for _ in range(2):
+        assert cache.read_csv(str(tmp_path / 'a' / 'datos.csv'))['x'].tolist() == [0]
+        assert cache.read_csv(str(tmp_path / 'b' / 'datos.csv'))['x'].tolist() == [1, 1]
+    assert cache.misses == 2 and cache.hits == 2
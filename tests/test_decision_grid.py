@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from src.decision_grid import ESCALA, DecisionGrid
+from src.model_store import ModelStore
+from src.pipeline import cargar_simulador
+from src.prediction_module import CareerPredictor
+
+# Ejes más gruesos que los del simulador: la construcción tarda poco
+EJES = {'num_estudiantes': (0, 20000, 2000), 'num_ofertas': (0, 1000, 50),
+        'salario_oferta': (400, 5000, 200), 'tasa_empleo_formal': (0, 100, 5)}
+
+
+@pytest.fixture(scope='module')
+def predictor():
+    predictor = CareerPredictor()
+    predictor.params_datos = {'n': 300, 'seed': 42}
+    predictor.params['n_estimators'] = 30
+    predictor.entrenar_modelo()
+    predictor.compilar()
+    return predictor
+
+
+@pytest.fixture(scope='module')
+def grilla(predictor):
+    return DecisionGrid(predictor, EJES, tam_lote=5000).construir()
+
+
+def test_verificar_paridad_con_el_modelo(grilla):
+    resultado = grilla.verificar(n=3000)
+    for nombre in ('grilla', 'continuos'):
+        assert resultado[nombre]['acuerdo_clase'] == 1.0
+        assert resultado[nombre]['error_max_prob'] <= 1 / (2 * ESCALA) + 1e-12
+    assert resultado['grilla']['desde_grilla'] == 1.0
+
+
+def test_fuera_de_los_ejes_igual_al_modelo(grilla, predictor):
+    # Fuera de los rangos del simulador: o el intervalo ya está en la grilla o se consulta al modelo
+    X = np.array([[50_000, 5_000, 20_000, 100], [-10, -1, 0, -5], [5000, 50, 800, 50], [7777, 333, 1234.5, 61.3]])
+    etiquetas, probs = grilla.predecir_batch(X)
+    directas, probs_directas = predictor.predecir_batch(X, compilado=False)
+    np.testing.assert_array_equal(etiquetas, directas)
+    np.testing.assert_allclose(probs, probs_directas, atol=1 / (2 * ESCALA) + 1e-12)
+    for fila in X.tolist():
+        etiqueta, dist = grilla.predecir(*fila)
+        assert etiqueta == predictor.predecir(*fila)[0]
+        assert max(abs(dist[c] - p) for c, p in predictor.predecir(*fila)[1].items()) <= 1 / (2 * ESCALA) + 1e-12
+
+
+def test_sensibilidad_recorre_el_eje(grilla):
+    curva = grilla.sensibilidad(5000, 50, 800, 50, 'salario_oferta')
+    assert list(curva.index) == list(grilla.valores[2])
+    np.testing.assert_allclose(curva.sum(axis=1), 1.0, atol=len(grilla.classes_) / (2 * ESCALA))
+
+
+def test_model_store_restaura_la_misma_grilla(predictor, tmp_path):
+    store = ModelStore(str(tmp_path))
+    construida = cargar_simulador(predictor, store=store, ejes=EJES)
+    restaurada = cargar_simulador(predictor, store=store, ejes=EJES)
+    np.testing.assert_array_equal(restaurada.probs, construida.probs)
+    np.testing.assert_array_equal(restaurada.clase, construida.clase)
+    X = np.column_stack([np.random.default_rng(1).uniform(lo, hi, 500) for lo, hi, _ in EJES.values()])
+    np.testing.assert_array_equal(restaurada.predecir_batch(X)[1], construida.predecir_batch(X)[1])
+
+
+def test_intervalo_sin_punto_de_grilla_usa_el_modelo(grilla, predictor):
+    f = 2
+    umbrales = grilla.umbrales[f]
+    sin_celda = np.flatnonzero(grilla.mapa[f][1:len(umbrales)] < 0) + 1
+    assert sin_celda.size, "con pasos de 200 algún intervalo de salario queda entre dos puntos de la grilla"
+    X = np.tile([5000.0, 50.0, 0.0, 50.0], (sin_celda.size, 1))
+    X[:, f] = (umbrales[sin_celda - 1] + umbrales[sin_celda]) / 2
+    _, probs = grilla.predecir_batch(X)
+    np.testing.assert_array_equal(probs, predictor.predecir_batch(X)[1])
+
+
+def test_predictor_solo_bosque_da_la_misma_grilla(grilla, predictor):
+    # Worker sobre segmentos compartidos: sin rf_model, umbrales y predicciones salen del bosque
+    liviano = CareerPredictor.desde_bosque(predictor.bosque)
+    otra = DecisionGrid(liviano, EJES, tam_lote=5000).construir()
+    for a, b in zip(otra.umbrales, grilla.umbrales):
+        np.testing.assert_array_equal(a, b)
+    np.testing.assert_array_equal(otra.clase, grilla.clase)
+    np.testing.assert_array_equal(otra.probs, grilla.probs)
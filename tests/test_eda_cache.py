@@ -0,0 +1,55 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src import eda_module
+from src.eda_module import EDAModule
+
+GRAFICOS = ['plot_top_carreras_matricula', 'plot_tendencia_temporal', 'plot_brecha_talento',
+            'plot_distribucion_salarios']
+
+
+@pytest.fixture
+def eda(dm_cargado, monkeypatch):
+    monkeypatch.setattr(eda_module, '_CACHE', type(eda_module._CACHE)())
+    return EDAModule(dm_cargado.df_matricula, dm_cargado.df_ofertas, dm_cargado.df_inec)
+
+
+@pytest.mark.parametrize('grafico', GRAFICOS)
+def test_figura_cacheada_igual_a_sin_cache(eda, grafico):
+    sin_cache = getattr(EDAModule, grafico).__wrapped__(eda)
+    primera = getattr(eda, grafico)()
+    segunda = getattr(eda, grafico)()
+    assert primera.to_json() == sin_cache.to_json()
+    # El acierto devuelve la misma figura, sin reconstruirla
+    assert segunda is primera
+    assert eda.misses >= 1 and eda.hits >= 1
+
+
+def test_cache_compartida_entre_instancias_y_por_version(eda, dm_cargado):
+    fig = eda.plot_brecha_talento()
+    otra = EDAModule(dm_cargado.df_matricula, dm_cargado.df_ofertas, dm_cargado.df_inec)
+    assert otra.plot_brecha_talento() is fig and otra.hits == 1
+
+    # Otros datos: otra huella, la figura se vuelve a construir
+    cambiada = EDAModule(dm_cargado.df_matricula.iloc[:-10], dm_cargado.df_ofertas, dm_cargado.df_inec)
+    assert cambiada.plot_brecha_talento() is not fig and cambiada.misses >= 1
+
+
+def test_argumentos_distintos_no_comparten_figura(eda):
+    assert eda.plot_distribucion_salarios(nbins=10) is not eda.plot_distribucion_salarios(nbins=30)
+    assert eda.plot_distribucion_salarios(nbins=10) is eda.plot_distribucion_salarios(nbins=10)
+
+
+def test_sesiones_concurrentes_reciben_la_misma_figura(eda, dm_cargado):
+    n = 8
+    barrera = threading.Barrier(n)
+    sesiones = [EDAModule(dm_cargado.df_matricula, dm_cargado.df_ofertas, dm_cargado.df_inec) for _ in range(n)]
+
+    def dibujar(sesion):
+        barrera.wait()
+        return sesion.plot_distribucion_salarios()
+
+    with ThreadPoolExecutor(n) as pool:
+        figuras = list(pool.map(dibujar, sesiones))
+    assert all(f is figuras[0] for f in figuras)
+    assert figuras[0] is eda.plot_distribucion_salarios()
@@ -0,0 +1,103 @@
+import json
+import os
+import subprocess
+import sys
+import pandas as pd
+import pytest
+from src.fuzzy_join import ResolutorCarreras, normalizar_carrera, normalizar_serie
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DESTINOS = [normalizar_carrera(c) for c in [
+    'Ingeniería Civil', 'Ingeniería Comercial', 'Medicina', 'Medicina Veterinaria', 'Educación Inicial',
+    'Educación Básica', 'Ingeniería en Sistemas', 'Administración de Empresas', 'Derecho', 'Enfermería',
+    'Economía', 'Ingeniería Eléctrica', 'Ingeniería Electrónica']]
+
+# Carreras parecidas pero distintas: unirlas mezclaría ofertas de otra carrera
+DISTINTAS = ['Medicina Veterinaria y Zootecnia', 'Veterinaria', 'Educación Especial', 'Economía Agrícola',
+             'Ingeniería Electromecánica', 'Enfermería y Obstetricia', 'Ingeniería en Sistemas Computacionales',
+             'Ingeniería Electrónica y Telecomunicaciones', 'Odontología']
+
+
+@pytest.mark.parametrize('variante, canonica', [
+    ('Ing. Civil', 'Ingeniería Civil'), ('ING CIVIL', 'ingenieria civil'),
+    ('Lic. en Enfermería', 'Licenciatura en Enfermeria'), ('Adm. de Empresas', 'Administración de Empresas'),
+    ('Ingeniería  en Sistemas.', 'Ingenieria en Sistemas'),
+])
+def test_normalizacion_canonica(variante, canonica):
+    assert normalizar_carrera(variante) == normalizar_carrera(canonica)
+
+
+def test_normalizar_serie_igual_a_uno_por_uno():
+    nombres = ['Ing. Civil', 'Medicina', 'Ing. Civil', 'Economía']
+    assert normalizar_serie(nombres).tolist() == [normalizar_carrera(n) for n in nombres]
+
+
+def test_une_variantes_y_no_genera_falsos_positivos():
+    origenes = [normalizar_carrera(c) for c in DISTINTAS] + ['administracion empresas', 'derecho']
+    alias = ResolutorCarreras().resolver(origenes, DESTINOS)
+    assert alias['administracion empresas'] == 'administracion de empresas'
+    assert alias['derecho'] == 'derecho'
+    for carrera in DISTINTAS:
+        clave = normalizar_carrera(carrera)
+        assert alias[clave] == clave, carrera
+
+
+def test_por_lotes_igual_que_de_una_vez():
+    origenes = [normalizar_carrera(c) for c in DISTINTAS] + ['administracion empresas', 'ingenieria eletronica']
+    de_una_vez = ResolutorCarreras(umbral=0.6).resolver(origenes, DESTINOS)
+    assert ResolutorCarreras(umbral=0.6, tam_lote=1).resolver(origenes, DESTINOS) == de_una_vez
+
+
+def test_tabla_de_alias_persistida(tmp_path, monkeypatch):
+    ruta = str(tmp_path / 'alias.json')
+    primera = ResolutorCarreras(ruta).resolver(['administracion empresas'], DESTINOS)
+    assert json.load(open(ruta, encoding='utf-8'))['alias'] == primera
+
+    # Con los mismos destinos la segunda resolución es solo una búsqueda en el diccionario
+    segunda = ResolutorCarreras(ruta)
+    monkeypatch.setattr(segunda, '_puntuar', lambda *a: pytest.fail('no debía volver a puntuar'))
+    assert segunda.resolver(['administracion empresas'], DESTINOS) == primera
+
+    # Si cambia el catálogo de destino la tabla anterior se descarta
+    otra = ResolutorCarreras(ruta)
+    assert otra.resolver(['administracion empresas'], ['derecho']) == {'administracion empresas': 'administracion empresas'}
+
+
+def _master(data_dir):
+    from src.data_manager import DataManager
+    from src.pipeline import ARCHIVOS
+    dm = DataManager()
+    assert dm.load_data(*ARCHIVOS, path=data_dir)
+    return dm.process_and_merge().set_index('carrera')['num_ofertas']
+
+
+def test_merge_no_mezcla_carreras_parecidas(data_dir):
+    ofertas = pd.read_csv(data_dir + 'encuentra_empleo_ofertas_2.csv')
+    esperado = ofertas['carrera_requerida'].value_counts()
+    num_ofertas = _master(data_dir)
+    # "Medicina" y "Medicina 14", "Turismo" y "Turismo 21", ... cada una con sus propias ofertas
+    for carrera, n in num_ofertas.items():
+        assert n == esperado.get(carrera, 0), carrera
+
+
+def test_merge_une_grafias_distintas(data_dir):
+    ruta = data_dir + 'encuentra_empleo_ofertas_2.csv'
+    antes = _master(data_dir)
+    ofertas = pd.read_csv(ruta)
+    civil = ofertas.index[ofertas['carrera_requerida'] == 'Ingeniería Civil']
+    ofertas.loc[civil[::2], 'carrera_requerida'] = 'Ing. Civil'
+    ofertas.loc[civil[1::2], 'carrera_requerida'] = 'INGENIERIA CIVIL'
+    ofertas.to_csv(ruta, index=False)
+    despues = _master(data_dir)
+    # Se muestra la grafía de las ofertas con más ofertas; el conteo es el de todas las grafías juntas
+    assert despues.index[normalizar_serie(despues.index) == 'ingenieria civil'].tolist() == ['INGENIERIA CIVIL']
+    por_clave = lambda s: s.set_axis(normalizar_serie(s.index).to_numpy()).sort_index()
+    pd.testing.assert_series_equal(por_clave(despues), por_clave(antes))
+
+
+def test_importar_data_manager_no_carga_sklearn():
+    # La página de inicio importa src.data_manager: sklearn/scipy solo se cargan al resolver alias
+    codigo = "import sys, src.data_manager; print(sorted(m for m in ('sklearn', 'scipy') if m in sys.modules))"
+    salida = subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ, capture_output=True, text=True, check=True)
+    assert salida.stdout.strip() == '[]'
@@ -0,0 +1,63 @@
+import os
+import pandas as pd
+import pytest
+from benchmarks.bench_pipeline import generar_datos
+from src.data_manager import DataManager
+from src.pipeline import ARCHIVOS
+
+
+@pytest.fixture
+def ofertas_extra(tmp_path, dm_cargado):
+    """2000 ofertas nuevas: la mitad con la misma fecha del watermark, la otra mitad posteriores."""
+    generar_datos(str(tmp_path), n_ofertas=2000, n_carreras=24, seed=99)
+    extra = pd.read_csv(tmp_path / ARCHIVOS[1])
+    watermark = dm_cargado.watermark_fecha
+    extra['fecha_publicacion'] = [
+        (watermark if i % 2 == 0 else watermark + pd.Timedelta(days=1)).strftime('%Y-%m-%d') for i in range(len(extra))
+    ]
+    return extra
+
+
+def _recalculo_completo(data_dir):
+    dm = DataManager(use_cache=False)
+    assert dm.load_data(*ARCHIVOS, path=data_dir)
+    return dm.process_and_merge()
+
+
+def _agregar_al_csv(data_dir, extra):
+    ruta = os.path.join(data_dir, ARCHIVOS[1])
+    extra.to_csv(ruta, mode='a', header=False, index=False)
+    return pd.read_csv(ruta)
+
+
+@pytest.mark.parametrize('por', ['filas', 'fecha'])
+def test_incremental_igual_a_recalculo_completo(dm_cargado, data_dir, ofertas_extra, por):
+    csv = _agregar_al_csv(data_dir, ofertas_extra)
+    nuevas = dm_cargado.ofertas_nuevas(csv, por=por)
+    assert len(nuevas) == len(ofertas_extra)
+
+    incremental = dm_cargado.agregar_ofertas(nuevas)
+    pd.testing.assert_frame_equal(incremental, _recalculo_completo(data_dir))
+    # Lo ya incorporado no vuelve a aparecer
+    assert dm_cargado.ofertas_nuevas(csv, por=por).empty
+
+
+def test_fecha_conserva_repetidas_legitimas_del_dia_del_watermark(dm_cargado, data_dir):
+    csv = pd.read_csv(os.path.join(data_dir, ARCHIVOS[1]))
+    fechas = pd.to_datetime(csv['fecha_publicacion'])
+    ultima = csv[fechas == dm_cargado.watermark_fecha].iloc[[0]]
+    # La misma oferta publicada otra vez el mismo día cuenta como una fila más
+    csv = _agregar_al_csv(data_dir, ultima)
+    assert len(dm_cargado.ofertas_nuevas(csv, por='fecha')) == 1
+
+
+def test_incremental_en_streaming(data_dir, ofertas_extra):
+    dm = DataManager(use_cache=False)
+    assert dm.load_data_streaming(*ARCHIVOS, path=data_dir, chunksize=700)
+    dm.process_and_merge()
+    csv = _agregar_al_csv(data_dir, ofertas_extra)
+    incremental = dm.agregar_ofertas(dm.ofertas_nuevas(csv, por='fecha'))
+
+    completo = DataManager(use_cache=False)
+    assert completo.load_data_streaming(*ARCHIVOS, path=data_dir)
+    pd.testing.assert_frame_equal(incremental, completo.process_and_merge())
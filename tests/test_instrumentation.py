@@ -0,0 +1,98 @@
+import re
+import threading
+import tracemalloc
+import pytest
+from src.instrumentation import Instrumentacion, instrumentado
+
+
+@pytest.fixture
+def metricas(tmp_path):
+    return Instrumentacion(habilitado=True, perfil='perfilada.*', dir_perfiles=str(tmp_path))
+
+
+def test_apagada_no_mide():
+    metricas = Instrumentacion()
+    with metricas.etapa('x'):
+        pass
+    metricas.contar_cache('c', True)
+    assert metricas.resumen() == {'etapas': {}, 'caches': {}}
+
+
+def test_spans_y_errores(metricas):
+    with metricas.etapa('carga', filas=10):
+        pass
+    with pytest.raises(KeyError):
+        with metricas.etapa('carga', filas=5):
+            raise KeyError('x')
+    etapa = metricas.resumen()['etapas']['carga']
+    assert (etapa['llamadas'], etapa['errores'], etapa['filas_total']) == (2, 1, 15)
+    assert [s['error'] for s in metricas.exportar_json()] == [False, True]
+
+
+def test_decorador_usa_la_instancia_global(monkeypatch):
+    import src.instrumentation as instrumentation
+    monkeypatch.setattr(instrumentation, 'METRICAS', Instrumentacion(habilitado=True))
+
+    @instrumentado('prueba.lista')
+    def lista(n):
+        return list(range(n))
+
+    assert lista(7) == list(range(7))
+    assert instrumentation.METRICAS.resumen()['etapas']['prueba.lista']['filas_total'] == 7
+
+
+def test_spans_perfilados_que_se_solapan(metricas, tmp_path):
+    """El primero en entrar sale antes que el segundo: tracemalloc debe seguir activo para este."""
+    assert not tracemalloc.is_tracing()
+    dentro, primero_fuera = threading.Event(), threading.Event()
+    errores = []
+
+    def segundo():
+        try:
+            with metricas.etapa('perfilada.b'):
+                dentro.set()
+                primero_fuera.wait(10)
+        except Exception as e:
+            errores.append(e)
+
+    hilo = threading.Thread(target=segundo)
+    with metricas.etapa('perfilada.a'):
+        hilo.start()
+        dentro.wait(10)
+    primero_fuera.set()
+    hilo.join(10)
+
+    assert errores == []
+    assert not tracemalloc.is_tracing()
+    archivos = sorted(p.name for p in tmp_path.iterdir())
+    for etapa in ('perfilada.a', 'perfilada.b'):
+        assert any(a.startswith(etapa) and a.endswith('.prof') for a in archivos)
+        assert any(a.startswith(etapa) and a.endswith('.memoria.txt') for a in archivos)
+
+
+def test_tracemalloc_iniciado_por_otro_no_se_detiene(metricas):
+    tracemalloc.start()
+    try:
+        with metricas.etapa('perfilada.x'):
+            pass
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_tracemalloc_detenido_por_otro_no_rompe_el_span(metricas):
+    with metricas.etapa('perfilada.y'):
+        tracemalloc.stop()
+    assert metricas.resumen()['etapas']['perfilada.y']['errores'] == 0
+
+
+def test_prometheus_con_help_y_type_en_cada_metrica(metricas):
+    with metricas.etapa('carga'):
+        pass
+    metricas.contar_cache('eda', False)
+    texto = metricas.exportar_prometheus()
+    declaradas = set(re.findall(r'^# TYPE (\S+) (?:counter|gauge)$', texto, re.M))
+    ayudas = set(re.findall(r'^# HELP (\S+) ', texto, re.M))
+    muestras = {re.match(r'[a-z_]+', l).group() for l in texto.splitlines() if not l.startswith('#')}
+    assert 'careermatch_rss_mb' in muestras
+    assert muestras <= declaradas == ayudas
@@ -0,0 +1,50 @@
+import os
+import numpy as np
+import pandas as pd
+from src.model_store import ModelStore
+from src.pipeline import cargar_clustering, cargar_predictor
+
+
+def test_guardar_y_cargar(tmp_path):
+    store = ModelStore(str(tmp_path))
+    huella = ModelStore.huella(pd.DataFrame({'a': [1, 2]}), {'k': 4})
+    store.guardar('modelo', huella, {'pesos': np.arange(5)})
+    assert np.array_equal(store.cargar('modelo', huella)['pesos'], np.arange(5))
+    assert store.cargar('modelo', ModelStore.huella({'k': 5})) is None
+
+
+def test_huella_cambia_con_datos_y_parametros():
+    df = pd.DataFrame({'a': [1, 2], 'b': [3.0, 4.0]})
+    base = ModelStore.huella(df, {'k': 4})
+    assert base == ModelStore.huella(df.copy(), {'k': 4})
+    assert base != ModelStore.huella(df.assign(b=[3.0, 4.5]), {'k': 4})
+    assert base != ModelStore.huella(df, {'k': 5})
+
+
+def test_guardar_reemplaza_versiones_anteriores(tmp_path):
+    store = ModelStore(str(tmp_path))
+    store.guardar('modelo', 'a' * 64, {'v': 1})
+    store.guardar('modelo', 'b' * 64, {'v': 2})
+    assert len(os.listdir(tmp_path)) == 1
+    assert store.cargar_ultimo('modelo')['v'] == 2
+
+
+def test_artefacto_ilegible_se_ignora(tmp_path):
+    store = ModelStore(str(tmp_path))
+    store.guardar('modelo', 'c' * 64, {'v': 1})
+    ruta = os.path.join(str(tmp_path), os.listdir(tmp_path)[0])
+    with open(ruta, 'wb') as f:
+        f.write(b'no es joblib')
+    assert store.cargar('modelo', 'c' * 64) is None
+
+
+def test_restaurar_da_el_mismo_resultado_que_entrenar(dm_cargado):
+    df_master = dm_cargado.process_and_merge()
+    entrenado = cargar_clustering(df_master)
+    assert any(a.startswith('clustering-') for a in os.listdir(ModelStore().directorio))
+    restaurado = cargar_clustering(df_master)
+    pd.testing.assert_series_equal(entrenado['categoria'], restaurado['categoria'])
+
+    X = np.array([[5000, 50, 800, 50], [100, 500, 2500, 90]])
+    nuevo, restaurado = cargar_predictor(), cargar_predictor()
+    assert np.array_equal(nuevo.predecir_batch(X)[1], restaurado.predecir_batch(X)[1])
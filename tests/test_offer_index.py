@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.feature_extraction.text import TfidfTransformer
+from src.offer_index import CAMPOS_OFERTA, OfferIndex, clave_carrera
+
+CONSULTAS = ['ingenieria sistemas', 'Médico hospital', 'contador Quito', 'xyzzy']
+
+
+@pytest.fixture
+def ofertas(dm_cargado):
+    return dm_cargado.df_ofertas
+
+
+@pytest.fixture
+def carreras(dm_cargado):
+    return dm_cargado.process_and_merge()['carrera']
+
+
+def _referencia(ofertas, carreras, consulta, pooling):
+    """Mismo TF-IDF calculado de una vez con sklearn y agregado con pandas."""
+    indice = OfferIndex(carreras)
+    texto = ofertas[CAMPOS_OFERTA].astype(str).agg(' '.join, axis=1)
+    tfidf = TfidfTransformer().fit(indice.vectorizador.transform(texto))
+    X = tfidf.transform(indice.vectorizador.transform(texto))
+    q = tfidf.transform(indice.vectorizador.transform([consulta]))
+    puntajes = pd.Series((X @ q.T).toarray().ravel())
+    ids = clave_carrera(ofertas['carrera_requerida']).map(indice._id_carrera).to_numpy()
+    agregado = puntajes[~pd.isna(ids)].groupby(ids[~pd.isna(ids)].astype(int)).agg(pooling)
+    return agregado.reindex(range(len(carreras)), fill_value=0.0).to_numpy()
+
+
+@pytest.mark.parametrize('pooling', ['max', 'sum', 'mean'])
+def test_igual_a_tfidf_de_una_vez(ofertas, carreras, pooling):
+    indice = OfferIndex.desde_dataframe(ofertas, carreras, tam_lote=700)
+    assert indice.n_ofertas == len(ofertas)
+    for consulta in CONSULTAS:
+        np.testing.assert_allclose(indice.puntuar_carreras(consulta, pooling),
+                                   _referencia(ofertas, carreras, consulta, pooling), atol=1e-12)
+
+
+def test_por_lotes_csv_y_arrays_dan_lo_mismo(ofertas, carreras, data_dir):
+    completo = OfferIndex.desde_dataframe(ofertas, carreras, tam_lote=len(ofertas))
+    por_lotes = OfferIndex.desde_dataframe(ofertas, carreras, tam_lote=333)
+    desde_csv = OfferIndex.desde_csv(data_dir + 'encuentra_empleo_ofertas_2.csv', carreras, chunksize=500)
+    compartido = OfferIndex.desde_arrays(carreras, completo.exportar_arrays())
+    for consulta in CONSULTAS:
+        esperado = completo.buscar(consulta, k=5)
+        for otro in (por_lotes, desde_csv, compartido):
+            idx, val = otro.buscar(consulta, k=5)
+            np.testing.assert_array_equal(idx, esperado[0])
+            np.testing.assert_allclose(val, esperado[1], atol=1e-12)
+
+
+def test_pooling_desconocido(ofertas, carreras):
+    with pytest.raises(ValueError):
+        OfferIndex.desde_dataframe(ofertas, carreras).puntuar_carreras('salud', pooling='mediana')
+
+
+def test_recomendar_desde_ofertas(nlp, ofertas):
+    # Sin índice de ofertas la consulta no falla: devuelve un resultado vacío
+    assert nlp.recomendar('salud', fuente='ofertas').empty
+    nlp.indexar_ofertas(ofertas, chunksize=1000)
+    res = nlp.recomendar('ingenieria sistemas', fuente='ofertas')
+    assert not res.empty and res['Afinidad'].is_monotonic_decreasing
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from src.prediction_module import BosqueCompilado, CareerPredictor, generar_datos_sinteticos
+
+
+@pytest.fixture(scope='module')
+def predictor():
+    predictor = CareerPredictor()
+    predictor.params_datos = {'n': 300, 'seed': 42}
+    predictor.params['n_estimators'] = 30
+    predictor.entrenar_modelo()
+    predictor.compilar()
+    return predictor
+
+
+def test_bosque_compilado_igual_a_sklearn(predictor):
+    X, _ = generar_datos_sinteticos(n=500, seed=11)
+    # Incluye puntos fuera de los rangos del entrenamiento y valores justo en los umbrales
+    extremos = np.array([[0, 0, 0, 0], [50_000, 1_000, 10_000, 100]])
+    bosque = predictor.bosque
+    internos = bosque.left != np.arange(bosque.left.size)
+    umbrales = bosque.threshold[internos & (bosque.feature == 2)][:20]
+    en_umbral = np.tile(np.median(X, axis=0), (len(umbrales), 1))
+    en_umbral[:, 2] = umbrales
+    X = np.vstack([X, extremos, en_umbral])
+
+    etiquetas_c, probs_c = predictor.predecir_batch(X, compilado=True)
+    etiquetas_s, probs_s = predictor.predecir_batch(X, compilado=False)
+    np.testing.assert_allclose(probs_c, probs_s, atol=1e-12)
+    np.testing.assert_array_equal(etiquetas_c, etiquetas_s)
+
+
+def test_desde_arrays_igual_al_original(predictor):
+    bosque = BosqueCompilado.desde_arrays(predictor.bosque.exportar_arrays(), predictor.rf_model.classes_)
+    X, _ = generar_datos_sinteticos(n=50, seed=5)
+    np.testing.assert_array_equal(bosque.predict_proba(X), predictor.bosque.predict_proba(X))
+
+
+def test_predecir_individual(predictor):
+    etiqueta, probs = predictor.predecir(5000, 50, 800, 50)
+    assert etiqueta in probs
+    assert sum(probs.values()) == pytest.approx(1.0)
+    assert etiqueta == predictor.rf_model.predict([[5000, 50, 800, 50]])[0]
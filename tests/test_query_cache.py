@@ -0,0 +1,59 @@
+import pandas as pd
+from src import query_cache
+from src.query_cache import LRUCache
+
+
+def test_lru_desaloja_la_menos_usada():
+    cache = LRUCache(max_entradas=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    assert cache.estadisticas()['desalojos'] == 1
+
+
+def test_ttl_expira(monkeypatch):
+    ahora = [100.0]
+    monkeypatch.setattr(query_cache.time, 'monotonic', lambda: ahora[0])
+    cache = LRUCache(ttl=10)
+    cache.put('a', 1)
+    ahora[0] += 10
+    assert cache.get('a') == 1
+    ahora[0] += 0.5
+    assert cache.get('a') is None
+    assert cache.estadisticas()['entradas'] == 0
+
+
+def test_consultas_equivalentes_comparten_entrada(nlp):
+    primera = nlp.recomendar('Ingeniería en Sistemas')
+    assert not primera.empty
+    # Mismas palabras del vocabulario: mayúsculas, acentos, orden y stop words no cuentan
+    for variante in ['sistemas de ingenieria', 'INGENIERIA   SISTEMAS', 'la ingeniería en los sistemas']:
+        assert nlp.normalizar_consulta(variante) == nlp.normalizar_consulta('Ingeniería en Sistemas')
+        pd.testing.assert_frame_equal(nlp.recomendar(variante), primera)
+    estadisticas = nlp.estadisticas_cache()
+    assert estadisticas['misses'] == 1 and estadisticas['hits'] == 3
+
+
+def test_resultado_cacheado_igual_a_sin_cache(nlp):
+    for consulta in ['medicina salud', 'contabilidad finanzas', 'xyzzy']:
+        for alta in (False, True):
+            cacheado = nlp.recomendar(consulta, filtrar_alta_demanda=alta)
+            nlp.cache.clear()
+            sin_cache = nlp.recomendar(consulta, filtrar_alta_demanda=alta)
+            pd.testing.assert_frame_equal(cacheado, sin_cache)
+
+
+def test_el_filtro_forma_parte_de_la_clave(nlp):
+    nlp.recomendar('salud', filtrar_alta_demanda=False)
+    nlp.recomendar('salud', filtrar_alta_demanda=True)
+    assert nlp.estadisticas_cache()['misses'] == 2
+
+
+def test_reentrenar_invalida_la_cache(nlp):
+    nlp.recomendar('salud')
+    assert nlp.estadisticas_cache()['entradas'] == 1
+    nlp._entrenar_nlp()
+    assert nlp.estadisticas_cache()['entradas'] == 0
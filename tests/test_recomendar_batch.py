@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+import scipy.sparse as sp
+import src.retrieval as retrieval
+from benchmarks.bench_pipeline import CONSULTAS
+from src.retrieval import ExactRetriever, top_k, top_k_disperso
+
+CONSULTAS_BATCH = CONSULTAS + ['', 'xyzzy sin coincidencias', 'Ingeniería en Sistemas', 'SALUD']
+
+
+@pytest.mark.parametrize('alta_demanda', [False, True])
+def test_batch_igual_a_consultas_individuales(nlp, alta_demanda):
+    lote = nlp.recomendar_batch(CONSULTAS_BATCH, filtrar_alta_demanda=alta_demanda, tam_lote=3)
+    for i, consulta in enumerate(CONSULTAS_BATCH):
+        individual = nlp.recomendar(consulta, filtrar_alta_demanda=alta_demanda)
+        filas = lote[lote['id_consulta'] == i]
+        esperado = [] if individual.empty else list(zip(individual.index, individual['Afinidad']))
+        assert list(zip(filas['indice'], filas['Afinidad'])) == esperado, consulta
+
+
+def test_batch_con_k_mayor_que_diez(nlp):
+    k = 20
+    assert len(nlp.df) > k
+    # Consultas amplias: coinciden con más de 10 carreras
+    amplias = ['salud actividades finanzas educacion agricultura ingenieria', 'actividades ingenieria salud']
+    lote = nlp.recomendar_batch(amplias + ['xyzzy'], k=k)
+    top_indices, top_scores = nlp.motor.buscar(nlp.tfidf.transform(amplias), k=k)
+    for i in range(len(amplias)):
+        filas = lote[lote['id_consulta'] == i]
+        esperado = top_indices[i][(top_indices[i] >= 0) & ((top_scores[i] * 100).round(1) > 0)]
+        assert len(esperado) > 10
+        assert filas['indice'].tolist() == esperado.tolist()
+    assert (lote['id_consulta'] == len(amplias)).sum() == 0
+
+
+def test_top_k_disperso_igual_a_denso():
+    rng = np.random.default_rng(3)
+    # Valores repetidos para forzar empates en el borde del top-k
+    densa = rng.choice([0, 0, 0, 0.2, 0.5, 0.7], size=(40, 60))
+    indices, valores = top_k_disperso(sp.csr_matrix(densa), 7)
+    esperado_i, esperado_v = top_k(densa, 7)
+    positivos = esperado_v > 0
+    assert np.array_equal(np.where(positivos, esperado_i, -1), indices)
+    assert np.array_equal(np.where(positivos, esperado_v, 0), valores)
+
+
+def test_exacto_no_densifica_y_respeta_el_presupuesto(nlp, monkeypatch):
+    consultas = nlp.tfidf.transform([c.lower() for c in CONSULTAS_BATCH])
+    referencia = nlp.motor.buscar(consultas, k=10)
+    bloques = []
+    original = retrieval.top_k_disperso
+
+    def espia(puntajes, k):
+        assert sp.issparse(puntajes)
+        bloques.append(puntajes.shape[0])
+        return original(puntajes, k)
+
+    # Presupuesto para 2 consultas por bloque (16 bytes por documento y consulta)
+    monkeypatch.setattr(retrieval, 'MEMORIA_LOTE', 2 * 16 * nlp.motor.n_docs)
+    monkeypatch.setattr(retrieval, 'top_k_disperso', espia)
+    resultado = nlp.motor.buscar(consultas, k=10)
+    assert max(bloques) == 2 and sum(bloques) == len(CONSULTAS_BATCH)
+    assert all(np.array_equal(a, b) for a, b in zip(resultado, referencia))
+    assert isinstance(nlp.motor, ExactRetriever)
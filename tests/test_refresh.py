@@ -0,0 +1,87 @@
+import time
+import pandas as pd
+from src.refresh import CoordinadorRefresco
+
+OFERTAS = 'encuentra_empleo_ofertas_2.csv'
+
+
+def _agregar_ofertas(data_dir, n=200):
+    """Simula la llegada de ofertas nuevas (cambia tamaño y fecha del CSV)."""
+    ruta = data_dir + OFERTAS
+    ofertas = pd.read_csv(ruta)
+    pd.concat([ofertas, ofertas.head(n)]).to_csv(ruta, index=False)
+
+
+def test_sin_cambios_no_refresca(data_dir):
+    coordinador = CoordinadorRefresco(data_dir, intervalo=0, en_proceso=False)
+    assert coordinador.refrescar() is False
+    assert coordinador.estado()['version'] == 1
+
+
+def test_intercambio_en_hilo(data_dir):
+    cambios = []
+    coordinador = CoordinadorRefresco(data_dir, intervalo=0, en_proceso=False,
+                                      al_cambiar=lambda nuevo, anterior: cambios.append((nuevo, anterior)))
+    anterior = coordinador.sistema
+    df_anterior = anterior.df_labeled
+    predictor = anterior.predictor
+    anterior.nlp
+
+    _agregar_ofertas(data_dir)
+    assert coordinador.refrescar() is True
+    nuevo = coordinador.sistema
+    estado = coordinador.estado()
+    assert estado['version'] == 2 and estado['ultimo_error'] is None
+    # Las carreras y sectores no cambiaron: el TF-IDF se restaura, solo se rehace el índice de ofertas
+    assert estado['reentrenados'] == ['clustering', 'ofertas']
+    assert cambios[-1] == (nuevo, anterior)
+
+    # El nuevo trae las mismas etapas; el predictor (no lee los CSV) se reutiliza tal cual
+    assert set(anterior.cargados()) <= set(nuevo.cargados())
+    assert nuevo.predictor is predictor
+    assert nuevo.df_labeled['num_ofertas'].sum() == df_anterior['num_ofertas'].sum() + 200
+    # Quien tenía el Sistema anterior sigue usándolo sin cambios
+    assert anterior.df_labeled is df_anterior
+
+
+def test_error_al_preparar_mantiene_la_version(data_dir):
+    def preparar(sistema):
+        if preparar.fallar:
+            raise ValueError('pool no disponible')
+        return sistema
+    preparar.fallar = False
+    coordinador = CoordinadorRefresco(data_dir, intervalo=0, en_proceso=False, preparar=preparar)
+    vigente = coordinador.sistema
+
+    preparar.fallar = True
+    _agregar_ofertas(data_dir)
+    assert coordinador.refrescar() is False
+    assert coordinador.sistema is vigente
+    assert coordinador.estado()['ultimo_error'] == 'ValueError: pool no disponible'
+
+    preparar.fallar = False
+    assert coordinador.refrescar() is True
+    assert coordinador.estado()['ultimo_error'] is None
+
+
+def test_vigilancia_refresca_sola(data_dir):
+    coordinador = CoordinadorRefresco(data_dir, intervalo=0.05, en_proceso=False).iniciar()
+    try:
+        _agregar_ofertas(data_dir)
+        limite = time.monotonic() + 30
+        while coordinador.estado()['version'] == 1 and time.monotonic() < limite:
+            time.sleep(0.05)
+        assert coordinador.estado()['version'] == 2
+    finally:
+        coordinador.detener()
+
+
+def test_construccion_en_proceso_aparte(data_dir):
+    coordinador = CoordinadorRefresco(data_dir, etapas=('clustering',), intervalo=0, en_proceso=True)
+    coordinador.sistema.df_labeled
+    _agregar_ofertas(data_dir)
+    assert coordinador.refrescar() is True
+    estado = coordinador.estado()
+    # El proceso aparte reentrenó y guardó; aquí solo se restauró del ModelStore
+    assert estado['reentrenados'] == ['clustering'] and 'clustering' in estado['construccion']
+    assert coordinador.sistema.df_labeled['num_ofertas'].sum() > 0
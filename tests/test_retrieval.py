@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+from benchmarks.bench_pipeline import CONSULTAS
+from src.nlp_module import NLPRecommender
+from src.retrieval import ExactRetriever, IVFRetriever, crear_motor, top_k
+
+
+@pytest.fixture
+def documentos():
+    rng = np.random.default_rng(0)
+    return normalize(sp.random(300, 80, density=0.05, random_state=1, format='csr')), \
+        normalize(sp.random(20, 80, density=0.1, random_state=rng.integers(1e6), format='csr'))
+
+
+def _positivos(indices, puntajes):
+    """Pares (índice, puntaje) con puntaje > 0, por consulta (el relleno no cuenta)."""
+    return [list(zip(i[p > 0].tolist(), np.round(p[p > 0], 12).tolist())) for i, p in zip(indices, puntajes)]
+
+
+def test_top_k_ordena_y_desempata_por_indice():
+    puntajes = np.array([[0.5, 0.9, 0.5, 0.1, 0.9, 0.5]])
+    indices, valores = top_k(puntajes, 4)
+    assert indices.tolist() == [[1, 4, 0, 2]]
+    assert valores.tolist() == [[0.9, 0.9, 0.5, 0.5]]
+
+
+def test_top_k_desempata_por_indice_en_el_borde():
+    rng = np.random.default_rng(3)
+    puntajes = rng.choice([0, 0.2, 0.5, 0.7], size=(50, 60))
+    indices, valores = top_k(puntajes, 7)
+    esperado = np.lexsort((np.tile(np.arange(60), (50, 1)), -puntajes), axis=1)[:, :7]
+    assert np.array_equal(indices, esperado)
+    assert np.array_equal(valores, np.take_along_axis(puntajes, esperado, axis=1))
+
+
+def test_exacto_igual_a_fuerza_bruta(documentos):
+    matriz, consultas = documentos
+    indices, puntajes = ExactRetriever(matriz).buscar(consultas, k=10)
+    densos = (consultas @ matriz.T).toarray()
+    orden = np.lexsort((np.tile(np.arange(densos.shape[1]), (len(densos), 1)), -densos), axis=1)[:, :10]
+    esperado = np.take_along_axis(densos, orden, axis=1)
+    assert _positivos(indices, puntajes) == _positivos(orden, esperado)
+
+
+def test_ivf_con_todas_las_sondas_es_exacto(documentos):
+    matriz, consultas = documentos
+    ivf = crear_motor('ivf', matriz, n_listas=8, n_sondas=8)
+    assert ivf.recall(consultas, k=10) == 1.0
+    assert _positivos(*ivf.buscar(consultas, 10)) == _positivos(*ExactRetriever(matriz).buscar(consultas, 10))
+
+
+def test_ivf_con_pocas_sondas_recall_parcial(documentos):
+    matriz, consultas = documentos
+    assert 0 < IVFRetriever(matriz, n_listas=16, n_sondas=1).recall(consultas, k=10) <= 1.0
+
+
+def test_motor_desconocido():
+    with pytest.raises(ValueError):
+        crear_motor('faiss', sp.eye(3, format='csr'))
+
+
+def test_recall_exacto_se_mide_contra_fuerza_bruta(documentos, monkeypatch):
+    matriz, consultas = documentos
+    exacto = ExactRetriever(matriz)
+    assert exacto.recall(consultas, k=10) == 1.0
+    # Un motor que no recupera nada da recall 0: el valor se mide, no se asume
+    vacio = (np.full((consultas.shape[0], 10), -1), np.zeros((consultas.shape[0], 10)))
+    monkeypatch.setattr(exacto, 'buscar', lambda consultas, k=10: vacio)
+    assert exacto.recall(consultas, k=10) == 0.0
+
+
+def test_evaluar_recall_ivf_frente_a_fuerza_bruta(df_labeled):
+    n_listas = 6
+    parcial = NLPRecommender(df_labeled, backend='ivf', n_listas=n_listas, n_sondas=1).evaluar_recall(CONSULTAS, k=5)
+    assert list(parcial) == ['ivf'] and 0.0 <= parcial['ivf'] <= 1.0
+    completo = NLPRecommender(df_labeled, backend='ivf', n_listas=n_listas, n_sondas=n_listas)
+    assert completo.evaluar_recall(CONSULTAS, k=5) == {'ivf': 1.0}
+    assert NLPRecommender(df_labeled).evaluar_recall(CONSULTAS, k=5) == {'exacto': 1.0}
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+from src.clustering_module import CareerClusterer
+from src.schema import ESQUEMAS, aplicar_esquema
+
+
+def test_convierte_a_tipos_compactos_sin_cambiar_valores():
+    df = pd.DataFrame({'año': [2015, 2023] * 50, 'carrera': ['Medicina', 'Derecho'] * 50,
+                       'num_estudiantes': np.arange(100, dtype=np.int64), 'extra': 1.5})
+    reporte = {}
+    compacto = aplicar_esquema(df, 'matricula', reporte)
+    assert compacto.dtypes.to_dict() == {'año': np.dtype('int16'), 'carrera': pd.CategoricalDtype(['Derecho', 'Medicina']),
+                                         'num_estudiantes': np.dtype('int32'), 'extra': np.dtype('float64')}
+    pd.testing.assert_frame_equal(compacto, df, check_dtype=False, check_categorical=False)
+    assert reporte['matricula']['despues_mb'] < reporte['matricula']['antes_mb']
+    # El original no se modifica
+    assert df['año'].dtype == np.int64
+
+
+def test_valores_fuera_de_rango_o_faltantes_conservan_la_columna():
+    df = pd.DataFrame({'salario_minimo': [500, 3_000_000_000], 'salario_maximo': [900.0, np.nan],
+                       'fecha_publicacion': ['2025-01-03', 'no es fecha'], 'titulo_puesto': ['a', 'b']})
+    compacto = aplicar_esquema(df, 'ofertas')
+    assert compacto['salario_minimo'].dtype == np.int64
+    assert compacto['salario_maximo'].dtype == np.float64
+    assert compacto['fecha_publicacion'].tolist() == ['2025-01-03', 'no es fecha']
+    # Texto que casi no repite valores: no compensa como categoría
+    assert not isinstance(compacto['titulo_puesto'].dtype, pd.CategoricalDtype)
+    assert aplicar_esquema(None, 'ofertas') is None
+
+
+def test_tablas_cargadas_con_el_esquema(dm_cargado):
+    for nombre, df in [('ofertas', dm_cargado.df_ofertas), ('matricula', dm_cargado.df_matricula),
+                       ('inec', dm_cargado.df_inec), ('master', dm_cargado.process_and_merge())]:
+        for col, tipo in ESQUEMAS[nombre].items():
+            if col not in df.columns or tipo == 'category':
+                continue
+            if np.dtype(tipo).kind == 'M':
+                # pandas 3 infiere la resolución (us) al convertir: basta con que sea fecha
+                assert df[col].dtype.kind == 'M', (nombre, col)
+            else:
+                assert df[col].dtype == np.dtype(tipo), (nombre, col)
+
+
+def test_clustering_igual_con_tipos_compactos(dm_cargado):
+    df_master = dm_cargado.process_and_merge()
+    ancho = df_master.astype({c: 'int64' for c in df_master.select_dtypes('integer').columns})
+    compacto = CareerClusterer(df_master).ejecutar_clustering()
+    original = CareerClusterer(ancho).ejecutar_clustering()
+    assert (compacto['categoria'].to_numpy() == original['categoria'].to_numpy()).all()
@@ -0,0 +1,34 @@
+import pandas as pd
+from benchmarks.bench_pipeline import CARRERAS_BASE
+from src.sector_mapper import mapper_por_defecto
+
+
+def _mapear_sector(carrera):
+    # Cadena if/elif original de DataManager (referencia de prioridad)
+    c = str(carrera).lower()
+    if 'sistemas' in c or 'software' in c or 'informática' in c or 'computación' in c: return 'Información y Comunicación'
+    elif 'administración' in c or 'contabilidad' in c or 'financ' in c or 'marketing' in c or 'comercio' in c or 'negocios' in c: return 'Actividades Financieras'
+    elif 'medicina' in c or 'enfermería' in c or 'salud' in c or 'odont' in c: return 'Salud Humana'
+    elif 'civil' in c or 'arquitectura' in c or 'construcción' in c: return 'Construcción'
+    elif 'mecánica' in c or 'industrial' in c or 'eléctrica' in c: return 'Industrias Manufactureras'
+    elif 'educación' in c or 'docencia' in c or 'pedagogía' in c: return 'Educación'
+    elif 'agro' in c or 'veterinaria' in c or 'agrónom' in c: return 'Agricultura y Ganadería'
+    else: return 'Actividades Profesionales'
+
+
+def test_clasificar_igual_a_la_cadena_original():
+    carreras = pd.Series(CARRERAS_BASE + [
+        'Administración de Sistemas',        # dos sectores: gana el primero de la taxonomía
+        'Ingeniería en Software', 'MARKETING DIGITAL', 'Odontología', 'Arquitectura',
+        'Ingeniería Mecánica', 'Pedagogía', 'Medicina Veterinaria', 'Agroindustria',
+        'Salud Pública y Comercio', 'Psicología', '', None,
+    ])
+    esperado = carreras.map(_mapear_sector)
+    obtenido = mapper_por_defecto().clasificar(carreras)
+    pd.testing.assert_series_equal(obtenido, esperado, check_names=False, check_dtype=False)
+
+
+def test_sinonimos_de_sector_desconocido_es_vacio():
+    mapper = mapper_por_defecto()
+    sinonimos = mapper.sinonimos_de([mapper.sectores[0], 'Sector inexistente'])
+    assert sinonimos.iloc[0] != '' and sinonimos.iloc[1] == ''
@@ -0,0 +1,105 @@
+import json
+import os
+import pickle
+import subprocess
+import sys
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+import src.pipeline
+from src.pipeline import Sistema
+from src.prediction_module import LIMITE_COMPILADO, CareerPredictor
+from src.shared_segments import SegmentStore, arrays_csr, arrays_dataframe, csr_de, dataframe_de_arrays
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _mapeado(array):
+    """True si el array (o aquello de lo que es vista) es un segmento mapeado en memoria."""
+    while array is not None and not isinstance(array, np.memmap):
+        array = array.base
+    return array is not None
+
+
+def test_dataframe_y_csr_ida_y_vuelta():
+    df = pd.DataFrame({'n': np.arange(4, dtype=np.int32), 'x': [0.5, 1.5, np.nan, 2.0],
+                       'cat': pd.Categorical(['a', 'b', 'a', None]), 'texto': ['u', 'v', 'u', 'w'],
+                       'fecha': pd.to_datetime(['2025-01-01', '2025-02-01', '2025-03-01', '2025-04-01'])})
+    arrays, meta = arrays_dataframe(df)
+    pd.testing.assert_frame_equal(dataframe_de_arrays(arrays, meta), df)
+
+    matriz = sp.random(30, 50, density=0.1, format='csr', random_state=0)
+    assert (csr_de(arrays_csr(matriz, 'm'), 'm') != matriz).nnz == 0
+
+
+def test_publicar_una_vez_y_adjuntar_en_solo_lectura(tmp_path):
+    store = SegmentStore(str(tmp_path))
+    arrays = {'a': np.arange(10), 'vacio': np.empty(0)}
+    manifiesto = store.publicar('grupo', arrays, extra={'k': 1})
+    marca = os.path.getmtime(os.path.join(manifiesto['carpeta'], 'a.npy'))
+    assert store.publicar('grupo', arrays, extra={'k': 1}) == manifiesto
+    assert os.path.getmtime(os.path.join(manifiesto['carpeta'], 'a.npy')) == marca
+
+    adjuntos = SegmentStore.adjuntar(manifiesto)
+    assert isinstance(adjuntos['a'], np.memmap) and not adjuntos['a'].flags.writeable
+    np.testing.assert_array_equal(adjuntos['a'], arrays['a'])
+
+    # Otra versión del grupo reemplaza a la anterior
+    nuevo = store.publicar('grupo', {'a': np.arange(11)})
+    assert os.listdir(tmp_path) == [os.path.basename(nuevo['carpeta'])]
+
+
+def test_sistema_desde_segmentos_igual_al_original(data_dir, tmp_path, monkeypatch):
+    sistema = Sistema(data_dir)
+    manifiesto = sistema.publicar_segmentos(('clustering', 'nlp', 'predictor'), SegmentStore(str(tmp_path / 'seg')))
+
+    def prohibido(*args, **kwargs):
+        raise AssertionError("el worker no debe restaurar ni entrenar el predictor")
+    monkeypatch.setattr(src.pipeline, 'cargar_predictor', prohibido)
+    monkeypatch.setattr(CareerPredictor, 'entrenar_modelo', prohibido)
+    adjunto = Sistema.desde_segmentos(manifiesto)
+    assert adjunto.cargados() == ['clustering', 'nlp', 'predictor']
+
+    pd.testing.assert_frame_equal(adjunto.df_labeled.copy(), sistema.df_labeled, check_dtype=False, check_categorical=False)
+    for consulta in ['ingenieria sistemas', 'medicina', 'xyzzy']:
+        pd.testing.assert_frame_equal(adjunto.nlp.recomendar(consulta), sistema.nlp.recomendar(consulta),
+                                      check_categorical=False)
+    X = [[5000, 50, 800, 50], [600, 60, 1400, 70]]
+    np.testing.assert_array_equal(adjunto.predictor.predecir_batch(X, compilado=True)[1],
+                                  sistema.predictor.predecir_batch(X, compilado=True)[1])
+    # Sin rf_model: los lotes grandes también van por el bosque compartido
+    assert adjunto.predictor.rf_model is None
+    grande = np.random.default_rng(0).uniform([0, 0, 400, 0], [20000, 1000, 5000, 100], size=(LIMITE_COMPILADO + 1, 4))
+    etiquetas, probs = adjunto.predictor.predecir_batch(grande)
+    esperadas, esperado = sistema.predictor.predecir_batch(grande, compilado=True)
+    np.testing.assert_array_equal(probs, esperado)
+    np.testing.assert_array_equal(etiquetas, esperadas)
+    assert adjunto.predictor.predecir(5000, 50, 800, 50) == sistema.predictor.predecir(5000, 50, 800, 50)
+    for f in range(4):
+        np.testing.assert_array_equal(np.unique(adjunto.predictor.umbrales(f)), np.unique(sistema.predictor.umbrales(f)))
+    # Vistas sobre los segmentos, sin copias privadas
+    matriz, indice = adjunto.nlp.tfidf_matrix, adjunto.nlp.motor.indice
+    assert all(_mapeado(a) for a in (matriz.data, matriz.indices, indice.data, adjunto.predictor.bosque.threshold))
+
+
+def test_otro_proceso_usa_los_mismos_arrays(data_dir, tmp_path):
+    sistema = Sistema(data_dir)
+    manifiesto = sistema.publicar_segmentos(('clustering', 'nlp', 'predictor'), SegmentStore(str(tmp_path / 'seg')))
+    codigo = (
+        "import json, pickle, sys, numpy as np; from src.pipeline import Sistema; "
+        "s = Sistema.desde_segmentos(pickle.load(sys.stdin.buffer)); "
+        "r = s.nlp.recomendar('ingenieria sistemas'); "
+        "print(json.dumps({'memmap': isinstance(s.predictor.bosque.threshold, np.memmap), "
+        "'rf_model': s.predictor.rf_model is not None, "
+        "'carreras': r['carrera'].astype(str).tolist()}))"
+    )
+    # cwd propio: el ModelStore relativo (data/.cache) del worker no cae en el repositorio
+    trabajo = tmp_path / 'worker'
+    trabajo.mkdir()
+    entorno = {**os.environ, 'PYTHONPATH': RAIZ}
+    salida = subprocess.run([sys.executable, '-c', codigo], input=pickle.dumps(manifiesto), cwd=trabajo,
+                            env=entorno, capture_output=True, check=True)
+    resultado = json.loads(salida.stdout.decode().strip().splitlines()[-1])
+    assert resultado['memmap'] and not resultado['rf_model']
+    assert os.listdir(trabajo) == []
+    assert resultado['carreras'] == sistema.nlp.recomendar('ingenieria sistemas')['carrera'].astype(str).tolist()
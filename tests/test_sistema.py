@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+import pytest
+import src.pipeline as pipeline
+from src.pipeline import Sistema, construir_sistema
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_importar_pipeline_no_carga_los_motores():
+    codigo = ("import sys; from src.pipeline import Sistema; Sistema('data/'); "
+              "print(sorted(m for m in ('sklearn', 'plotly', 'joblib') if m in sys.modules))")
+    salida = subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ, capture_output=True, text=True, check=True)
+    assert salida.stdout.strip() == '[]'
+
+
+def test_cada_etapa_carga_solo_sus_dependencias(data_dir):
+    sistema = Sistema(data_dir)
+    assert sistema.cargados() == []
+    sistema.nlp
+    assert sistema.cargados() == ['datos', 'clustering', 'nlp']
+    assert set(sistema.tiempos) == {'datos', 'clustering', 'nlp'}
+
+
+def test_predictor_no_lee_los_csv(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    sistema = Sistema(str(tmp_path / 'no-existe') + '/')
+    sistema.simulador
+    assert sistema.cargados() == ['predictor', 'simulador']
+    with pytest.raises(RuntimeError):
+        sistema.df_master
+
+
+def test_construccion_concurrente_una_sola_vez(monkeypatch):
+    llamadas = []
+
+    def lento():
+        llamadas.append(1)
+        time.sleep(0.05)
+        return object()
+
+    monkeypatch.setattr(pipeline, 'cargar_predictor', lento)
+    sistema = Sistema('data/')
+    resultados = []
+    hilos = [threading.Thread(target=lambda: resultados.append(sistema.obtener('predictor'))) for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert len(llamadas) == 1
+    assert all(r is resultados[0] for r in resultados)
+
+
+def test_adoptar_y_etapa_desconocida(data_dir):
+    anterior = Sistema(data_dir)
+    nuevo = Sistema(data_dir)
+    anterior.predictor
+    nuevo.adoptar('predictor', anterior)
+    assert nuevo.predictor is anterior.predictor and nuevo.tiempos['predictor'] == 0.0
+    with pytest.raises(ValueError):
+        nuevo.obtener('inexistente')
+
+
+def test_construir_sistema_sin_datos(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    df_labeled, nlp, predictor, eda, estado = construir_sistema(str(tmp_path) + '/')
+    assert df_labeled is None and estado == "Error cargando CSVs."
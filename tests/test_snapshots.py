@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+from src.model_store import ModelStore
+from src.pipeline import cargar_snapshots
+from src.snapshots import TODAS, TOTAL, MarketSnapshots, trimestre_de
+
+
+@pytest.fixture
+def snapshots(dm_cargado):
+    return MarketSnapshots.construir(dm_cargado, n_jobs=1)
+
+
+def test_corte_nacional_igual_a_df_master(snapshots, df_labeled):
+    nacional = snapshots.obtener(TODAS, TOTAL)
+    nacional = nacional.set_index(nacional['carrera'].astype(str)).sort_index()
+    master = df_labeled.set_index('carrera').sort_index()
+    assert nacional.index.equals(master.index)
+    for col in ['num_estudiantes', 'num_ofertas', 'salario_oferta', 'tasa_empleo_formal', 'categoria']:
+        pd.testing.assert_series_equal(nacional[col], master[col], check_dtype=False, check_categorical=False)
+
+
+def test_agregados_suman_los_cortes(snapshots):
+    provincias = [p for p in snapshots.provincias if p != TODAS]
+    trimestres = [t for t in snapshots.trimestres if t != TOTAL]
+    ofertas = lambda p, t: snapshots.obtener(p, t).set_index('carrera')['num_ofertas'].astype('int64') \
+        if snapshots.clave(p, t) else pd.Series(dtype='int64')
+    nacional = ofertas(TODAS, TOTAL)
+    suma = lambda series: pd.concat(series, axis=1).fillna(0).sum(axis=1).reindex(nacional.index, fill_value=0)
+    pd.testing.assert_series_equal(suma([ofertas(p, TOTAL) for p in provincias]), nacional, check_names=False,
+                                   check_dtype=False)
+    pd.testing.assert_series_equal(suma([ofertas(TODAS, t) for t in trimestres]), nacional, check_names=False,
+                                   check_dtype=False)
+    p = provincias[0]
+    pd.testing.assert_series_equal(suma([ofertas(p, t) for t in trimestres]), ofertas(p, TOTAL).reindex(nacional.index, fill_value=0),
+                                   check_names=False, check_dtype=False)
+
+
+def test_clave_tolerante_y_corte_inexistente(snapshots):
+    provincia, trimestre = next(k for k in snapshots.indice if TODAS not in k and TOTAL not in k)
+    assert snapshots.clave(provincia.upper(), trimestre.lower().replace('-', '')) == (provincia, trimestre)
+    assert snapshots.obtener('Atlántida', trimestre) is None
+    assert trimestre_de(['2025-08-14', 'no es fecha']).tolist() == ['2025-Q3', 'Sin fecha']
+
+
+def test_paralelo_y_model_store_dan_lo_mismo(dm_cargado, snapshots, tmp_path):
+    paralelo = MarketSnapshots.construir(dm_cargado, n_jobs=2)
+    assert paralelo.indice == snapshots.indice
+    pd.testing.assert_frame_equal(paralelo.datos, snapshots.datos)
+
+    store = ModelStore(str(tmp_path / 'modelos'))
+    calculado = cargar_snapshots(dm_cargado, store=store, n_jobs=1)
+    restaurado = cargar_snapshots(dm_cargado, store=store, n_jobs=1)
+    assert restaurado.indice == calculado.indice
+    # La copia pasa los arrays memory-map del restaurado a memoria (la comparación exige ndarray)
+    pd.testing.assert_frame_equal(restaurado.datos.copy(), calculado.datos, check_categorical=False)
+
+
+def test_trimestres_de_provincia_tienen_corte(snapshots):
+    for provincia in snapshots.provincias:
+        trimestres = snapshots.trimestres_de(provincia)
+        assert trimestres[0] == TOTAL
+        assert all(snapshots.obtener(provincia, t) is not None for t in trimestres)
+    assert snapshots.trimestres_de(TODAS) == snapshots.trimestres
+
+    # Una provincia sin ofertas en un trimestre: ese par ya no se ofrece en la página
+    provincia, trimestre = next(k for k in snapshots.indice if TODAS not in k and TOTAL not in k)
+    indice = {k: v for k, v in snapshots.indice.items() if k != (provincia, trimestre)}
+    recortado = MarketSnapshots(snapshots.datos, indice)
+    assert recortado.obtener(provincia, trimestre) is None
+    assert trimestre not in recortado.trimestres_de(provincia.lower())
+    assert trimestre in recortado.trimestres
@@ -0,0 +1,56 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from src.data_manager import DataManager
+from src.eda_module import EDAModule
+from src.pipeline import ARCHIVOS
+
+
+def test_resumen_ofertas_es_none_sin_streaming():
+    # EDAModule lo lee en el camino normal (no streaming): el atributo existe y vale None
+    assert DataManager().resumen_ofertas is None
+
+
+@pytest.mark.parametrize('chunksize', [250, 999, 100_000])
+def test_streaming_igual_a_carga_completa(data_dir, dm_cargado, chunksize):
+    dm = DataManager(use_cache=False)
+    assert dm.load_data_streaming(*ARCHIVOS, path=data_dir, chunksize=chunksize)
+    assert dm.df_ofertas is None
+    pd.testing.assert_frame_equal(dm.process_and_merge(), dm_cargado.process_and_merge())
+
+    resumen = dm.resumen_ofertas
+    csv = pd.read_csv(os.path.join(data_dir, ARCHIVOS[1]))
+    assert resumen.filas == len(csv)
+    assert resumen.histograma.sum() == ((csv['salario_minimo'] + csv['salario_maximo']) / 2).notna().sum()
+    assert resumen.conteo_carreras.sort_index().to_dict() == csv['carrera_requerida'].value_counts().sort_index().to_dict()
+    assert resumen.watermark_fecha == pd.to_datetime(csv['fecha_publicacion']).max()
+
+
+@pytest.mark.parametrize('nbins', [7, 20])
+def test_eda_streaming_igual_a_eda_en_memoria(data_dir, dm_cargado, nbins):
+    dm = DataManager(use_cache=False)
+    assert dm.load_data_streaming(*ARCHIVOS, path=data_dir, chunksize=333)
+    streaming = EDAModule(dm.df_matricula, None, dm.df_inec, dm.resumen_ofertas)
+    memoria = EDAModule(dm_cargado.df_matricula, dm_cargado.df_ofertas, dm_cargado.df_inec)
+
+    # value_counts de una pasada == value_counts sobre el DataFrame completo
+    demanda = lambda eda: eda._demanda_por_carrera().set_index('carrera')['Total_Ofertas'].sort_index()
+    pd.testing.assert_series_equal(demanda(streaming), demanda(memoria), check_dtype=False)
+
+    # Histograma de una pasada == histograma de los mismos salarios en memoria, con los mismos bordes
+    # (cada salario cuenta en su bin fino de ancho_bin, como al acumular por lotes)
+    resumen = dm.resumen_ofertas
+    hist = resumen.histograma_salarios(nbins=nbins)
+    salarios = memoria._salario_promedio().dropna().to_numpy()
+    finos = np.floor(salarios / resumen.ancho_bin) * resumen.ancho_bin
+    bordes = np.append(hist['salario_inicio'].to_numpy(), hist['salario_inicio'].iloc[-1] + hist['ancho'].iloc[-1])
+    esperado, _ = np.histogram(finos, bins=bordes)
+    np.testing.assert_array_equal(hist['conteo'].to_numpy(), esperado)
+    assert hist['conteo'].sum() == len(salarios)
+    assert bordes[0] <= salarios.min() and salarios.max() < bordes[-1]
+
+    # Y es lo que dibuja la página en modo streaming
+    barras = streaming.plot_distribucion_salarios(nbins=nbins).data[0]
+    np.testing.assert_array_equal(barras.y, esperado)
+    np.testing.assert_allclose(barras.x, bordes[:-1] + np.diff(bordes) / 2)
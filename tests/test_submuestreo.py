@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+from src.clustering_module import plot_clusters_3d, submuestrear_por_densidad
+
+
+def _nube(seed=0):
+    """Una nube densa, un cluster pequeño y aislado y unos pocos outliers."""
+    rng = np.random.default_rng(seed)
+    densa = rng.normal(0, 1, size=(20_000, 3))
+    pequeno = rng.normal(40, 0.5, size=(30, 3))
+    outliers = np.array([[-60, 0, 0], [0, 80, 0], [0, 0, -70]])
+    valores = np.vstack([densa, pequeno, outliers])
+    grupo = ['densa'] * len(densa) + ['pequeno'] * len(pequeno) + ['outlier'] * len(outliers)
+    return pd.DataFrame(valores, columns=['x', 'y', 'z']).assign(grupo=grupo)
+
+
+def test_respeta_maximo_y_conserva_zonas_dispersas():
+    df = _nube()
+    muestra = submuestrear_por_densidad(df, ['x', 'y', 'z'], max_puntos=2000)
+    assert len(muestra) <= 2000
+    conteo = muestra['grupo'].value_counts()
+    assert conteo['pequeno'] == 30 and conteo['outlier'] == 3
+    # Subconjunto de filas del original, sin modificar
+    pd.testing.assert_frame_equal(muestra, df.loc[muestra.index])
+
+
+def test_reproducible_y_sin_cambios_si_cabe():
+    df = _nube()
+    a = submuestrear_por_densidad(df, ['x', 'y', 'z'], max_puntos=1000, random_state=3)
+    b = submuestrear_por_densidad(df, ['x', 'y', 'z'], max_puntos=1000, random_state=3)
+    assert a.index.equals(b.index)
+    assert submuestrear_por_densidad(df, ['x', 'y', 'z'], max_puntos=len(df)) is df
+
+
+def test_estrato_conserva_categorias_pequenas():
+    df = _nube()
+    # Una categoría minoritaria mezclada dentro de la nube densa
+    df['categoria'] = np.where(np.arange(len(df)) % 1000 == 0, 'rara', 'comun')
+    muestra = submuestrear_por_densidad(df, ['x', 'y', 'z'], max_puntos=1500, estrato='categoria')
+    assert len(muestra) <= 1500
+    assert (muestra['categoria'] == 'rara').sum() == (df['categoria'] == 'rara').sum()
+
+
+def test_grafico_3d_submuestreado(df_labeled):
+    grande = pd.concat([df_labeled] * 40, ignore_index=True)
+    fig = plot_clusters_3d(grande, max_puntos=300)
+    assert sum(len(traza.x) for traza in fig.data) <= 300
+    assert 'muestra de' in fig.layout.title.text
+    # Todas las categorías siguen en el gráfico
+    assert {t.name for t in fig.data} == set(df_labeled['categoria'])
+
+
+def test_histograma_preagregado_cuenta_todas_las_ofertas(dm_cargado):
+    from src.eda_module import EDAModule
+    eda = EDAModule(dm_cargado.df_matricula, dm_cargado.df_ofertas, dm_cargado.df_inec)
+    salarios = eda._salario_promedio().dropna()
+    fig = EDAModule.plot_distribucion_salarios.__wrapped__(eda, nbins=15, preagregado=True)
+    barras = fig.data[0]
+    assert len(barras.x) == 15
+    assert sum(barras.y) == len(salarios)
+    conteo, _ = np.histogram(salarios, bins=15)
+    assert list(barras.y) == list(conteo)
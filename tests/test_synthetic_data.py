@@ -0,0 +1,32 @@
+import numpy as np
+from src.prediction_module import ESCENARIOS, generar_datos_sinteticos, iter_datos_sinteticos
+
+
+def test_misma_semilla_mismo_conjunto():
+    X1, y1 = generar_datos_sinteticos(n=500, seed=3)
+    X2, y2 = generar_datos_sinteticos(n=500, seed=3)
+    X3, _ = generar_datos_sinteticos(n=500, seed=4)
+    np.testing.assert_array_equal(X1, X2)
+    np.testing.assert_array_equal(y1, y2)
+    assert not np.array_equal(X1, X3)
+
+
+def test_forma_clases_y_limites():
+    X, y = generar_datos_sinteticos(n=200, seed=1)
+    assert X.shape == (200 * len(ESCENARIOS), 4)
+    # Intercaladas por clase, como el generador original
+    assert list(y[:len(ESCENARIOS)]) == list(ESCENARIOS)
+    for clase, spec in ESCENARIOS.items():
+        filas = X[y == clase]
+        assert len(filas) == 200
+        for j, (_, _, minimo, maximo) in enumerate(spec):
+            assert filas[:, j].min() >= minimo and filas[:, j].max() <= maximo
+
+
+def test_por_lotes_reproducible():
+    lotes = list(iter_datos_sinteticos(n=2500, seed=9, tam_lote=1000))
+    assert [len(X) for X, _ in lotes] == [1000 * len(ESCENARIOS), 1000 * len(ESCENARIOS), 500 * len(ESCENARIOS)]
+    otra = list(iter_datos_sinteticos(n=2500, seed=9, tam_lote=1000))
+    for (X1, y1), (X2, y2) in zip(lotes, otra):
+        np.testing.assert_array_equal(X1, X2)
+        np.testing.assert_array_equal(y1, y2)
@@ -0,0 +1,43 @@
+import pickle
+import pandas as pd
+import pytest
+from src.text_es import AnalizadorEspanol, plegar_acentos, stem_ligero
+
+
+def test_plegado_conserva_la_enie():
+    assert plegar_acentos('Psicología EDUCACIÓN Pingüino') == 'psicologia educacion pinguino'
+    assert plegar_acentos('Año') == 'año' != plegar_acentos('Ano')
+
+
+@pytest.mark.parametrize('plural, singular', [
+    ('luces', 'luz'), ('ciudades', 'ciudad'), ('profesores', 'profesor'), ('pacientes', 'paciente'),
+    ('sistemas', 'sistema'), ('canciones', 'cancion'), ('clase', 'clase'), ('gas', 'gas'), ('business', 'business'),
+])
+def test_stem_ligero(plural, singular):
+    assert stem_ligero(plural) == singular
+
+
+def test_consultas_con_y_sin_acentos_dan_los_mismos_tokens():
+    analizador = AnalizadorEspanol()
+    assert analizador('Me gustaría estudiar Educación y Psicología') == analizador('me gustaria estudiar educacion psicologia')
+    assert analizador('las ciudades de la costa') == ['ciudad', 'costa']
+
+
+def test_ngramas_de_caracteres():
+    analizador = AnalizadorEspanol(stemming=False, ngramas_char=(3, 3))
+    assert analizador('Bío') == ['bio', ' bi', 'bio', 'io ']
+
+
+def test_serializable_y_repr_estable():
+    analizador = AnalizadorEspanol(ngramas_char=[2, 4])
+    copia = pickle.loads(pickle.dumps(analizador))
+    assert repr(copia) == repr(analizador) == 'AnalizadorEspanol(stemming=True, ngramas_char=(2, 4))'
+    assert copia('Ingeniería') == analizador('Ingeniería')
+
+
+def test_recomendador_insensible_a_acentos(nlp):
+    con = nlp.recomendar('Ingeniería en Sistemas Informáticos')
+    nlp.cache.clear()
+    sin = nlp.recomendar('ingenieria en sistemas informaticos')
+    assert not con.empty
+    pd.testing.assert_frame_equal(con, sin)